@@ -11,7 +11,7 @@ import csv
 import json
 from datetime import datetime
 import webbrowser
-import re
+from urllib.parse import urlparse
 
 # Fix for PyInstaller executable
 if getattr(sys, 'frozen', False):
@@ -29,33 +29,45 @@ if not os.path.exists(config_dir):
 
 # Add paths for imports
 sys.path.append(os.path.join(application_path, 'src'))
+sys.path.append(application_path)
+
+from src.hedging import hedged_scrape
 
 try:
     import requests
     from bs4 import BeautifulSoup
+    from src.pagination import detect_pagination, build_page_url
+    from src.prefetch import PagePrefetcher
     HAS_REQUESTS = True
 except ImportError:
     HAS_REQUESTS = False
 
 try:
-    from selenium import webdriver
-    from selenium.webdriver.chrome.service import Service
     from selenium.webdriver.chrome.options import Options
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
-    from webdriver_manager.chrome import ChromeDriverManager
+    from src.browser_scripts import BULK_EXTRACT
+    from src.driver_resolver import start_chrome
+    from src.scrolling import AdaptiveScroller
     HAS_SELENIUM = True
 except ImportError:
     HAS_SELENIUM = False
 
+try:
+    from src.snapshots import SNAPSHOT_DIR, extract_from_snapshot, find_snapshot, save_snapshot
+    HAS_SNAPSHOTS = True
+except ImportError:
+    HAS_SNAPSHOTS = False
+
 class SimpleScraper:
     """Simple scraper using requests + BeautifulSoup (for static sites)"""
 
-    def __init__(self):
+    def __init__(self, prefetch_depth=2):
         if not HAS_REQUESTS:
             raise ImportError("requests/beautifulsoup4 not installed")
         self.session = requests.Session()
+        self.prefetch_depth = prefetch_depth
         self.setup_session()
 
     def setup_session(self):
@@ -67,89 +79,126 @@ class SimpleScraper:
             'Connection': 'keep-alive',
         })
 
-    def detect_pagination(self, soup):
-        """Detect if page has pagination and get total pages"""
-        pagination_info = {}
-
-        # Look for common pagination patterns
-        pagination_selectors = [
-            '.pagination',
-            '.pager',
-            '.page-numbers',
-            '[class*="pagination"]',
-            '[class*="pager"]',
-            '.pagination-container'
-        ]
-
-        for selector in pagination_selectors:
-            pagination_elements = soup.select(selector)
-            if pagination_elements:
-                # Try to find page numbers
-                page_links = soup.select(f'{selector} a, {selector} li')
-                page_numbers = []
-
-                for element in page_links:
-                    text = element.get_text(strip=True)
-                    if text.isdigit():
-                        page_numbers.append(int(text))
-
-                if page_numbers:
-                    pagination_info['total_pages'] = max(page_numbers)
-                    pagination_info['selector'] = selector
-                    break
-
-        # Also check for "Page X of Y" text
-        page_text_patterns = [
-            'page', 'pagina', 'seite', 'página', 'ページ'
-        ]
+    def detect_pagination(self, soup, base_url=None, current_page=1):
+        """Detect if page has pagination and get total pages / next-page URL"""
+        return detect_pagination(soup, base_url, current_page)
 
-        for pattern in page_text_patterns:
-            elements = soup.find_all(string=lambda text: text and pattern in text.lower())
-            for element in elements:
-                text = element.strip()
-                matches = re.findall(r'(\d+)\s*of\s*(\d+)', text, re.IGNORECASE)
-                if matches:
-                    pagination_info['total_pages'] = int(matches[0][1])
-                    break
+    def _fetch_soup(self, url, timeout=30):
+        """Download and parse a page once"""
+        response = self.session.get(url, timeout=timeout)
+        response.raise_for_status()
+        return BeautifulSoup(response.content, 'html.parser')
 
-        return pagination_info
+    def _extract_from_soup(self, soup, css_selector, attribute='text', contains_text=None):
+        """Extract matching content from an already parsed page"""
+        extracted_data = []
+        for element in soup.select(css_selector):
+            try:
+                if contains_text and contains_text not in str(element):
+                    continue
+                content = self._extract_attribute(element, attribute)
+                if content and content.strip():
+                    extracted_data.append(content)
+            except Exception as e:
+                print(f"⚠️ [PAGINATION] Error processing element: {e}")
+                continue
+        return extracted_data
 
-    def scrape_multiple_pages(self, base_url, css_selector, attribute='text', contains_text=None, timeout=30):
+    def scrape_multiple_pages(self, base_url, css_selector, attribute='text', contains_text=None, timeout=30,
+                              max_pages=200):
         """Extract content from multiple pages with pagination"""
         try:
-            # First, get the first page to detect pagination
+            # First page is parsed once for both pagination and content
             print(f"🔄 [PAGINATION] Analyzing: {base_url}")
-            response = self.session.get(base_url, timeout=timeout)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.content, 'html.parser')
-            pagination_info = self.detect_pagination(soup)
+            soup = self._fetch_soup(base_url, timeout)
+            pagination_info = self.detect_pagination(soup, base_url)
 
             all_data = []
 
-            # Extract first page data
-            first_page_data = self.scrape(base_url, css_selector, attribute, contains_text, timeout)
+            first_page_data = self._extract_from_soup(soup, css_selector, attribute, contains_text)
             all_data.extend(first_page_data)
             print(f"✅ [PAGINATION] Page 1: {len(first_page_data)} items")
 
-            # If pagination detected, scrape additional pages
-            if pagination_info and 'total_pages' in pagination_info:
-                total_pages = pagination_info['total_pages']
-                print(f"📖 [PAGINATION] Found {total_pages} pages total")
-
-                for page in range(2, total_pages + 1):
-                    try:
-                        # Build page URL (handles different URL patterns)
-                        page_url = self._build_page_url(base_url, page)
-                        print(f"🔄 [PAGINATION] Scraping page {page}: {page_url}")
-
-                        page_data = self.scrape(page_url, css_selector, attribute, contains_text, timeout)
-                        all_data.extend(page_data)
-                        print(f"✅ [PAGINATION] Page {page}: {len(page_data)} items")
-
-                    except Exception as e:
-                        print(f"⚠️ [PAGINATION] Error on page {page}: {e}")
-                        continue
+            # Room for the page being fetched plus prefetch_depth pages ahead, as in WebTagScraper
+            with PagePrefetcher(self.session, depth=self.prefetch_depth + 1, timeout=timeout) as prefetcher:
+                if 'total_pages' in pagination_info:
+                    # Known page count: build every page URL up front and keep
+                    # the next pages downloading while the current one is parsed
+                    total_pages = min(pagination_info['total_pages'], max_pages)
+                    print(f"📖 [PAGINATION] Found {total_pages} pages total")
+
+                    template = pagination_info.get('url_template')
+                    page_urls = [self._build_page_url(base_url, page, template)
+                                 for page in range(2, total_pages + 1)]
+
+                    for index, page_url in enumerate(page_urls):
+                        page = index + 2
+                        # Includes the page fetched next, so it never queues behind later ones
+                        for upcoming in page_urls[index:index + 1 + self.prefetch_depth]:
+                            prefetcher.submit(upcoming)
+
+                        try:
+                            print(f"🔄 [PAGINATION] Scraping page {page}: {page_url}")
+                            content = prefetcher.get(page_url)
+                            if content is None:
+                                print(f"⚠️ [PAGINATION] Error on page {page}")
+                                continue
+
+                            page_soup = BeautifulSoup(content, 'html.parser')
+                            page_data = self._extract_from_soup(page_soup, css_selector, attribute, contains_text)
+                            all_data.extend(page_data)
+                            print(f"✅ [PAGINATION] Page {page}: {len(page_data)} items")
+
+                        except Exception as e:
+                            print(f"⚠️ [PAGINATION] Error on page {page}: {e}")
+                            continue
+
+                elif 'next_url' in pagination_info:
+                    # Unknown page count: follow rel="next" links, queueing each
+                    # discovered link before the current page is extracted
+                    page = 1
+                    visited = {base_url}
+                    guessed = []
+                    next_url = pagination_info['next_url']
+                    while next_url and next_url not in visited and page < max_pages:
+                        page += 1
+                        visited.add(next_url)
+                        try:
+                            print(f"🔄 [PAGINATION] Scraping page {page}: {next_url}")
+                            content = prefetcher.get(next_url)
+                            if content is None:
+                                print(f"⚠️ [PAGINATION] Error on page {page}")
+                                break
+
+                            page_soup = BeautifulSoup(content, 'html.parser')
+                            page_info = self.detect_pagination(page_soup, next_url, page)
+                        except Exception as e:
+                            print(f"⚠️ [PAGINATION] Error on page {page}: {e}")
+                            break
+
+                        if next_url in guessed:
+                            guessed.remove(next_url)
+                        next_url = page_info.get('next_url')
+                        if next_url and next_url not in visited:
+                            if guessed and next_url not in guessed:
+                                # The template guesses went astray - free their slots for real pages
+                                for url in guessed:
+                                    prefetcher.discard(url)
+                                guessed = []
+                            prefetcher.submit(next_url)
+                            if page_info.get('url_template'):
+                                for upcoming in range(page + 2, page + 1 + self.prefetch_depth):
+                                    upcoming_url = self._build_page_url(base_url, upcoming,
+                                                                        page_info['url_template'])
+                                    if prefetcher.submit(upcoming_url):
+                                        guessed.append(upcoming_url)
+
+                        try:
+                            page_data = self._extract_from_soup(page_soup, css_selector, attribute, contains_text)
+                            all_data.extend(page_data)
+                            print(f"✅ [PAGINATION] Page {page}: {len(page_data)} items")
+                        except Exception as e:
+                            print(f"⚠️ [PAGINATION] Error on page {page}: {e}")
 
             print(f"🎯 [PAGINATION] Total items from all pages: {len(all_data)}")
             return all_data
@@ -158,18 +207,9 @@ class SimpleScraper:
             print(f"❌ [PAGINATION] Error: {e}")
             return []
 
-    def _build_page_url(self, base_url, page_number):
+    def _build_page_url(self, base_url, page_number, template=None):
         """Build URL for specific page number"""
-        if '?' in base_url:
-            if 'page=' in base_url:
-                # Replace existing page parameter
-                return re.sub(r'page=\d+', f'page={page_number}', base_url)
-            else:
-                # Add page parameter
-                return f"{base_url}&page={page_number}"
-        else:
-            # Add page parameter with ?
-            return f"{base_url}?page={page_number}"
+        return build_page_url(base_url, page_number, template=template)
 
     def scrape(self, url, css_selector, attribute='text', contains_text=None, timeout=30, enable_scroll=True,
                max_scrolls=8, scroll_pause=2):
@@ -190,19 +230,19 @@ class SimpleScraper:
 
             # Scroll to load all content if enabled
             if enable_scroll:
-                print(f"🔄 [SELENIUM] Scrolling {max_scrolls} times to load all content...")
-                last_height = self.driver.execute_script("return document.body.scrollHeight")
+                # Waits only until new content arrives; the per-domain timeout is learned from past runs
+                scroller = AdaptiveScroller(self.driver, urlparse(url).netloc, css_selector,
+                                            cold_timeout=scroll_pause)
+                print(f"🔄 [SELENIUM] Scrolling up to {max_scrolls} times "
+                      f"(waiting at most {scroller.timeout:.1f}s each)...")
 
                 for i in range(max_scrolls):
-                    self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    print(f"📜 [SELENIUM] Scroll {i + 1}/{max_scrolls} - Waiting {scroll_pause}s...")
-                    time.sleep(scroll_pause)
-
-                    new_height = self.driver.execute_script("return document.body.scrollHeight")
-                    if new_height == last_height:
+                    step = scroller.scroll()
+                    print(f"📜 [SELENIUM] Scroll {i + 1}/{max_scrolls} ({step['waited']:.1f}s)")
+                    if not step['grew']:
                         print("✅ [SELENIUM] No more content to load")
                         break
-                    last_height = new_height
+                scroller.save()
 
                 # Scroll back to top
                 self.driver.execute_script("window.scrollTo(0, 0);")
@@ -271,8 +311,7 @@ class SeleniumScraper:
         chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
 
         try:
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            self.driver = start_chrome(chrome_options, label="[SELENIUM] Chrome")
             print("✅ [SELENIUM] Chrome driver initialized")
         except Exception as e:
             print(f"❌ [SELENIUM] Failed to initialize: {e}")
@@ -295,28 +334,24 @@ class SeleniumScraper:
                 EC.presence_of_element_located((By.CSS_SELECTOR, css_selector))
             )
 
-            elements = self.driver.find_elements(By.CSS_SELECTOR, css_selector)
+            # One round trip for all elements instead of one per element
+            values = self.driver.execute_script(BULK_EXTRACT, css_selector, attribute) or []
 
-            if not elements:
+            if not values:
                 print(f"❌ [SELENIUM] No elements found with: {css_selector}")
                 return []
 
-            print(f"✅ [SELENIUM] Found {len(elements)} elements")
+            print(f"✅ [SELENIUM] Found {len(values)} elements")
 
-            extracted_data = []
-            for element in elements:
+            # Keep the rendered page so other selectors can be tried without a browser
+            if HAS_SNAPSHOTS:
                 try:
-                    if attribute == 'text':
-                        content = element.text.strip()
-                    else:
-                        content = element.get_attribute(attribute)
-
-                    if content and (not contains_text or contains_text in content):
-                        extracted_data.append(content)
-
+                    save_snapshot(self.driver.page_source, url, selector=css_selector, attribute=attribute)
                 except Exception as e:
-                    print(f"⚠️ [SELENIUM] Error processing element: {e}")
-                    continue
+                    print(f"⚠️ [SELENIUM] Could not save snapshot: {e}")
+
+            extracted_data = [content for content in values
+                              if content and (not contains_text or contains_text in content)]
 
             print(f"🎯 [SELENIUM] Extracted {len(extracted_data)} items")
             return extracted_data
@@ -593,7 +628,7 @@ class WebTagExtractorGUI:
                        value="selenium").pack(side=tk.LEFT, padx=10)
 
         # Mode info label
-        self.mode_info = ttk.Label(mode_frame, text="Auto mode will try Simple first, then Selenium if needed",
+        self.mode_info = ttk.Label(mode_frame, text="Auto mode races Simple and Selenium - the first usable result wins",
                                   font=('Arial', 9, 'italic'))
         self.mode_info.pack(side=tk.LEFT, padx=20)
 
@@ -630,6 +665,9 @@ class WebTagExtractorGUI:
         ttk.Button(button_frame, text="🎯 Extract Content",
                   command=self.start_extraction).pack(side=tk.LEFT, padx=5)
 
+        ttk.Button(button_frame, text="♻️ Re-extract from Snapshot",
+                  command=self.start_snapshot_extraction).pack(side=tk.LEFT, padx=5)
+
         ttk.Button(button_frame, text="💾 Export to CSV",
                   command=self.export_results).pack(side=tk.LEFT, padx=5)
 
@@ -713,6 +751,7 @@ class WebTagExtractorGUI:
                 self.mode_var.set(preset.get('mode', 'auto'))
                 self.contains_entry.delete(0, tk.END)
                 self.contains_entry.insert(0, preset.get('contains_text', ''))
+                self.pagination_var.set(bool(preset.get('pages')))
                 self.status_var.set(f"✅ Loaded: {preset.get('name', 'Preset')}")
                 break
 
@@ -727,7 +766,8 @@ class WebTagExtractorGUI:
                 except ImportError as e:
                     errors.append(f"Simple scraper: {e}")
 
-        if self.mode_var.get() in ["auto", "selenium"] and HAS_SELENIUM:
+        # Auto mode launches its browser only when the race needs one
+        if self.mode_var.get() == "selenium" and HAS_SELENIUM:
             if self.selenium_scraper is None:
                 try:
                     self.selenium_scraper = SeleniumScraper(headless=True)
@@ -777,25 +817,37 @@ class WebTagExtractorGUI:
             used_mode = "none"
 
             if mode == "auto":
-                # Try simple first, then selenium if needed
-                print("🔄 [AUTO] Trying simple mode first...")
-                self.root.after(0, lambda: self.mode_used_label.config(text="Mode: Trying Simple..."))
-                self.root.after(0, lambda: self.status_var.set("⏳ Auto: Trying simple mode..."))
-
-                if use_pagination:
-                    data = self.simple_scraper.scrape_multiple_pages(url, selector, attribute, contains_text)
-                    used_mode = "simple (multi-page)"
+                # Race simple mode against a browser; the first usable result wins
+                self.root.after(0, lambda: self.mode_used_label.config(text="Mode: Simple + Selenium..."))
+                self.root.after(0, lambda: self.status_var.set("⏳ Auto: Racing simple and Selenium modes..."))
+
+                def simple():
+                    if use_pagination:
+                        return self.simple_scraper.scrape_multiple_pages(url, selector, attribute, contains_text)
+                    return self.simple_scraper.scrape(url, selector, attribute, contains_text)
+
+                def open_browser():
+                    # A browser kept from an earlier win starts the race warm
+                    if self.selenium_scraper is None:
+                        self.selenium_scraper = SeleniumScraper(headless=True)
+                    return self.selenium_scraper
+
+                def close_browser(scraper):
+                    scraper.close()
+                    if self.selenium_scraper is scraper:
+                        self.selenium_scraper = None
+
+                data, winner = hedged_scrape(
+                    simple,
+                    open_browser,
+                    lambda scraper: scraper.scrape(url, selector, attribute, contains_text),
+                    domain=urlparse(url).netloc,
+                    close_browser=close_browser,
+                    keep_browser=True
+                )
+                if winner == "simple":
+                    used_mode = "simple (multi-page)" if use_pagination else "simple"
                 else:
-                    data = self.simple_scraper.scrape(url, selector, attribute, contains_text)
-
-                if data:
-                    used_mode = "simple" if not use_pagination else "simple (multi-page)"
-                else:
-                    print("🔄 [AUTO] Simple mode failed, trying Selenium...")
-                    self.root.after(0, lambda: self.mode_used_label.config(text="Mode: Trying Selenium..."))
-                    self.root.after(0, lambda: self.status_var.set("⏳ Auto: Trying Selenium mode..."))
-
-                    data = self.selenium_scraper.scrape(url, selector, attribute, contains_text)
                     used_mode = "selenium"
 
             elif mode == "simple":
@@ -819,6 +871,45 @@ class WebTagExtractorGUI:
         except Exception as e:
             self.root.after(0, self.display_error, str(e))
 
+    def start_snapshot_extraction(self):
+        """Re-run the current selector on the last rendered page of the URL"""
+        if not HAS_SNAPSHOTS:
+            messagebox.showerror("Dependency Error", "Snapshots need requests and beautifulsoup4")
+            return
+
+        url = self.url_entry.get().strip()
+        selector = self.selector_entry.get().strip()
+        if not selector:
+            messagebox.showerror("Error", "Please enter a CSS selector")
+            return
+
+        path = find_snapshot(url) if url else None
+        if path is None:
+            path = filedialog.askopenfilename(
+                title="Choose a snapshot (render the page once in Selenium mode first)",
+                initialdir=SNAPSHOT_DIR if os.path.isdir(SNAPSHOT_DIR) else None,
+                filetypes=[("Snapshots", "*.html.gz"), ("All files", "*.*")]
+            )
+            if not path:
+                return
+
+        self.status_var.set("⏳ Re-extracting from snapshot...")
+        self.mode_used_label.config(text="Mode: Snapshot")
+
+        thread = threading.Thread(target=self.run_snapshot_extraction, args=(path, selector))
+        thread.daemon = True
+        thread.start()
+
+    def run_snapshot_extraction(self, path, selector):
+        """Parse a stored snapshot in a separate thread"""
+        try:
+            attribute = self.attribute_combo.get()
+            contains_text = self.contains_entry.get().strip() or None
+            meta, data = extract_from_snapshot(path, selector, attribute, contains_text)
+            self.root.after(0, self.display_results, data, f"snapshot {meta['saved_at']}")
+        except Exception as e:
+            self.root.after(0, self.display_error, str(e))
+
     def display_results(self, data, used_mode):
         """Display results in the text area"""
         self.results_text.delete(1.0, tk.END)
@@ -928,7 +1019,8 @@ class WebTagExtractorGUI:
 WebTagContent Extractor v3.0 - Help Guide
 
 ⚡ SCRAPING MODES:
-• AUTO: Tries Simple mode first, then Selenium if needed
+• AUTO: Starts Simple mode at once and Selenium shortly after; the
+  first usable result wins (sites that needed Selenium before get it right away)
 • SIMPLE: Fast for static HTML sites (no JavaScript)
 • SELENIUM: For JavaScript-rendered content (slower but powerful)
 
@@ -937,6 +1029,11 @@ WebTagContent Extractor v3.0 - Help Guide
 • Works with websites that have pagination (Page 1, 2, 3...)
 • Combines all results into one list automatically
 
+♻️ RE-EXTRACT FROM SNAPSHOT:
+• Every Selenium run saves the rendered page
+• "Re-extract from Snapshot" tries the current selector and attribute on it
+  in seconds, without opening a browser
+
 📋 RECOMMENDED USAGE:
 • Simple sites (httpbin.org, example.com): Use SIMPLE mode
 • Modern sites (Enforce Tac, React apps): Use SELENIUM mode
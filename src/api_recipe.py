@@ -0,0 +1,281 @@
+"""
+JSON API discovery and replay
+
+Load More buttons usually call a paginated JSON endpoint. The browser
+records that traffic once (CDP performance log), find_api_recipe() works out
+which request returns the directory entries and which parameter pages
+through them, and the resulting "API recipe" is stored in the preset. Later
+runs replay the endpoint over plain HTTP with WebTagScraper.scrape_api() -
+no browser needed.
+
+Recipe format:
+    {
+        "url": "https://example.com/api/exhibitors?page=1&size=24",
+        "method": "GET",                # or "POST"
+        "body": null,                   # JSON body for POST endpoints
+        "param": "page",                # parameter that pages through results
+        "param_in": "query",            # "query" or "body"
+        "start": 1,
+        "step": 1,                      # 24 for offset-style parameters
+        "items_path": "data.items",     # where the entry list sits in the response
+        "field": "name",                # value extracted from every entry
+        "headers": {"Accept": "application/json"}
+    }
+"""
+
+import json
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+
+# Parameter names that commonly page through results, and which ones count entries
+PAGE_PARAM_NAMES = ('page', 'pageNumber', 'pageIndex', 'page_number', 'p', 'pg',
+                    'offset', 'skip', 'start', 'from', 'startIndex')
+OFFSET_PARAM_NAMES = ('offset', 'skip', 'start', 'from', 'startIndex')
+LIMIT_PARAM_NAMES = ('limit', 'size', 'pageSize', 'page_size', 'per_page', 'perPage', 'count', 'rows', 'take')
+
+# Request headers worth replaying (cookies and auth are deliberately left out)
+REPLAY_HEADERS = ('accept', 'content-type', 'x-requested-with')
+
+
+def collect_json_exchanges(log_entries):
+    """
+    Pair requests with JSON responses from Chrome performance log entries
+
+    Returns:
+        List of dicts with url, method, headers, body, request_id
+    """
+    requests_by_id = {}
+    exchanges = []
+
+    for entry in log_entries:
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, ValueError, TypeError):
+            continue
+        method = message.get('method')
+        params = message.get('params', {})
+
+        if method == 'Network.requestWillBeSent':
+            request = params.get('request', {})
+            requests_by_id[params.get('requestId')] = {
+                'url': request.get('url'),
+                'method': request.get('method', 'GET'),
+                'headers': request.get('headers', {}),
+                'body': request.get('postData'),
+            }
+        elif method == 'Network.responseReceived':
+            response = params.get('response', {})
+            request = requests_by_id.get(params.get('requestId'))
+            if request and 'json' in response.get('mimeType', '') and response.get('status') == 200:
+                exchanges.append(dict(request, request_id=params['requestId']))
+
+    return exchanges
+
+
+def get_path(data, path):
+    """Follow a dotted path ('data.items', 'results.0.name') through nested JSON"""
+    if not path:
+        return data
+    for key in path.split('.'):
+        if isinstance(data, list) and key.isdigit() and int(key) < len(data):
+            data = data[int(key)]
+        elif isinstance(data, dict) and key in data:
+            data = data[key]
+        else:
+            return None
+    return data
+
+
+def _iter_lists(data, path='', depth=0):
+    """Yield (path, list) for every list of objects in a JSON document"""
+    if depth > 6:
+        return
+    if isinstance(data, list):
+        if data and all(isinstance(item, dict) for item in data[:5]):
+            yield path, data
+        return
+    if isinstance(data, dict):
+        for key, value in data.items():
+            yield from _iter_lists(value, f"{path}.{key}" if path else key, depth + 1)
+
+
+def _iter_string_fields(item, path='', depth=0):
+    """Yield (path, value) for string values inside one entry"""
+    if depth > 3 or not isinstance(item, dict):
+        return
+    for key, value in item.items():
+        field = f"{path}.{key}" if path else key
+        if isinstance(value, str):
+            yield field, value
+        elif isinstance(value, dict):
+            yield from _iter_string_fields(value, field, depth + 1)
+
+
+def _matches_sample(value, samples):
+    value = value.strip().lower()
+    if not value:
+        return False
+    if value in samples:
+        return True
+    # hrefs and slugs: the JSON often holds only part of the DOM value
+    return len(value) >= 4 and any(value in sample for sample in samples)
+
+
+def _best_items(data, samples):
+    """Find the entry list and field whose values overlap most with the page content"""
+    best = None
+    for items_path, items in _iter_lists(data):
+        scores = {}
+        for item in items[:50]:
+            for field, value in _iter_string_fields(item):
+                if _matches_sample(value, samples):
+                    scores[field] = scores.get(field, 0) + 1
+        if scores:
+            field, score = max(scores.items(), key=lambda pair: pair[1])
+        elif not samples:
+            field, score = None, 0
+        else:
+            continue
+        candidate = (score, len(items), items_path, field)
+        if best is None or candidate[:2] > best[:2]:
+            best = candidate
+    return best
+
+
+def _paging_values(exchange):
+    """Return {name: (int value, 'query'|'body')} for numeric request parameters"""
+    values = {}
+    for name, value in parse_qsl(urlparse(exchange['url']).query):
+        if value.isdigit():
+            values[name] = (int(value), 'query')
+    if exchange.get('body'):
+        try:
+            body = json.loads(exchange['body'])
+        except ValueError:
+            body = None
+        if isinstance(body, dict):
+            for name, value in body.items():
+                if isinstance(value, int) and not isinstance(value, bool):
+                    values[name] = (value, 'body')
+    return values
+
+
+def _endpoint(exchange):
+    parts = urlparse(exchange['url'])
+    return exchange['method'], parts.netloc, parts.path
+
+
+def find_api_recipe(exchanges, samples):
+    """
+    Work out the paginated JSON endpoint behind a directory page
+
+    Args:
+        exchanges: collect_json_exchanges() output with a parsed 'data' key
+        samples: Values the CSS selector extracted from the rendered page
+
+    Returns:
+        Recipe dict, or None when no JSON response carries the directory entries
+    """
+    samples = {sample.strip().lower() for sample in samples if sample and sample.strip()}
+
+    best = None
+    for exchange in exchanges:
+        if exchange.get('data') is None:
+            continue
+        found = _best_items(exchange['data'], samples)
+        if found and (best is None or found[:2] > best[0][:2]):
+            best = (found, exchange)
+    if best is None or (samples and best[0][0] == 0):
+        return None
+
+    (score, page_size, items_path, field), exchange = best
+    if field is None:
+        return None
+
+    # Every call to the same endpoint - Load More clicks show which parameter moves
+    calls = [candidate for candidate in exchanges if _endpoint(candidate) == _endpoint(exchange)]
+    param = None
+    start, step = 1, 1
+
+    observed = {}
+    for call in calls:
+        for name, (value, location) in _paging_values(call).items():
+            observed.setdefault((name, location), set()).add(value)
+    # Cache busters (_=1700000000000) move too, so prefer known names and small numbers
+    moving = [(key, sorted(values)) for key, values in observed.items()
+              if len(values) > 1 and (key[0] in PAGE_PARAM_NAMES or max(values) < 100000)]
+    if moving:
+        (param, location), values = max(moving, key=lambda pair: pair[0][0] in PAGE_PARAM_NAMES)
+        start, step = values[0], values[1] - values[0]
+    else:
+        # Only one call seen - fall back to a well-known parameter name
+        current = _paging_values(exchange)
+        for name in PAGE_PARAM_NAMES:
+            if name in current:
+                param = name
+                value, location = current[name]
+                start = value
+                step = 1
+                if name in OFFSET_PARAM_NAMES:
+                    limits = [current[limit][0] for limit in LIMIT_PARAM_NAMES if limit in current]
+                    step = limits[0] if limits else page_size
+                break
+
+    if param is None or step <= 0:
+        return None
+
+    # The first page is often rendered server-side, so Load More calls begin at page 2
+    if param in OFFSET_PARAM_NAMES or step > 1:
+        start = start % step
+    else:
+        start = min(start, 1)
+
+    first_call = min(calls, key=lambda call: _paging_values(call).get(param, (start, None))[0])
+    headers = {name: value for name, value in first_call['headers'].items()
+               if name.lower() in REPLAY_HEADERS}
+
+    return {
+        'url': first_call['url'],
+        'method': first_call['method'],
+        'body': json.loads(first_call['body']) if location == 'body' else None,
+        'param': param,
+        'param_in': location,
+        'start': start,
+        'step': step,
+        'items_path': items_path,
+        'field': field,
+        'headers': headers,
+        'matched_samples': score,
+    }
+
+
+def build_recipe_request(recipe, value):
+    """Return (method, url, json_body) for one page of a recipe"""
+    url = recipe['url']
+    body = recipe.get('body')
+
+    if recipe.get('param_in', 'query') == 'query':
+        parts = urlparse(url)
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        if any(name == recipe['param'] for name, _ in query):
+            query = [(name, str(value) if name == recipe['param'] else old) for name, old in query]
+        else:
+            query.append((recipe['param'], str(value)))
+        url = urlunparse(parts._replace(query=urlencode(query)))
+    else:
+        body = dict(body or {}, **{recipe['param']: value})
+
+    return recipe.get('method', 'GET'), url, body
+
+
+def recipe_page_values(recipe, data):
+    """Extract the recipe field from every entry of one response"""
+    items = get_path(data, recipe['items_path'])
+    if not isinstance(items, list):
+        return []
+    values = []
+    for item in items:
+        value = get_path(item, recipe['field'])
+        if isinstance(value, (str, int, float)) and str(value).strip():
+            values.append(str(value).strip())
+    return values
@@ -0,0 +1,146 @@
+"""
+Streaming bulk mode for URL lists
+
+One process works through any number of targets read line by line from a
+file or stdin. Downloads run on a thread pool sharing one HTTP session,
+parsing can go to the scraper's process pool, and results come out as soon
+as each target finishes. Only a bounded window of targets is in flight at a
+time, so memory stays flat however long the input is.
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from src.scraper import extract_items
+
+
+def parse_target_line(line, default_selector=None, default_attribute='text'):
+    """
+    Parse one input line: url[<TAB>selector[<TAB>attribute]]
+
+    Returns:
+        (url, selector, attribute), or None for blank and '#' comment lines
+    """
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+
+    parts = [part.strip() for part in line.split('\t')]
+    url = parts[0]
+    selector = parts[1] if len(parts) > 1 and parts[1] else default_selector
+    attribute = parts[2] if len(parts) > 2 and parts[2] else default_attribute
+    return url, selector, attribute
+
+
+def iter_targets(lines, default_selector=None, default_attribute='text'):
+    """Lazily turn input lines into (url, selector, attribute) targets"""
+    for number, line in enumerate(lines, 1):
+        target = parse_target_line(line, default_selector, default_attribute)
+        if target is None:
+            continue
+        if not target[1]:
+            print(f"⚠️ Line {number}: no selector for {target[0]} - skipped")
+            continue
+        yield target
+
+
+class BatchRunner:
+    """
+    Run many scraping targets concurrently with a bounded in-flight window
+
+    Args:
+        scraper: WebTagScraper whose session (and parse pool) are shared
+        workers: Number of targets downloading at once
+        timeout: Request timeout in seconds
+        cache_pages: Recent pages kept so lines sharing a URL download it once
+    """
+
+    def __init__(self, scraper, workers=8, timeout=30, cache_pages=32):
+        self.scraper = scraper
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.cache_pages = cache_pages
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+        self.succeeded = 0
+        self.failed = 0
+
+    def run(self, targets):
+        """
+        Yield (url, selector, items) in completion order
+
+        items is None when the page could not be downloaded or parsed.
+        """
+        window = self.workers * 2
+        targets = iter(targets)
+        pending = set()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while True:
+                # Top the window up without reading further ahead than needed
+                while len(pending) < window:
+                    target = next(targets, None)
+                    if target is None:
+                        break
+                    pending.add(executor.submit(self._process, *target))
+
+                if not pending:
+                    break
+
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url, selector, items = future.result()
+                    if items is None:
+                        self.failed += 1
+                    else:
+                        self.succeeded += 1
+                    yield url, selector, items
+
+    def iter_rows(self, targets):
+        """Yield one dict row per extracted item, for DataExporter.export_rows"""
+        for url, selector, items in self.run(targets):
+            if items is None:
+                print(f"❌ {url}: failed")
+                continue
+            print(f"✅ {url}: {len(items)} items")
+            for item in items:
+                yield {'URL': url, 'Selector': selector, 'Extracted_Content': item}
+
+    def _process(self, url, selector, attribute):
+        content = self._page(url)
+        if content is None:
+            return url, selector, None
+
+        try:
+            if self.scraper.parse_workers:
+                pool = self.scraper._get_parse_pool()
+                items = pool.submit(extract_items, content, selector, attribute).result()
+            else:
+                items = extract_items(content, selector, attribute)
+        except Exception as e:
+            print(f"⚠️ Parse error on {url}: {e}")
+            return url, selector, None
+        return url, selector, items
+
+    def _page(self, url):
+        """Download a page once even when several targets ask for it"""
+        with self._lock:
+            future = self._pages.get(url)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._pages[url] = future
+                if len(self._pages) > self.cache_pages:
+                    self._pages.popitem(last=False)
+            else:
+                self._pages.move_to_end(url)
+
+        if owner:
+            # Whatever happens, the future must be resolved or every waiter on this URL hangs
+            try:
+                future.set_result(self.scraper._fetch(url, self.timeout))
+            except Exception as e:
+                print(f"❌ Download error on {url}: {e}")
+                future.set_result(None)
+        return future.result()
@@ -0,0 +1,227 @@
+"""
+Persistent Chrome profiles with a bounded disk cache
+
+By default every browser starts from a throwaway profile and downloads the
+same JS bundles, stylesheets and API bootstraps again. With a persistent
+profile each site (or preset) keeps its Chrome profile and HTTP cache
+between runs. Chrome cannot share one profile between two running
+browsers, so each key has numbered slots guarded by lock files; pooled
+browsers simply take different slots. Old and oversized slots are removed
+by cleanup_profiles(), which also runs automatically about once a day.
+"""
+
+import os
+import re
+import shutil
+import sys
+import time
+
+
+PROFILE_ROOT = os.path.join(os.path.expanduser('~'), '.cache', 'webtag-extractor', 'profiles')
+
+LOCK_FILE = '.lock'
+LAST_USED_FILE = '.last_used'
+CLEANUP_MARKER = '.last_cleanup'
+
+# A lock older than this is treated as left behind by a crashed run
+STALE_LOCK_SECONDS = 12 * 3600
+CLEANUP_INTERVAL_SECONDS = 24 * 3600
+
+
+def profile_key(name):
+    """Turn a domain or preset name into a safe directory name"""
+    slug = re.sub(r'[^a-z0-9.-]+', '-', name.lower()).strip('-.')
+    return slug or 'default'
+
+
+def _pid_alive(pid):
+    """Check a process id (None when the platform cannot tell)"""
+    if sys.platform.startswith('win'):
+        # os.kill(pid, 0) would send CTRL_C_EVENT on Windows
+        return None
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return None
+    return True
+
+
+def _lock_is_stale(lock_path):
+    try:
+        with open(lock_path, 'r', encoding='utf-8') as f:
+            pid = int(f.read().strip() or 0)
+        age = time.time() - os.path.getmtime(lock_path)
+    except (OSError, ValueError):
+        return True
+    alive = _pid_alive(pid) if pid else False
+    return alive is False or age > STALE_LOCK_SECONDS
+
+
+def _try_lock(slot_dir):
+    lock_path = os.path.join(slot_dir, LOCK_FILE)
+    for _ in range(2):
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileNotFoundError:
+            # cleanup_profiles() deleted the slot in the meantime
+            return False
+        except FileExistsError:
+            if not _lock_is_stale(lock_path):
+                return False
+            print(f"🔓 Removing stale profile lock: {lock_path}")
+            try:
+                os.remove(lock_path)
+            except OSError:
+                return False
+            continue
+        with os.fdopen(fd, 'w') as f:
+            f.write(str(os.getpid()))
+        return True
+    return False
+
+
+def _dir_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class ProfileLease:
+    """
+    One locked profile slot, held while a browser uses it
+
+    Args:
+        key: Domain or preset name the profile belongs to
+        max_slots: Maximum number of concurrent browsers per key
+        disk_cache_mb: Upper bound for Chrome's HTTP disk cache in this slot
+    """
+
+    def __init__(self, key, max_slots=8, disk_cache_mb=256):
+        self.key = profile_key(key)
+        self.disk_cache_mb = disk_cache_mb
+        self.path = None
+
+        maybe_cleanup()
+        base = os.path.join(PROFILE_ROOT, self.key)
+        for slot in range(max_slots):
+            slot_dir = os.path.join(base, f"slot-{slot}")
+            os.makedirs(slot_dir, exist_ok=True)
+            if _try_lock(slot_dir):
+                self.path = slot_dir
+                break
+        if self.path is None:
+            raise RuntimeError(f"All {max_slots} profile slots for '{self.key}' are in use")
+
+    def chrome_arguments(self):
+        """Command-line switches that point Chrome at this slot"""
+        return [
+            f"--user-data-dir={os.path.join(self.path, 'chrome')}",
+            f"--disk-cache-dir={os.path.join(self.path, 'cache')}",
+            f"--disk-cache-size={self.disk_cache_mb * 1024 * 1024}",
+        ]
+
+    def release(self):
+        """Unlock the slot and record when it was last used"""
+        if self.path is None:
+            return
+        try:
+            with open(os.path.join(self.path, LAST_USED_FILE), 'w', encoding='utf-8') as f:
+                f.write(str(time.time()))
+            os.remove(os.path.join(self.path, LOCK_FILE))
+        except OSError as e:
+            print(f"⚠️ Could not release profile {self.path}: {e}")
+        self.path = None
+
+
+def _last_used(slot_dir):
+    try:
+        return os.path.getmtime(os.path.join(slot_dir, LAST_USED_FILE))
+    except OSError:
+        return os.path.getmtime(slot_dir)
+
+
+def _remove_slot(slot_dir):
+    """Delete a slot unless a browser holds it; the slot's lock is taken first"""
+    if not _try_lock(slot_dir):
+        return False
+    shutil.rmtree(slot_dir, ignore_errors=True)
+    return True
+
+
+def cleanup_profiles(max_age_days=14, max_total_mb=2048):
+    """
+    Delete unused profile slots
+
+    Slots idle for more than max_age_days are removed, then the least
+    recently used ones until everything fits in max_total_mb. Slots locked
+    by a running process are never touched; locks left by a crashed process
+    (dead pid, or older than STALE_LOCK_SECONDS) do not protect a slot.
+
+    Returns:
+        Number of slots removed
+    """
+    if not os.path.isdir(PROFILE_ROOT):
+        return 0
+
+    slots = []
+    for key in os.listdir(PROFILE_ROOT):
+        key_dir = os.path.join(PROFILE_ROOT, key)
+        if not os.path.isdir(key_dir):
+            continue
+        for slot in os.listdir(key_dir):
+            slot_dir = os.path.join(key_dir, slot)
+            if os.path.isdir(slot_dir):
+                slots.append(slot_dir)
+
+    removed = 0
+    kept = []
+    cutoff = time.time() - max_age_days * 86400
+    for slot_dir in sorted(slots, key=_last_used):
+        lock_path = os.path.join(slot_dir, LOCK_FILE)
+        if os.path.exists(lock_path) and not _lock_is_stale(lock_path):
+            kept.append((slot_dir, _dir_size(slot_dir), True))
+            continue
+        if _last_used(slot_dir) < cutoff:
+            if _remove_slot(slot_dir):
+                removed += 1
+                continue
+            kept.append((slot_dir, _dir_size(slot_dir), True))
+            continue
+        kept.append((slot_dir, _dir_size(slot_dir), False))
+
+    total = sum(size for _, size, _ in kept)
+    limit = max_total_mb * 1024 * 1024
+    for slot_dir, size, locked in kept:
+        if total <= limit:
+            break
+        if locked or not _remove_slot(slot_dir):
+            continue
+        total -= size
+        removed += 1
+
+    print(f"🧹 Profile cleanup: removed {removed} slots, {total / (1024 * 1024):.0f} MB kept")
+    return removed
+
+
+def maybe_cleanup():
+    """Run cleanup_profiles() if it has not run in the last day"""
+    marker = os.path.join(PROFILE_ROOT, CLEANUP_MARKER)
+    try:
+        if time.time() - os.path.getmtime(marker) < CLEANUP_INTERVAL_SECONDS:
+            return
+    except OSError:
+        pass
+
+    os.makedirs(PROFILE_ROOT, exist_ok=True)
+    with open(marker, 'w', encoding='utf-8') as f:
+        f.write(str(time.time()))
+    cleanup_profiles()
@@ -0,0 +1,286 @@
+"""
+JavaScript snippets injected into Selenium-driven pages
+"""
+
+# Installed before any page script runs (CDP Page.addScriptToEvaluateOnNewDocument).
+# Counts fetch/XHR requests in flight and records the time of the last network
+# or DOM activity, so the scraper can wait for a quiet page instead of sleeping.
+READINESS_TRACKER = """
+(function () {
+    if (window.__wtcReadiness) { return; }
+    var state = window.__wtcReadiness = {inflight: {}, nextId: 0, last: performance.now()};
+
+    function touch() { state.last = performance.now(); }
+    function begin() {
+        var id = state.nextId++;
+        state.inflight[id] = performance.now();
+        touch();
+        return id;
+    }
+    function end(id) {
+        delete state.inflight[id];
+        touch();
+    }
+
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            var id = begin();
+            return originalFetch.apply(this, arguments).then(
+                function (response) { end(id); return response; },
+                function (error) { end(id); throw error; }
+            );
+        };
+    }
+
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        var id = begin();
+        this.addEventListener('loadend', function () { end(id); });
+        return originalSend.apply(this, arguments);
+    };
+
+    // Attribute changes are ignored: spinners and carousels toggle them forever
+    new MutationObserver(touch).observe(document, {childList: true, subtree: true, characterData: true});
+})();
+"""
+
+# Returns {pending, quiet_ms, state} or null when the tracker is not installed.
+# arguments[0]: requests older than this many ms are treated as long-polls and ignored
+READINESS_PROBE = """
+var state = window.__wtcReadiness;
+if (!state) { return null; }
+var now = performance.now();
+var pending = 0;
+for (var id in state.inflight) {
+    if (now - state.inflight[id] < arguments[0]) { pending++; }
+}
+return {pending: pending, quiet_ms: now - state.last, state: document.readyState};
+"""
+
+# Value of one element, shared by the extraction scripts below.
+# Mirrors WebElement.text / get_attribute(): rendered text, else the DOM
+# property (absolute href/src), else the raw attribute.
+_VALUE_OF = """
+function valueOf(element, attribute) {
+    var value;
+    if (attribute === 'text') {
+        value = (element.innerText || '').trim();
+    } else if (attribute === 'html') {
+        value = element.outerHTML;
+    } else {
+        value = element[attribute];
+        if (value === undefined || value === null || typeof value === 'object' || typeof value === 'function') {
+            value = element.getAttribute(attribute);
+        }
+    }
+    return value === null || value === undefined ? null : String(value);
+}
+"""
+
+# Extract every match of a selector in one round trip.
+# arguments[0]: CSS selector, arguments[1]: 'text', 'html' or an attribute name.
+BULK_EXTRACT = _VALUE_OF + """
+var elements = document.querySelectorAll(arguments[0]);
+var values = new Array(elements.length);
+for (var i = 0; i < elements.length; i++) {
+    values[i] = valueOf(elements[i], arguments[1]);
+}
+return values;
+"""
+
+# Start collecting values of matching elements as they are added to the page.
+# Existing matches are buffered at once; later ones are buffered by a
+# MutationObserver, so nodes a virtualized list removes again are not lost.
+# De-duplication is by value, not by node: virtualized lists recycle nodes,
+# so a node showing a new row is collected again and a re-rendered row is not.
+# arguments[0]: CSS selector, arguments[1]: attribute
+HARVEST_INSTALL = _VALUE_OF + """
+var selector = arguments[0], attribute = arguments[1];
+var current = window.__wtcHarvest;
+if (current && current.selector === selector && current.attribute === attribute) { return true; }
+if (current) { current.observer.disconnect(); }
+
+var harvest = window.__wtcHarvest = {selector: selector, attribute: attribute, buffer: [], seen: new Set()};
+
+function collect(element) {
+    var value = valueOf(element, attribute);
+    // Elements rendered empty are retried when their text arrives
+    if (!value || harvest.seen.has(value)) { return; }
+    harvest.seen.add(value);
+    harvest.buffer.push(value);
+}
+
+function scan(node) {
+    var owner = node.nodeType === 1 ? node : node.parentElement;
+    if (!owner) { return; }
+    var match = owner.closest(selector);
+    if (match) { collect(match); }
+    if (node.nodeType === 1) {
+        var found = node.querySelectorAll(selector);
+        for (var i = 0; i < found.length; i++) { collect(found[i]); }
+    }
+}
+
+harvest.observer = new MutationObserver(function (mutations) {
+    for (var i = 0; i < mutations.length; i++) {
+        var mutation = mutations[i];
+        if (mutation.type === 'characterData' || mutation.type === 'attributes') {
+            scan(mutation.target);
+            continue;
+        }
+        for (var j = 0; j < mutation.addedNodes.length; j++) { scan(mutation.addedNodes[j]); }
+    }
+});
+var options = {childList: true, subtree: true, characterData: true};
+if (attribute !== 'text' && attribute !== 'html') {
+    // A recycled node may only get a new href/src
+    options.attributes = true;
+    options.attributeFilter = [attribute];
+}
+harvest.observer.observe(document, options);
+scan(document.documentElement);
+return true;
+"""
+
+# Hand over the values buffered since the last drain (null after a navigation)
+HARVEST_DRAIN = """
+var harvest = window.__wtcHarvest;
+if (!harvest) { return null; }
+var values = harvest.buffer;
+harvest.buffer = [];
+return values;
+"""
+
+# Find, score and click the best "Load More" / "Next" control in one round trip.
+# arguments[0]: 'more', 'next' or 'any'
+# arguments[1]: locator that won last time on this domain (or null)
+# Returns {locator, text, score} for the clicked element, or null.
+CLICK_LOAD_MORE = """
+var kind = arguments[0], cached = arguments[1];
+var MORE_TEXT = /(load|show|view|see|display) more|more (results|exhibitors|companies)|mehr (laden|anzeigen)|weitere (laden|anzeigen)|voir plus|afficher plus|charger plus|ver m[aá]s|cargar m[aá]s|mostrar m[aá]s|carica altr|mostra altr|meer (laden|tonen)|toon meer|carregar mais|ver mais|もっと見る|さらに表示|加载更多|显示更多|더 보기/i;
+var NEXT_TEXT = /^(next( page)?|›|»|>|→|weiter|nächste( seite)?|suivant(e)?|siguiente|successiv[oa]|avanti|volgende|próxima|次へ|下一页|다음)$/i;
+var MORE_HINT = /load[-_]?more|show[-_]?more|view[-_]?more|see[-_]?more|more[-_]?(button|results|btn)/i;
+var NEXT_HINT = /(^|[-_\\s])next([-_\\s]|$)|pagination[-_]?next|pager[-_]?next/i;
+
+function visible(el) {
+    if (el.disabled || el.getAttribute('aria-disabled') === 'true') { return false; }
+    var rect = el.getBoundingClientRect();
+    if (!rect.width || !rect.height) { return false; }
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none' && style.pointerEvents !== 'none';
+}
+
+function score(el) {
+    var text = (el.innerText || el.value || '').trim();
+    var label = (el.getAttribute('aria-label') || el.getAttribute('title') || '').trim();
+    var hints = (el.className && el.className.baseVal !== undefined ? el.className.baseVal : el.className || '') + ' ' + (el.id || '');
+    var rel = (el.getAttribute('rel') || '').toLowerCase();
+    var total = 0;
+    if (kind !== 'next') {
+        if (MORE_TEXT.test(text)) { total += 10; }
+        if (MORE_TEXT.test(label)) { total += 6; }
+        if (MORE_HINT.test(hints)) { total += 4; }
+        if (el.hasAttribute('data-load-more')) { total += 8; }
+    }
+    if (kind !== 'more') {
+        if (NEXT_TEXT.test(text)) { total += 10; }
+        if (NEXT_TEXT.test(label) || /next/i.test(label)) { total += 6; }
+        if (rel.split(/\\s+/).indexOf('next') >= 0) { total += 10; }
+        if (NEXT_HINT.test(hints)) { total += 4; }
+        if (el.closest('[class*="pagination"], [class*="pager"], nav')) { total += 2; }
+    }
+    if (text.length > 40) { total -= 5; }
+    return total;
+}
+
+function locatorOf(el) {
+    if (el.id && /^[A-Za-z][\\w-]*$/.test(el.id) && document.querySelectorAll('#' + el.id).length === 1) {
+        return '#' + el.id;
+    }
+    var parts = [];
+    for (var node = el; node && node.nodeType === 1 && node !== document.body; node = node.parentElement) {
+        var part = node.tagName.toLowerCase();
+        var classes = Array.prototype.filter.call(node.classList, function (c) { return /^[A-Za-z][\\w-]*$/.test(c); });
+        if (classes.length) { part += '.' + classes.slice(0, 2).join('.'); }
+        parts.unshift(part);
+        if (document.querySelectorAll(parts.join(' > ')).length === 1) { return parts.join(' > '); }
+
+        var index = 1;
+        for (var sibling = node.previousElementSibling; sibling; sibling = sibling.previousElementSibling) {
+            if (sibling.tagName === node.tagName) { index++; }
+        }
+        parts[0] = part + ':nth-of-type(' + index + ')';
+        if (document.querySelectorAll(parts.join(' > ')).length === 1) { return parts.join(' > '); }
+    }
+    return parts.join(' > ');
+}
+
+var MIN_SCORE = 6;
+var best = null, bestScore = 0, locator = null;
+
+if (cached) {
+    try {
+        var previous = document.querySelector(cached);
+        if (previous && visible(previous) && score(previous) >= MIN_SCORE) {
+            best = previous; bestScore = score(previous); locator = cached;
+        }
+    } catch (e) {
+        // Stale or invalid cached locator - fall back to scoring
+    }
+}
+
+if (!best) {
+    var candidates = document.querySelectorAll('button, a, [role="button"], input[type="button"], input[type="submit"], [data-load-more]');
+    for (var i = 0; i < candidates.length; i++) {
+        var candidate = candidates[i];
+        var value = score(candidate);
+        if (value > bestScore && visible(candidate)) { best = candidate; bestScore = value; }
+    }
+    if (!best || bestScore < MIN_SCORE) { return null; }
+    locator = locatorOf(best);
+}
+
+best.scrollIntoView({block: 'center'});
+best.click();
+return {locator: locator, text: (best.innerText || best.value || '').trim().slice(0, 40), score: bestScore};
+"""
+
+# Scroll to the end of the list: the last match is scrolled into view (inner
+# scroll containers) and the window to the bottom of the document.
+# arguments[0]: CSS selector of the list entries (or null)
+SCROLL_TO_END = """
+if (arguments[0]) {
+    var matches = document.querySelectorAll(arguments[0]);
+    if (matches.length) { matches[matches.length - 1].scrollIntoView({block: 'end'}); }
+}
+var root = document.scrollingElement || document.documentElement;
+window.scrollTo(0, root.scrollHeight);
+return root.scrollHeight;
+"""
+
+# State polled while waiting for a scroll to load more content.
+# arguments[0]: CSS selector (or null), arguments[1]: long-poll cutoff in ms
+# Returns {height, count, buffered, pending, quiet_ms, at_bottom}; pending and
+# quiet_ms are null when the readiness tracker is not installed.
+SCROLL_PROBE = """
+var root = document.scrollingElement || document.documentElement;
+var state = window.__wtcReadiness, harvest = window.__wtcHarvest;
+var pending = null, quiet = null;
+if (state) {
+    var now = performance.now();
+    pending = 0;
+    for (var id in state.inflight) {
+        if (now - state.inflight[id] < arguments[1]) { pending++; }
+    }
+    quiet = now - state.last;
+}
+return {
+    height: root.scrollHeight,
+    count: arguments[0] ? document.querySelectorAll(arguments[0]).length : 0,
+    buffered: harvest ? harvest.buffer.length : 0,
+    pending: pending,
+    quiet_ms: quiet,
+    at_bottom: window.innerHeight + window.scrollY >= root.scrollHeight - 2
+};
+"""
@@ -0,0 +1,233 @@
+"""
+WebDriver command tracer
+
+Every Selenium call is a round trip to chromedriver, and a slow scrape
+usually hides a few chatty code paths (per-element .text calls, polling
+loops, repeated find_elements) among page loads and sleeps. CommandTracer
+wraps driver.execute to record every command with its duration and payload
+sizes, counts the time spent in sleep(), and after each scrape prints a
+summary and writes the full trace as JSON.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlparse
+
+from src import browser_scripts
+
+
+TRACE_DIR = 'traces'
+
+# Label of the phase from driver creation to the first traced scrape
+SETUP_LABEL = 'driver setup'
+
+SCRIPT_COMMANDS = ('w3cExecuteScript', 'w3cExecuteScriptAsync', 'executeScript', 'executeAsyncScript')
+
+# Tracer of the traced scrape (or command) running on this thread; sleep()
+# charges its time there. Cleared when the scope exits, so pooled threads
+# never report into a stale tracer.
+_current = threading.local()
+
+
+def sleep(seconds):
+    """time.sleep() that is accounted to the active tracer, if any"""
+    tracer = getattr(_current, 'tracer', None)
+    if tracer is None:
+        time.sleep(seconds)
+        return
+    started = time.perf_counter()
+    time.sleep(seconds)
+    tracer.record('sleep', None, time.perf_counter() - started)
+
+
+def _script_names():
+    """Map the injected scripts back to their names in src/browser_scripts.py"""
+    return {value: name for name, value in vars(browser_scripts).items()
+            if name.isupper() and isinstance(value, str)}
+
+
+def _size(payload):
+    if payload is None:
+        return 0
+    try:
+        return len(json.dumps(payload, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+class CommandTracer:
+    """
+    Record the WebDriver commands of one driver
+
+    Args:
+        trace_dir: Directory for the JSON trace files
+        slowest: Number of slowest calls listed in the summary
+    """
+
+    def __init__(self, trace_dir=TRACE_DIR, slowest=10):
+        self.trace_dir = trace_dir
+        self.slowest = slowest
+        self._scripts = _script_names()
+        self._lock = threading.Lock()
+        self.label = None
+        self.events = []
+        # Driver startup is usually the biggest cost; reported with the first trace
+        self.setup_events = []
+        self.setup_ms = 0.0
+        self.begin(SETUP_LABEL)
+
+    def attach(self, driver):
+        """Wrap driver.execute so every command passes through the tracer"""
+        original = driver.execute
+
+        def execute(driver_command, params=None):
+            previous = getattr(_current, 'tracer', None)
+            _current.tracer = self
+            started = time.perf_counter()
+            error = None
+            response = None
+            try:
+                response = original(driver_command, params)
+                return response
+            except Exception as e:
+                error = type(e).__name__
+                raise
+            finally:
+                _current.tracer = previous
+                self.record(driver_command, params, time.perf_counter() - started,
+                            response.get('value') if isinstance(response, dict) else None, error)
+
+        driver.execute = execute
+        return driver
+
+    def _detail(self, command, params):
+        """Short label for what a command did (script name, URL, CDP method)"""
+        if not params:
+            return None
+        if command in SCRIPT_COMMANDS:
+            script = params.get('script', '')
+            return self._scripts.get(script) or ' '.join(script.split())[:40]
+        if command == 'get':
+            return params.get('url')
+        if command == 'executeCdpCommand':
+            return params.get('cmd')
+        if command in ('findElement', 'findElements', 'findChildElement', 'findChildElements'):
+            return params.get('value')
+        return None
+
+    def begin(self, label):
+        """Start a new trace (events of the previous one are discarded, driver setup is kept)"""
+        with self._lock:
+            if self.label == SETUP_LABEL:
+                self.setup_events = self.events
+                self.setup_ms = round((time.perf_counter() - self._started) * 1000, 1)
+            self.label = label
+            self.started_at = datetime.now()
+            self._started = time.perf_counter()
+            self.events = []
+
+    def record(self, command, params, seconds, response=None, error=None):
+        """Add one command (or a sleep) to the trace"""
+        event = {
+            't_ms': round((time.perf_counter() - self._started - seconds) * 1000, 1),
+            'command': command,
+            'detail': self._detail(command, params) if command != 'sleep' else None,
+            'ms': round(seconds * 1000, 1),
+            'request_bytes': _size(params),
+            'response_bytes': _size(response),
+        }
+        if error:
+            event['error'] = error
+        with self._lock:
+            self.events.append(event)
+
+    def summary(self):
+        """Per-command counts and times, plus the slowest calls"""
+        with self._lock:
+            events = list(self.events)
+        by_command = {}
+        for event in events:
+            # Scripts are told apart by name: HARVEST_DRAIN and BULK_EXTRACT cost very differently
+            key = event['command']
+            if key in SCRIPT_COMMANDS and event['detail']:
+                key = f"script:{event['detail']}"
+            stats = by_command.setdefault(key, {'count': 0, 'ms': 0.0, 'response_bytes': 0})
+            stats['count'] += 1
+            stats['ms'] += event['ms']
+            stats['response_bytes'] += event['response_bytes']
+        commands = [event for event in events if event['command'] != 'sleep']
+        with self._lock:
+            setup_events = list(self.setup_events)
+        return {
+            'label': self.label,
+            'setup': {'wall_ms': self.setup_ms, 'commands': len(setup_events),
+                      'command_ms': round(sum(event['ms'] for event in setup_events), 1)} if setup_events else None,
+            'wall_ms': round((time.perf_counter() - self._started) * 1000, 1),
+            'commands': len(commands),
+            'command_ms': round(sum(event['ms'] for event in commands), 1),
+            'sleep_ms': round(sum(event['ms'] for event in events if event['command'] == 'sleep'), 1),
+            'by_command': dict(sorted(by_command.items(), key=lambda pair: pair[1]['ms'], reverse=True)),
+            'slowest': sorted(commands, key=lambda event: event['ms'], reverse=True)[:self.slowest],
+        }
+
+    def report(self):
+        """Print the summary and write the JSON trace; returns the trace path"""
+        summary = self.summary()
+        print(f"🔬 WebDriver trace: {summary['label']}")
+        if summary['setup']:
+            print(f"   Driver setup: {summary['setup']['commands']} commands in "
+                  f"{summary['setup']['command_ms'] / 1000:.1f}s, "
+                  f"{summary['setup']['wall_ms'] / 1000:.1f}s until the first scrape")
+        print(f"   {summary['commands']} commands in {summary['command_ms'] / 1000:.1f}s, "
+              f"{summary['sleep_ms'] / 1000:.1f}s sleeping, {summary['wall_ms'] / 1000:.1f}s wall time")
+        for command, stats in list(summary['by_command'].items())[:12]:
+            print(f"   {command:<40} {stats['count']:>6}x {stats['ms'] / 1000:>8.2f}s "
+                  f"{stats['response_bytes'] / 1024:>9.0f} KB")
+        print("   Slowest calls:")
+        for event in summary['slowest'][:5]:
+            print(f"   {event['ms']:>9.0f} ms  {event['command']} {event['detail'] or ''}".rstrip())
+
+        try:
+            os.makedirs(self.trace_dir, exist_ok=True)
+            host = urlparse(self.label.split()[-1]).netloc or 'trace'
+            path = os.path.join(self.trace_dir, f"{host}-{self.started_at.strftime('%Y%m%d-%H%M%S-%f')}.json")
+            with self._lock:
+                events = list(self.events)
+                setup_events = self.setup_events
+                # The setup phase goes into the first trace only
+                self.setup_events = []
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'started_at': self.started_at.isoformat(timespec='seconds'),
+                           'summary': summary, 'setup_events': setup_events, 'events': events},
+                          f, indent=2, ensure_ascii=False)
+            print(f"💾 Trace written to: {path}")
+            return path
+        except OSError as e:
+            print(f"⚠️ Could not write trace: {e}")
+            return None
+
+
+def traced_scrape(method):
+    """
+    Trace one scrape method call when the scraper has a tracer
+
+    The decorated method must take the URL as its first argument.
+    """
+    @functools.wraps(method)
+    def wrapper(self, url, *args, **kwargs):
+        tracer = getattr(self, 'tracer', None)
+        if tracer is None:
+            return method(self, url, *args, **kwargs)
+        tracer.begin(f"{method.__name__} {url}")
+        previous = getattr(_current, 'tracer', None)
+        _current.tracer = tracer
+        try:
+            return method(self, url, *args, **kwargs)
+        finally:
+            _current.tracer = previous
+            tracer.report()
+    return wrapper
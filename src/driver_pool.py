@@ -0,0 +1,193 @@
+"""
+Warm pool of Selenium browsers
+
+Launching Chrome costs several seconds, and a single long-lived browser
+slowly leaks memory. DriverPool keeps a few EnhancedSeleniumScraper
+instances launched in the background, hands them out one job at a time,
+resets them between jobs and replaces any that are unhealthy, have loaded
+too many pages or have grown too large.
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from src.selenium_scraper import EnhancedSeleniumScraper
+
+
+class DriverPool:
+    """
+    Pool of pre-launched browsers
+
+    Args:
+        size: Number of browsers kept ready
+        headless: Run the browsers headless
+        max_pages: Recycle a browser after this many page loads
+        max_heap_mb: Recycle a browser whose page JS heap exceeds this (None to disable)
+        launch_timeout: Seconds acquire() waits for a browser before giving up
+        page_load_strategy: 'normal' or 'eager' (see EnhancedSeleniumScraper)
+        block_resources: Resource blocking profile shared by every browser
+        profile: Persistent profile key; each pooled browser locks its own slot of it
+        disk_cache_mb: Disk cache limit per persistent profile slot
+        remote: RenderFarm to launch the browsers on instead of this machine
+        trace_dir: Trace the WebDriver commands of every browser into this directory
+    """
+
+    def __init__(self, size=2, headless=True, max_pages=50, max_heap_mb=512, launch_timeout=120,
+                 page_load_strategy='normal', block_resources='standard', profile=None,
+                 disk_cache_mb=256, remote=None, trace_dir=None):
+        self.size = max(1, size)
+        self.headless = headless
+        self.page_load_strategy = page_load_strategy
+        self.block_resources = block_resources
+        self.profile = profile
+        self.disk_cache_mb = disk_cache_mb
+        self.remote = remote
+        self.trace_dir = trace_dir
+        self.max_pages = max_pages
+        self.max_heap_mb = max_heap_mb
+        self.launch_timeout = launch_timeout
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._scrapers = set()
+        self._closed = False
+        self._launcher = ThreadPoolExecutor(max_workers=self.size)
+
+        # Browsers start in the background; the first acquire() only waits if none is ready yet
+        print(f"🔥 Warming up {self.size} browsers")
+        for _ in range(self.size):
+            self._launcher.submit(self._launch)
+
+    def _launch(self):
+        if self._closed:
+            return
+        try:
+            scraper = EnhancedSeleniumScraper(headless=self.headless, page_load_strategy=self.page_load_strategy,
+                                              block_resources=self.block_resources, profile=self.profile,
+                                              disk_cache_mb=self.disk_cache_mb, remote=self.remote,
+                                              trace_dir=self.trace_dir)
+        except Exception as e:
+            print(f"❌ Could not launch pooled browser: {e}")
+            self._idle.put(None)
+            return
+
+        with self._lock:
+            if self._closed:
+                scraper.close()
+                return
+            self._scrapers.add(scraper)
+        self._idle.put(scraper)
+
+    def _retire(self, scraper, reason):
+        """Quit a browser and start its replacement"""
+        print(f"♻️ Recycling browser ({reason})")
+        with self._lock:
+            self._scrapers.discard(scraper)
+        try:
+            scraper.close()
+        except Exception:
+            pass
+        if not self._closed:
+            self._launcher.submit(self._launch)
+
+    def acquire(self):
+        """Take a healthy browser from the pool, waiting for one if necessary"""
+        while True:
+            try:
+                scraper = self._idle.get(timeout=self.launch_timeout)
+            except queue.Empty:
+                raise RuntimeError(f"No browser became available within {self.launch_timeout}s")
+
+            if scraper is None:
+                raise RuntimeError("Browser launch failed")
+            if scraper.is_healthy():
+                return scraper
+            self._retire(scraper, "failed health check")
+
+    def release(self, scraper):
+        """Return a browser after a job, resetting or recycling it"""
+        if self._closed:
+            scraper.close()
+            return
+
+        if self.max_pages and scraper.pages_loaded >= self.max_pages:
+            self._retire(scraper, f"{scraper.pages_loaded} pages loaded")
+            return
+
+        heap_mb = scraper.js_heap_mb() if self.max_heap_mb else None
+        if heap_mb and heap_mb > self.max_heap_mb:
+            self._retire(scraper, f"JS heap {heap_mb:.0f} MB")
+            return
+
+        try:
+            scraper.reset_state()
+        except Exception as e:
+            self._retire(scraper, f"reset failed: {e}")
+            return
+        self._idle.put(scraper)
+
+    @contextmanager
+    def driver(self):
+        """
+        Borrow a browser for one job
+
+        Example:
+            with pool.driver() as scraper:
+                data = scraper.scrape(url, selector)
+        """
+        scraper = self.acquire()
+        try:
+            yield scraper
+        finally:
+            self.release(scraper)
+
+    def run(self, job, retries=1):
+        """
+        Run job(scraper) on a pooled browser
+
+        If the browser dies during the job (e.g. its render node went away),
+        it is replaced and the job is retried on another browser.
+
+        Returns:
+            Whatever job returns
+        """
+        for attempt in range(retries + 1):
+            scraper = self.acquire()
+            try:
+                result = job(scraper)
+            except Exception:
+                if scraper.is_healthy():
+                    self.release(scraper)
+                    raise
+                self._retire(scraper, "browser died during the job")
+                if attempt == retries:
+                    raise
+            else:
+                if scraper.is_healthy():
+                    self.release(scraper)
+                    return result
+                self._retire(scraper, "browser died during the job")
+                if attempt == retries:
+                    return result
+            print(f"🔁 Retrying on another browser ({attempt + 1}/{retries})")
+
+    def close(self):
+        """Quit every browser, including ones still launching"""
+        with self._lock:
+            self._closed = True
+            scrapers = list(self._scrapers)
+            self._scrapers.clear()
+        self._launcher.shutdown(wait=False, cancel_futures=True)
+        for scraper in scrapers:
+            try:
+                scraper.close()
+            except Exception:
+                pass
+        print(f"✅ Browser pool closed")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,200 @@
+"""
+Fast, offline-friendly chromedriver resolution
+
+ChromeDriverManager().install() looks up versions online on every browser
+start. Here the resolved chromedriver path is cached per installed Chrome
+version and reused until Chrome updates. Otherwise a chromedriver on PATH
+that matches Chrome is used, then Selenium Manager (which works offline
+once it has a driver in its own cache), and only as a last resort
+webdriver-manager.
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+
+from selenium import webdriver
+from selenium.common.exceptions import NoSuchDriverException, WebDriverException
+from selenium.webdriver.chrome.service import Service
+
+
+DRIVER_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'webtag-extractor', 'chromedriver.json')
+
+CHROME_BINARIES = (
+    'google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome',
+    '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+)
+
+_VERSION = re.compile(r'(\d+)\.\d+\.\d+\.\d+')
+
+
+def _version_of(binary):
+    """Run `binary --version` and return the full version string"""
+    try:
+        output = subprocess.run([binary, '--version'], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = _VERSION.search(output or '')
+    return match.group(0) if match else None
+
+
+def detect_chrome_version():
+    """Installed Chrome version, e.g. '120.0.6099.109' (None if Chrome is not found)"""
+    if sys.platform.startswith('win'):
+        try:
+            import winreg
+        except ImportError:
+            return None
+        for root in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+            try:
+                with winreg.OpenKey(root, r'Software\Google\Chrome\BLBeacon') as key:
+                    return winreg.QueryValueEx(key, 'version')[0]
+            except OSError:
+                continue
+        return None
+
+    for candidate in CHROME_BINARIES:
+        binary = shutil.which(candidate) or (candidate if os.path.isfile(candidate) else None)
+        if binary:
+            version = _version_of(binary)
+            if version:
+                return version
+    return None
+
+
+def _major(version):
+    return version.split('.')[0] if version else None
+
+
+def _load_cache():
+    try:
+        with open(DRIVER_CACHE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache):
+    try:
+        os.makedirs(os.path.dirname(DRIVER_CACHE_PATH), exist_ok=True)
+        with open(DRIVER_CACHE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=2)
+    except OSError as e:
+        print(f"⚠️ Could not write driver cache: {e}")
+
+
+def remember_chromedriver(chrome_version, driver_path):
+    """Cache the driver that worked for this Chrome version"""
+    if not chrome_version or not driver_path:
+        return
+    cache = _load_cache()
+    if cache.get(chrome_version) != driver_path:
+        cache[chrome_version] = driver_path
+        _save_cache(cache)
+
+
+def forget_chromedriver(chrome_version):
+    """Drop a cached driver that no longer starts"""
+    cache = _load_cache()
+    if cache.pop(chrome_version, None):
+        _save_cache(cache)
+
+
+def resolve_chromedriver(chrome_version=None):
+    """
+    Find a chromedriver without touching the network
+
+    Returns:
+        (path, source) where source is 'cache' or 'PATH', or (None, None)
+        to let Selenium Manager resolve the driver
+    """
+    if chrome_version:
+        cached = _load_cache().get(chrome_version)
+        if cached and os.path.isfile(cached):
+            return cached, 'cache'
+
+    on_path = shutil.which('chromedriver')
+    if on_path:
+        driver_version = _version_of(on_path)
+        # Without a known Chrome version, trust the PATH driver and let startup decide
+        if not chrome_version or _major(driver_version) == _major(chrome_version):
+            return on_path, 'PATH'
+
+    return None, None
+
+
+# Startup errors that mean "wrong or missing chromedriver" rather than a Chrome or options problem
+DRIVER_ERROR_MARKERS = (
+    'This version of ChromeDriver',
+    'executable needs to be in PATH',
+    'Unable to obtain driver',
+    'unexpectedly exited',
+)
+
+
+def _is_driver_error(error):
+    """True if trying another chromedriver could fix this startup error"""
+    if isinstance(error, (NoSuchDriverException, OSError)):
+        # OSError: missing, non-executable or wrong-architecture driver binary
+        return True
+    if isinstance(error, WebDriverException):
+        return any(marker in str(error) for marker in DRIVER_ERROR_MARKERS)
+    return False
+
+
+def start_chrome(options, label='Chrome'):
+    """
+    Start Chrome with the fastest available chromedriver and report the start time
+
+    Tries the cached or PATH driver, then Selenium Manager, then
+    webdriver-manager; whichever works is cached for this Chrome version.
+    Only driver problems (missing driver, version mismatch) move on to the
+    next source; any other startup error (bad options, a profile already in
+    use, Chrome crashing) is raised right away.
+    """
+    started = time.perf_counter()
+    chrome_version = detect_chrome_version()
+    path, source = resolve_chromedriver(chrome_version)
+
+    attempts = []
+    if path:
+        attempts.append((source, lambda: Service(path)))
+    attempts.append(('Selenium Manager', lambda: Service()))
+    attempts.append(('webdriver-manager', _webdriver_manager_service))
+
+    last_error = None
+    for source, make_service in attempts:
+        try:
+            service = make_service()
+        except Exception as e:
+            print(f"⚠️ {label}: no chromedriver via {source}: {e}")
+            last_error = e
+            continue
+
+        try:
+            driver = webdriver.Chrome(service=service, options=options)
+        except Exception as e:
+            if not _is_driver_error(e):
+                raise
+            print(f"⚠️ {label}: chromedriver via {source} failed: {e}")
+            if source == 'cache':
+                forget_chromedriver(chrome_version)
+            last_error = e
+            continue
+
+        remember_chromedriver(chrome_version, getattr(driver.service, 'path', None))
+        elapsed = time.perf_counter() - started
+        print(f"⏱️ {label} started in {elapsed:.1f}s (Chrome {chrome_version or 'unknown'}, driver via {source})")
+        return driver
+
+    raise last_error
+
+
+def _webdriver_manager_service():
+    """Online fallback: download the matching driver with webdriver-manager"""
+    from webdriver_manager.chrome import ChromeDriverManager
+    return Service(ChromeDriverManager().install())
@@ -9,6 +9,7 @@ from datetime import datetime
 class DataExporter:
     def __init__(self, output_dir="outputs"):
         self.output_dir = output_dir
+        self.rows_written = 0
         self._ensure_output_dir()
 
     def _ensure_output_dir(self):
@@ -33,9 +34,39 @@ class DataExporter:
                 # Write header
                 writer.writerow(['Extracted_Content', 'Extraction_Date'])
 
-                # Write data
+                # Write data (may be a generator in low-memory mode)
+                self.rows_written = 0
                 for item in data:
                     writer.writerow([item, datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
+                    self.rows_written += 1
+
+            return output_path
+
+        except Exception as e:
+            raise Exception(f"Export failed: {e}")
+
+    def export_rows(self, rows, filename):
+        """
+        Export dict rows (e.g. enriched exhibitor records) to CSV
+
+        Columns follow the keys of the first row, plus the extraction date.
+        """
+        if not filename.endswith('.csv'):
+            filename = filename.replace('.xlsx', '.csv') + '.csv'
+
+        output_path = os.path.join(self.output_dir, filename)
+
+        try:
+            with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
+                writer = None
+                self.rows_written = 0
+                for row in rows:
+                    if writer is None:
+                        writer = csv.DictWriter(csvfile, fieldnames=list(row) + ['Extraction_Date'],
+                                                extrasaction='ignore')
+                        writer.writeheader()
+                    writer.writerow(dict(row, Extraction_Date=datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+                    self.rows_written += 1
 
             return output_path
 
@@ -0,0 +1,194 @@
+"""
+Hedged auto mode: race the HTTP scraper against a browser
+
+Running simple mode first and Selenium only after it comes back empty
+adds the whole HTTP round trip before the slow path even starts. Here the
+HTTP scrape starts at once and the browser is launched after a short hedge
+delay - immediately for domains that needed a browser before. The first
+adequate result wins and the other side is cancelled (a losing browser is
+stopped and closed; a losing HTTP request is simply ignored).
+"""
+
+import json
+import os
+import queue
+import threading
+from datetime import datetime
+
+
+HEDGE_DELAY = 2.0
+
+# Seconds a losing browser gets to stop at its next checkpoint before it is quit
+CANCEL_GRACE = 2.0
+
+JS_DOMAINS_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'webtag-extractor', 'js_domains.json')
+
+_store_lock = threading.Lock()
+
+
+def _load_js_domains():
+    try:
+        with open(JS_DOMAINS_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def is_js_heavy(domain):
+    """True if simple mode came back empty on this domain last time"""
+    with _store_lock:
+        return bool(domain) and domain in _load_js_domains()
+
+
+def remember_outcome(domain, js_heavy):
+    """Record whether a domain needed the browser"""
+    if not domain:
+        return
+    with _store_lock:
+        domains = _load_js_domains()
+        if js_heavy:
+            domains[domain] = datetime.now().isoformat(timespec='seconds')
+        elif domains.pop(domain, None) is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(JS_DOMAINS_PATH), exist_ok=True)
+            with open(JS_DOMAINS_PATH, 'w', encoding='utf-8') as f:
+                json.dump(domains, f, indent=2)
+        except OSError as e:
+            print(f"⚠️ Could not save JS-heavy domains: {e}")
+
+
+def hedged_scrape(simple, open_browser, scrape_browser, domain=None, hedge_delay=HEDGE_DELAY, min_items=1,
+                  close_browser=None, keep_browser=False, cancel_grace=CANCEL_GRACE):
+    """
+    Run the HTTP scrape and a browser scrape concurrently; the first adequate result wins
+
+    A browser that loses mid-scrape is cancelled: scrapers with a
+    cancel_event attribute (EnhancedSeleniumScraper) stop at their next
+    scroll, click or readiness check. One that is still busy after
+    cancel_grace seconds is quit from here, which makes its pending
+    WebDriver commands fail. The browser thread is not a daemon, so a
+    browser that is still launching closes itself before the interpreter
+    exits instead of being orphaned.
+
+    Args:
+        simple: Callable returning the HTTP scrape result (a list)
+        open_browser: Callable that launches (or returns a warm) browser scraper
+        scrape_browser: Callable taking that scraper and returning its result
+        domain: Domain of the page; JS-heavy domains start the browser without delay
+        hedge_delay: Seconds the browser waits for the HTTP scrape before launching
+        min_items: Fewest items that count as an adequate result
+        close_browser: Callable that shuts a browser down (default: scraper.close())
+        keep_browser: Leave a winning browser open for reuse (a losing one is always closed)
+        cancel_grace: Seconds a losing browser gets to stop on its own before it is quit
+
+    Returns:
+        Tuple of (data, 'simple' or 'selenium'); the longer result if neither was adequate
+    """
+    results = queue.Queue()
+    cancelled = threading.Event()
+    launch_now = threading.Event()
+    decided = threading.Event()
+    state = {'winner': None, 'scraper': None, 'closed': False}
+    state_lock = threading.Lock()
+    close_browser = close_browser or (lambda scraper: scraper.close())
+
+    def close_once(scraper):
+        # The browser thread and the canceller may both get here
+        with state_lock:
+            if state['closed']:
+                return
+            state['closed'] = True
+        try:
+            close_browser(scraper)
+        except Exception as e:
+            print(f"⚠️ [AUTO] Could not close the browser: {e}")
+
+    delay = hedge_delay
+    if is_js_heavy(domain):
+        delay = 0
+        print(f"⚡ [AUTO] {domain} needed a browser last time - launching it right away")
+
+    def run_simple():
+        try:
+            data = simple() or []
+        except Exception as e:
+            print(f"❌ [AUTO] Simple mode error: {e}")
+            data = []
+        results.put(('simple', data))
+
+    def run_browser():
+        launch_now.wait(delay)
+        if cancelled.is_set():
+            return
+        print("🚀 [AUTO] Launching Selenium...")
+        try:
+            scraper = open_browser()
+        except Exception as e:
+            print(f"❌ [AUTO] Selenium launch error: {e}")
+            results.put(('selenium', []))
+            return
+        with state_lock:
+            state['scraper'] = scraper
+        if hasattr(scraper, 'cancel_event'):
+            scraper.cancel_event = cancelled
+        try:
+            if cancelled.is_set():
+                data = []
+            else:
+                try:
+                    data = scrape_browser(scraper) or []
+                except Exception as e:
+                    data = []
+                    if not cancelled.is_set():
+                        print(f"❌ [AUTO] Selenium error: {e}")
+            results.put(('selenium', data))
+            decided.wait()
+        finally:
+            if hasattr(scraper, 'cancel_event'):
+                # A kept browser must not start its next scrape cancelled
+                scraper.cancel_event = None
+            if not (keep_browser and state['winner'] == 'selenium'):
+                close_once(scraper)
+
+    threading.Thread(target=run_simple, daemon=True).start()
+    browser_thread = threading.Thread(target=run_browser)
+    browser_thread.start()
+
+    outcomes = {}
+    winner = None
+    while len(outcomes) < 2:
+        name, data = results.get()
+        outcomes[name] = data
+        if len(data) >= min_items:
+            winner = name
+            break
+        if name == 'simple':
+            # Nothing usable over HTTP - no reason to keep the browser waiting
+            print("🔄 [AUTO] Simple mode found nothing, waiting for Selenium...")
+            launch_now.set()
+
+    if winner is None:
+        winner = max(outcomes, key=lambda name: len(outcomes[name]))
+
+    state['winner'] = winner
+    cancelled.set()
+    launch_now.set()
+    decided.set()
+    if winner == 'simple' and 'selenium' not in outcomes:
+        browser_thread.join(cancel_grace)
+        with state_lock:
+            scraper = state['scraper']
+        if browser_thread.is_alive() and scraper is not None:
+            print("🛑 [AUTO] Simple mode won - quitting the browser mid-scrape")
+            close_once(scraper)
+        else:
+            print("🛑 [AUTO] Simple mode won - browser cancelled")
+
+    if winner == 'selenium' and outcomes[winner] and 'simple' in outcomes and not outcomes['simple']:
+        remember_outcome(domain, True)
+    elif winner == 'simple' and outcomes[winner]:
+        remember_outcome(domain, False)
+
+    print(f"🏁 [AUTO] {winner} mode won with {len(outcomes[winner])} items")
+    return outcomes[winner], winner
@@ -4,9 +4,14 @@ WebTagContent Extractor - CLI Main Entry Point
 """
 
 import argparse
+import atexit
 import sys
 import os
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 
 # Add src to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -14,19 +19,54 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.scraper import WebTagScraper
 from src.selenium_scraper import EnhancedSeleniumScraper as SeleniumScraper
 from src.exporter import DataExporter
+from src.sitemap import SitemapDiscovery
+from src.frontier import CrawlFrontier
+from src.hedging import HEDGE_DELAY, hedged_scrape
+from src.batch import BatchRunner, iter_targets
+from src.browser_profiles import cleanup_profiles
+from src.driver_pool import DriverPool
+from src.pagination import build_page_url
+from src.render_farm import LocalNodes, RenderFarm
+from src.sharding import in_shard, merge_shards, parse_shard, shard_filename, write_manifest
+from src.snapshots import extract_from_snapshot
+
+
+def get_presets_path():
+    """Locate presets.json"""
+    presets_path = os.path.join(os.path.dirname(__file__), 'presets.json')
+    if not os.path.exists(presets_path):
+        # presets.json lives in the project root, next to src/
+        presets_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'presets.json')
+    return presets_path
 
 
 def load_presets():
     """Load scraping presets from JSON file"""
     try:
-        presets_path = os.path.join(os.path.dirname(__file__), 'presets.json')
-        with open(presets_path, 'r', encoding='utf-8') as f:
+        with open(get_presets_path(), 'r', encoding='utf-8') as f:
             return json.load(f)['presets']
     except Exception as e:
         print(f"⚠️ Could not load presets: {e}")
         return []
 
 
+def save_preset_recipe(name, recipe):
+    """Store a discovered API recipe in a preset so later runs skip the browser"""
+    presets_path = get_presets_path()
+    try:
+        with open(presets_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        for preset in config['presets']:
+            if preset['name'].lower() == name.lower():
+                preset['api_recipe'] = recipe
+        with open(presets_path, 'w', encoding='utf-8') as f:
+            json.dump(config, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f"💾 API recipe saved to preset '{name}'")
+    except Exception as e:
+        print(f"⚠️ Could not save API recipe: {e}")
+
+
 def list_presets():
     """Display available presets"""
     presets = load_presets()
@@ -55,37 +95,197 @@ def get_preset_by_name(name):
     return None
 
 
-def scrape_with_preset(preset):
-    """Scrape using a preset configuration"""
+def scrape_from_sitemap(url, pattern=None, selector=None, attribute='text', prefetch=4, parse_workers=None):
+    """
+    Enumerate page URLs from the site's sitemaps
+
+    Without a selector the matching URLs themselves are the result; with
+    one, every URL is fetched concurrently and the selector applied.
+    """
+    scraper = WebTagScraper(parse_workers=parse_workers)
+    try:
+        urls = SitemapDiscovery(scraper.session).iter_urls(url, pattern)
+        if not selector:
+            return list(urls)
+
+        data = []
+        for _, items in scraper.scrape_urls(urls, selector, attribute, prefetch=prefetch):
+            data.extend(items)
+        return data
+    finally:
+        scraper.close()
+
+
+def scrape_pages_with_browsers(url, selector, attribute, pages, page_param='page', drivers=2,
+                               headless=True, timeout=30, delay=0, page_load_strategy='normal',
+                               block_resources='standard', profile=None, disk_cache_mb=256, remote=None,
+                               trace_dir=None):
+    """
+    Render pages 1..pages concurrently on a pool of browsers
+
+    Each browser takes the next page as soon as it is free; results are
+    merged back in page order.
+
+    Args:
+        delay: Minimum seconds between the start of two page loads
+        profile: Persistent profile key (None for throwaway profiles)
+        remote: RenderFarm to render on; a page whose node dies is retried on another one
+        trace_dir: Write a WebDriver command trace per page to this directory
+    """
+    drivers = max(1, min(drivers, pages))
+    page_urls = [build_page_url(url, page, page_param) for page in range(1, pages + 1)]
+    print(f"🚀 Rendering {pages} pages on {drivers} browsers")
+
+    lock = threading.Lock()
+    next_start = [0.0]
+
+    def render(index):
+        def job(scraper):
+            # Space page loads `delay` seconds apart across all browsers
+            with lock:
+                now = time.monotonic()
+                start = max(now, next_start[0])
+                next_start[0] = start + delay
+            if start > now:
+                time.sleep(start - now)
+
+            print(f"📄 Processing page {index + 1}/{pages}")
+            return scraper.scrape(page_urls[index], selector, attribute, timeout=timeout)
+
+        return pool.run(job)
+
+    with DriverPool(size=drivers, headless=headless, page_load_strategy=page_load_strategy,
+                    block_resources=block_resources, profile=profile, disk_cache_mb=disk_cache_mb,
+                    remote=remote, trace_dir=trace_dir) as pool:
+        with ThreadPoolExecutor(max_workers=drivers) as executor:
+            page_results = list(executor.map(render, range(pages)))
+
+    data = []
+    for page, items in enumerate(page_results, 1):
+        print(f"✅ Page {page}: {len(items)} items")
+        data.extend(items)
+    return data
+
+
+def scrape_preset_with_browser(scraper, preset, snapshot=False):
+    """
+    Run a selenium preset on an already launched browser
+
+    Args:
+        snapshot: Also store the rendered page for --from-snapshot
+    """
+    # Use specialized exhibition method for Selenium
+    if 'exhibition' in preset['name'].lower() or 'exhibitor' in preset['name'].lower():
+        data = scraper.scrape_exhibitor_directory(
+            preset['url'],
+            preset['selector'],
+            preset['attribute']
+        )
+    else:
+        data = scraper.scrape(
+            preset['url'],
+            preset['selector'],
+            preset['attribute'],
+            timeout=30
+        )
+    if snapshot:
+        scraper.save_snapshot(preset['selector'], preset['attribute'], preset=preset['name'])
+    return data
+
+
+def scrape_with_preset(preset, driver_pool=None, persistent_profile=False, disk_cache_mb=256, snapshot=False,
+                       remote=None, trace_dir=None):
+    """
+    Scrape using a preset configuration
+
+    Args:
+        preset: Preset dict from presets.json
+        driver_pool: Optional DriverPool; selenium presets then borrow a warm
+            browser instead of launching their own
+        persistent_profile: Reuse the preset's Chrome profile and disk cache
+            between runs (also enabled by "persistent_profile": true in the preset)
+        disk_cache_mb: Disk cache limit for the persistent profile
+        snapshot: Store the rendered page of selenium presets for --from-snapshot
+        remote: RenderFarm for selenium presets that launch their own browser
+        trace_dir: Trace the WebDriver commands of that browser into this directory
+    """
     print(f"🎪 Using preset: {preset['name']}")
     print(f"🔗 URL: {preset['url']}")
     print(f"🎯 Selector: {preset['selector']}")
     print(f"🏷️  Attribute: {preset['attribute']}")
     print(f"⚡ Mode: {preset['mode']}")
 
-    if preset['mode'] == 'selenium':
-        scraper = SeleniumScraper(headless=True)
+    if preset.get('api_recipe'):
+        # Replay the JSON endpoint found by --discover-api - no browser needed
+        scraper = WebTagScraper()
         try:
-            # Use specialized exhibition method for Selenium
-            if 'exhibition' in preset['name'].lower() or 'exhibitor' in preset['name'].lower():
-                data = scraper.scrape_exhibition_exhibitors(
-                    preset['url'],
-                    preset['selector'],
-                    preset['attribute']
-                )
-            else:
-                data = scraper.scrape(
-                    preset['url'],
-                    preset['selector'],
-                    preset['attribute'],
-                    timeout=30
-                )
+            data = scraper.scrape_api(preset['api_recipe'])
+        finally:
+            scraper.close()
+        if data:
+            return data
+        print("⚠️ API recipe returned nothing - falling back to the page itself")
+
+    if preset.get('detail_fields'):
+        # Two-stage: links from the directory, fields from every detail page
+        scraper = WebTagScraper()
+        try:
+            return scraper.scrape_with_details(
+                preset['url'],
+                preset['selector'],
+                preset['detail_fields'],
+                attribute=preset['attribute'] if preset['attribute'] != 'text' else 'href'
+            )
+        finally:
+            scraper.close()
+
+    if preset.get('sitemap_pattern'):
+        # Enumerate the directory from sitemaps first - no browser needed
+        print(f"🗺️ Sitemap discovery: {preset['sitemap_pattern']}")
+        data = scrape_from_sitemap(
+            preset['url'],
+            preset['sitemap_pattern'],
+            preset.get('sitemap_selector'),
+            preset.get('sitemap_attribute', 'text')
+        )
+        if data:
+            return data
+        print("⚠️ Sitemap discovery found nothing - falling back to the directory page")
+
+    # Presets that override browser settings or keep their own profile get their own browser
+    use_profile = persistent_profile or preset.get('persistent_profile', False)
+    own_browser_settings = use_profile or any(key in preset for key in ('page_load_strategy', 'block_resources'))
+
+    if preset['mode'] == 'selenium' and driver_pool is not None and not own_browser_settings:
+        with driver_pool.driver() as scraper:
+            data = scrape_preset_with_browser(scraper, preset, snapshot)
+    elif preset['mode'] == 'selenium':
+        scraper = SeleniumScraper(
+            headless=True,
+            page_load_strategy=preset.get('page_load_strategy', 'normal'),
+            block_resources=preset.get('block_resources', 'standard'),
+            profile=preset['name'] if use_profile else None,
+            disk_cache_mb=disk_cache_mb,
+            remote=remote,
+            trace_dir=trace_dir
+        )
+        try:
+            data = scrape_preset_with_browser(scraper, preset, snapshot)
         finally:
             scraper.close()
     else:
         scraper = WebTagScraper()
+        if preset.get('pages'):
+            # Paginated preset ('auto' probes how many pages exist)
+            data = scraper.scrape_multiple_pages(
+                preset['url'],
+                preset['selector'],
+                preset['attribute'],
+                pages=preset['pages'],
+                page_param=preset.get('page_param', 'page')
+            )
         # Use specialized exhibition method for simple scraper
-        if 'exhibition' in preset['name'].lower() or 'exhibitor' in preset['name'].lower():
+        elif 'exhibition' in preset['name'].lower() or 'exhibitor' in preset['name'].lower():
             data = scraper.scrape_exhibition_exhibitors(
                 preset['url'],
                 preset['selector'],
@@ -102,18 +302,84 @@ def scrape_with_preset(preset):
     return data
 
 
+def iter_preset_rows(presets, stats, driver_pool=None, snapshot=False, persistent_profile=False,
+                     disk_cache_mb=256, remote=None, trace_dir=None):
+    """
+    Run presets one after another, yielding a row per extracted item
+
+    A failing preset is reported and skipped so the rest of the batch still runs.
+    """
+    for preset in presets:
+        try:
+            data = scrape_with_preset(preset, driver_pool, persistent_profile=persistent_profile,
+                                      disk_cache_mb=disk_cache_mb, snapshot=snapshot, remote=remote,
+                                      trace_dir=trace_dir) or []
+        except Exception as e:
+            print(f"❌ Preset '{preset['name']}' failed: {e}")
+            data = []
+        if not data:
+            stats['failed'] += 1
+        for item in data:
+            content = json.dumps(item, ensure_ascii=False) if isinstance(item, dict) else item
+            yield {'Preset': preset['name'], 'Extracted_Content': content}
+
+
+def merge_main(argv):
+    """Entry point for: main.py merge MANIFEST [MANIFEST ...] -o merged.csv"""
+    parser = argparse.ArgumentParser(
+        prog='main.py merge',
+        description='🧩 Combine sharded outputs into one de-duplicated CSV'
+    )
+    parser.add_argument('manifests', nargs='+', help='Shard manifest files (*.manifest.json)')
+    parser.add_argument('-o', '--output', default='merged.csv',
+                        help='Merged output filename (default: merged.csv)')
+    args = parser.parse_args(argv)
+
+    exporter = DataExporter()
+    output_path = os.path.join(exporter.output_dir, args.output)
+    try:
+        result = merge_shards(args.manifests, output_path)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ Merge failed: {e}")
+        sys.exit(1)
+
+    print(f"✅ SUCCESS: Merged {result['rows']} rows ({result['duplicates']} duplicates dropped)")
+    if result['partial']:
+        print(f"⚠️ Shards {result['partial']} were interrupted - the merged output is incomplete")
+    print(f"💾 Saved to: {output_path}")
+    if result['missing'] or result['partial']:
+        sys.exit(1)
+
+
+def page_count(value):
+    """argparse type for --pages: a positive number or 'auto'"""
+    if value == 'auto':
+        return value
+    try:
+        pages = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("must be a number or 'auto'")
+    if pages < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return pages
+
+
 def main():
     """Main CLI function"""
+    if len(sys.argv) > 1 and sys.argv[1] == 'merge':
+        merge_main(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(
         description='🎪 WebTagContent Extractor - Extract content from HTML tags with exhibition support',
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
-  # Basic scraping
+  # Basic scraping (auto mode races a plain HTTP request against a browser)
   python main.py https://example.com "h1, p" -o output.csv
 
   # Use a preset
-  python main.py --preset "International Cyber Expo - All Exhibitors"
+  python main.py --preset "Eurosatory 2024 - All Exhibitors"
 
   # List all presets
   python main.py --list-presets
@@ -121,8 +387,61 @@ Examples:
   # Exhibition scraping with Selenium
   python main.py https://www.internationalcyberexpo.com/exhibitors-list ".m-exhibitors-list_list_items_item_header_title" --mode selenium
 
-  # Multiple pages
-  python main.py https://example.com/exhibitors "h2" --pages 5 --page-param page
+  # Multiple pages (selenium mode renders them on --drivers browsers at once)
+  python main.py https://example.com/exhibitors "h2" --pages 5 --page-param page --drivers 3
+
+  # Probe how many pages exist and stop at the first empty or repeated page
+  python main.py "https://example.com/exhibitors?page=1" "h2" --pages auto
+
+  # List every exhibitor profile URL from the site's sitemaps (no browser)
+  python main.py https://example.com --sitemap --url-pattern "/exhibitors/[^/]+/$"
+
+  # ...and extract a field from each profile page concurrently
+  python main.py https://example.com "h1" --sitemap --url-pattern "/exhibitors/" --prefetch 8
+
+  # Follow every profile link and pull country and stand from the detail pages
+  python main.py https://example.com/exhibitors "a.profile" --detail-field country=.country --detail-field "website=a.website@href"
+
+  # Resumable crawl that follows exhibitor and next-page links
+  python main.py https://example.com/exhibitors "h1" --crawl crawl.db --follow "a.exhibitor, a[rel=next]"
+
+  # Bulk mode: one URL per line (optionally url<TAB>selector<TAB>attribute), from a file or stdin
+  python main.py --input urls.txt "h1" --workers 16
+  cat urls.txt | python main.py --input - "h1"
+
+  # Find the JSON API behind a Load More directory once; later preset runs need no browser
+  python main.py --preset "SECON Expo 2026 Exhibitors" --discover-api
+
+  # Split a URL list or every preset across 4 machines, then merge the shards
+  python main.py --input urls.txt "h1" --shard 0/4 -o run.csv
+  python main.py --all-presets --shard 1/4 -o presets.csv
+  python main.py merge outputs/run.shard-*.manifest.json -o run.csv
+
+  # Keep each site's Chrome profile and HTTP cache between runs (JS bundles load from disk)
+  python main.py https://example.com/exhibitors "h2" --mode selenium --persistent-profile --profile-cache-mb 512
+  python main.py --cleanup-profiles
+
+  # Keep the rendered page, then try other selectors on it without a browser
+  python main.py --preset "Eurosatory 2024 - All Exhibitors" --snapshot
+  python main.py --preset "Eurosatory 2024 - All Exhibitors" --from-snapshot
+  python main.py https://example.com/exhibitors "a.profile" -a href --from-snapshot
+  python main.py --from-snapshot ~/.cache/webtag-extractor/snapshots/example.com-20260101-120000-000000.html.gz "h2"
+
+  # Render on remote WebDriver nodes (Selenium Grid or standalone chromedriver), scheduled by free capacity
+  python main.py https://example.com/exhibitors "h2" --pages 40 --remote http://grid:4444 --drivers 12
+  python main.py --all-presets --remote http://10.0.0.5:9515 --remote http://10.0.0.6:9515 --node-capacity 4
+
+  # Try the render farm code paths locally with 3 chromedriver processes
+  python main.py https://example.com/exhibitors "h2" --pages 6 --local-nodes 3
+
+  # See where a slow Selenium scrape spends its time (per-command summary + JSON trace in traces/)
+  python main.py https://example.com/exhibitors "h2" --mode selenium --trace
+
+  # Stream a huge single-page directory with bounded memory
+  python main.py https://example.com/all-exhibitors "h5" --low-memory
+
+  # Multiple pages parsed on 4 worker processes, downloading 3 pages ahead
+  python main.py https://example.com/exhibitors "h2" --pages 20 --parse-workers 4 --prefetch 3
         """
     )
 
@@ -134,6 +453,8 @@ Examples:
     parser.add_argument('-p', '--preset', help='Use a predefined scraping preset')
     parser.add_argument('-l', '--list-presets', action='store_true',
                         help='List all available presets')
+    parser.add_argument('--all-presets', action='store_true',
+                        help='Run every preset (combine with --shard to split them across machines)')
 
     # Output options
     parser.add_argument('-o', '--output', default='extracted_data.csv',
@@ -145,11 +466,15 @@ Examples:
     parser.add_argument('-a', '--attribute', default='text',
                         help='Attribute to extract (text, class, href, etc.)')
     parser.add_argument('-m', '--mode', choices=['simple', 'selenium', 'auto'], default='auto',
-                        help='Scraping mode (default: auto)')
+                        help='Scraping mode (default: auto - simple and Selenium race, the first usable result '
+                             'wins; multi-page runs use Selenium)')
+    parser.add_argument('--hedge-delay', type=float, default=HEDGE_DELAY,
+                        help=f'Seconds auto mode gives simple mode before launching Selenium too; domains that '
+                             f'needed Selenium before skip the wait (default: {HEDGE_DELAY})')
 
     # Advanced options
-    parser.add_argument('--pages', type=int, default=1,
-                        help='Number of pages to scrape (for pagination)')
+    parser.add_argument('--pages', type=page_count, default=1,
+                        help="Number of pages to scrape, or 'auto' to probe the page count (simple mode)")
     parser.add_argument('--page-param', default='page',
                         help='URL parameter name for pagination (default: page)')
     parser.add_argument('--delay', type=float, default=2,
@@ -158,6 +483,67 @@ Examples:
                         help='Request timeout in seconds (default: 30)')
     parser.add_argument('--headless', action='store_true', default=True,
                         help='Run browser in headless mode (Selenium only)')
+    parser.add_argument('--page-load-strategy', choices=['normal', 'eager'], default='normal',
+                        help="'eager' returns from page loads at DOMContentLoaded and waits for network/DOM "
+                             "quiet instead (Selenium only)")
+    parser.add_argument('--block-resources', choices=['none', 'trackers', 'standard', 'aggressive'],
+                        default='standard',
+                        help='Resources the browser skips: trackers; standard adds images, fonts and media; '
+                             'aggressive adds stylesheets (default: standard, Selenium only)')
+    parser.add_argument('--persistent-profile', action='store_true',
+                        help='Reuse a Chrome profile and disk cache per site or preset across runs (Selenium only)')
+    parser.add_argument('--profile-cache-mb', type=int, default=256,
+                        help='Disk cache limit per persistent profile in MB (default: 256)')
+    parser.add_argument('--cleanup-profiles', action='store_true',
+                        help='Delete idle and oversized persistent profiles, then exit')
+    parser.add_argument('--snapshot', action='store_true',
+                        help='Save the rendered page of Selenium runs for later --from-snapshot extraction')
+    parser.add_argument('--from-snapshot', nargs='?', const='latest', default=None, metavar='PATH',
+                        help='Extract from a saved snapshot instead of the live page (without PATH: the latest '
+                             'snapshot of the URL or preset)')
+    parser.add_argument('--trace', nargs='?', const='traces', default=None, metavar='DIR',
+                        help='Record every WebDriver command and sleep, print a summary per scrape and write '
+                             'JSON traces to DIR (default: traces, Selenium only)')
+    parser.add_argument('--discover-api', action='store_true',
+                        help='Record the JSON calls behind Load More once, save them to the preset as an '
+                             'API recipe and fetch every page over HTTP')
+    parser.add_argument('--drivers', type=int, default=None,
+                        help='Number of browsers for selenium presets and multi-page selenium scraping '
+                             '(default: 2, or the render farm capacity with --remote)')
+    parser.add_argument('--remote', action='append', default=[], metavar='URL',
+                        help='Render on a remote WebDriver endpoint - Selenium Grid or chromedriver (repeatable)')
+    parser.add_argument('--node-capacity', type=int, default=2,
+                        help='Browsers per remote endpoint that does not report its slots (default: 2)')
+    parser.add_argument('--local-nodes', type=int, default=0,
+                        help='Start N local chromedriver processes as a stand-in render farm')
+    parser.add_argument('--parse-workers', type=int, default=None,
+                        help='Parse pages on N worker processes (multi-page simple mode)')
+    parser.add_argument('--prefetch', type=int, default=0,
+                        help='Download N pages ahead while the current page is parsed (multi-page simple mode)')
+    parser.add_argument('--sitemap', action='store_true',
+                        help='Enumerate URLs from robots.txt/sitemap.xml instead of scraping the URL itself')
+    parser.add_argument('--url-pattern', default=None,
+                        help='Regex that sitemap URLs must match (with --sitemap)')
+    parser.add_argument('--detail-field', action='append', default=[], metavar='NAME=SELECTOR[@ATTR]',
+                        help='Follow the links matched by the selector and extract this field from every '
+                             'detail page (repeatable)')
+    parser.add_argument('--crawl', metavar='DB',
+                        help='Crawl from the URL using a persistent SQLite frontier (resumes if DB exists)')
+    parser.add_argument('--follow', default=None,
+                        help='CSS selector for links to follow while crawling')
+    parser.add_argument('--max-pages', type=int, default=None,
+                        help='Stop the crawl after N pages in this run')
+    parser.add_argument('--max-depth', type=int, default=None,
+                        help='Do not follow links deeper than N while crawling')
+    parser.add_argument('--input', metavar='FILE',
+                        help="Scrape every URL listed in FILE ('-' for stdin); lines are url[<TAB>selector[<TAB>attribute]]")
+    parser.add_argument('--workers', type=int, default=8,
+                        help='Number of URLs processed at once with --input (default: 8)')
+    parser.add_argument('--shard', type=parse_shard, default=None, metavar='i/N',
+                        help='Only process the URLs (--input) or presets (--all-presets) hashed to shard i of N, '
+                             'and write a manifest for "main.py merge"')
+    parser.add_argument('--low-memory', action='store_true',
+                        help='Stream a single huge page straight to the output file (simple mode)')
 
     args = parser.parse_args()
 
@@ -166,15 +552,291 @@ Examples:
         list_presets()
         return
 
+    if args.cleanup_profiles:
+        cleanup_profiles()
+        return
+
+    # Remote render farm (local chromedriver processes stand in for real nodes)
+    render_farm = None
+    if args.local_nodes:
+        local_nodes = LocalNodes(args.local_nodes)
+        atexit.register(local_nodes.close)
+        args.remote += local_nodes.endpoints
+    if args.remote:
+        render_farm = RenderFarm(args.remote, capacity=args.node_capacity)
+    if args.drivers is None:
+        args.drivers = render_farm.total_capacity() if render_farm else 2
+
+    # Handle re-extraction from a stored rendered page (no network, no browser)
+    if args.from_snapshot:
+        preset = get_preset_by_name(args.preset) if args.preset else None
+        if args.preset and not preset:
+            print(f"❌ Preset '{args.preset}' not found")
+            sys.exit(1)
+        if args.from_snapshot != 'latest' and args.selector is None:
+            # Only a selector follows the snapshot path
+            args.url, args.selector = None, args.url
+        selector = args.selector or (preset['selector'] if preset else None)
+        attribute = args.attribute if args.selector or not preset else preset['attribute']
+        ref = args.from_snapshot
+        if ref == 'latest':
+            ref = preset['name'] if preset else args.url
+        if not ref or not selector:
+            print("❌ --from-snapshot needs a snapshot path, URL or preset and a selector")
+            sys.exit(1)
+
+        try:
+            _, data = extract_from_snapshot(ref, selector, attribute)
+        except FileNotFoundError as e:
+            print(f"❌ {e}")
+            print("💡 Render the page once with --snapshot first")
+            sys.exit(1)
+
+    # Handle JSON API discovery (records the Load More traffic once)
+    elif args.discover_api:
+        preset = get_preset_by_name(args.preset) if args.preset else None
+        if args.preset and not preset:
+            print(f"❌ Preset '{args.preset}' not found")
+            sys.exit(1)
+        url = preset['url'] if preset else args.url
+        selector = preset['selector'] if preset else args.selector
+        attribute = preset['attribute'] if preset else args.attribute
+        if not url or not selector:
+            print("❌ --discover-api needs a preset or a URL and selector")
+            sys.exit(1)
+
+        profile = (preset['name'] if preset else urlparse(url).netloc) if args.persistent_profile else None
+        scraper = SeleniumScraper(headless=args.headless, capture_network=True,
+                                  block_resources=args.block_resources, profile=profile,
+                                  disk_cache_mb=args.profile_cache_mb, remote=render_farm,
+                                  trace_dir=args.trace)
+        try:
+            recipe = scraper.discover_api(url, selector, attribute)
+        finally:
+            scraper.close()
+
+        if not recipe:
+            print("💡 The directory may render server-side - try --pages or --sitemap instead")
+            sys.exit(1)
+
+        print(f"📜 API recipe:\n{json.dumps(recipe, indent=2)}")
+        if preset:
+            save_preset_recipe(preset['name'], recipe)
+
+        # Replay it right away so this run produces data too
+        api_scraper = WebTagScraper()
+        try:
+            data = api_scraper.scrape_api(recipe)
+        finally:
+            api_scraper.close()
+
     # Handle preset mode
-    if args.preset:
+    elif args.preset:
         preset = get_preset_by_name(args.preset)
         if not preset:
             print(f"❌ Preset '{args.preset}' not found")
             print("💡 Use --list-presets to see available presets")
             sys.exit(1)
 
-        data = scrape_with_preset(preset)
+        data = scrape_with_preset(preset, persistent_profile=args.persistent_profile,
+                                  disk_cache_mb=args.profile_cache_mb, snapshot=args.snapshot,
+                                  remote=render_farm, trace_dir=args.trace)
+
+    # Handle running every preset (optionally one shard of them)
+    elif args.all_presets:
+        presets = [preset for preset in load_presets() if in_shard(preset['name'], args.shard)]
+        output = shard_filename(args.output, args.shard) if args.shard else args.output
+        print(f"🎪 Running {len(presets)} presets" + (f" (shard {args.shard[0]}/{args.shard[1]})" if args.shard else ""))
+
+        # Browsers warm up in the background while HTTP presets run; with persistent
+        # profiles every selenium preset launches on its own profile instead
+        driver_pool = None
+        if any(preset['mode'] == 'selenium' for preset in presets) and not args.persistent_profile:
+            driver_pool = DriverPool(size=args.drivers, headless=args.headless,
+                                     page_load_strategy=args.page_load_strategy,
+                                     block_resources=args.block_resources,
+                                     remote=render_farm, trace_dir=args.trace)
+
+        exporter = DataExporter()
+        stats = {'failed': 0}
+        interrupted = False
+        try:
+            rows = iter_preset_rows(presets, stats, driver_pool, args.snapshot,
+                                    persistent_profile=args.persistent_profile,
+                                    disk_cache_mb=args.profile_cache_mb, remote=render_farm,
+                                    trace_dir=args.trace)
+            output_path = exporter.export_rows(rows, output)
+        except KeyboardInterrupt:
+            print("⏸️ Preset run interrupted - partial results kept")
+            output_path = os.path.join(exporter.output_dir, output)
+            interrupted = True
+        finally:
+            if driver_pool is not None:
+                driver_pool.close()
+
+        if args.shard:
+            manifest = write_manifest(output_path, args.shard, 'presets', exporter.rows_written,
+                                      len(presets), stats['failed'], complete=not interrupted)
+            print(f"🧾 Manifest: {manifest}" + (" (marked incomplete)" if interrupted else ""))
+
+        print(f"📊 {len(presets) - stats['failed']} presets succeeded, {stats['failed']} failed")
+        if not exporter.rows_written and presets:
+            print("❌ No data found with the given parameters")
+            sys.exit(1)
+
+        print(f"✅ SUCCESS: Extracted {exporter.rows_written} items")
+        print(f"💾 Saved to: {output_path}")
+        return
+
+    # Handle streaming bulk mode
+    elif args.input:
+        # With --input the first positional argument is the default selector
+        default_selector = args.selector or args.url
+        print(f"📥 Bulk mode: {'stdin' if args.input == '-' else args.input}")
+        print(f"🔍 Default selector: {default_selector or '(per line)'}")
+        print(f"👷 Workers: {args.workers}")
+
+        if args.shard:
+            print(f"🧩 Shard: {args.shard[0]}/{args.shard[1]}")
+
+        scraper = WebTagScraper(parse_workers=args.parse_workers)
+        runner = BatchRunner(scraper, workers=args.workers, timeout=args.timeout)
+        exporter = DataExporter()
+        output = shard_filename(args.output, args.shard) if args.shard else args.output
+
+        source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+        interrupted = False
+        try:
+            targets = iter_targets(source, default_selector, args.attribute)
+            targets = (target for target in targets if in_shard(target[0], args.shard))
+            output_path = exporter.export_rows(runner.iter_rows(targets), output)
+        except KeyboardInterrupt:
+            print("⏸️ Bulk run interrupted - partial results kept")
+            output_path = os.path.join(exporter.output_dir, output)
+            interrupted = True
+        finally:
+            scraper.close()
+            if source is not sys.stdin:
+                source.close()
+
+        assigned = runner.succeeded + runner.failed
+        if args.shard:
+            manifest = write_manifest(output_path, args.shard, 'input', exporter.rows_written,
+                                      assigned, runner.failed, complete=not interrupted)
+            print(f"🧾 Manifest: {manifest}" + (" (marked incomplete)" if interrupted else ""))
+
+        print(f"📊 {runner.succeeded} URLs succeeded, {runner.failed} failed")
+        if not exporter.rows_written and assigned:
+            print("❌ No data found with the given parameters")
+            sys.exit(1)
+
+        print(f"✅ SUCCESS: Extracted {exporter.rows_written} items")
+        print(f"💾 Saved to: {output_path}")
+        return
+
+    # Handle sitemap-driven enumeration
+    elif args.url and args.sitemap:
+        print(f"🗺️ Sitemap discovery mode")
+        print(f"🔗 Site: {args.url}")
+        print(f"🔍 URL pattern: {args.url_pattern or '(all)'}")
+
+        data = scrape_from_sitemap(
+            args.url,
+            args.url_pattern,
+            args.selector,
+            args.attribute,
+            prefetch=args.prefetch or 4,
+            parse_workers=args.parse_workers
+        )
+
+    # Handle persistent crawling
+    elif args.url and args.selector and args.crawl:
+        print(f"🕸️ Crawl mode")
+        print(f"🔗 Seed: {args.url}")
+        print(f"🗄️ Frontier: {args.crawl}")
+
+        scraper = WebTagScraper(parse_workers=args.parse_workers)
+        exporter = DataExporter()
+        with CrawlFrontier(args.crawl) as frontier:
+            frontier.add(args.url, priority=1)
+            try:
+                scraper.crawl(
+                    frontier,
+                    args.selector,
+                    args.attribute,
+                    follow_selector=args.follow,
+                    max_pages=args.max_pages,
+                    max_depth=args.max_depth,
+                    prefetch=args.prefetch or 4
+                )
+            except KeyboardInterrupt:
+                print("⏸️ Crawl interrupted - run the same command again to resume")
+            finally:
+                scraper.close()
+
+            output_path = exporter.export(frontier.iter_results(), args.output, args.format)
+
+        if not exporter.rows_written:
+            print("❌ No data found with the given parameters")
+            sys.exit(1)
+
+        print(f"✅ SUCCESS: Extracted {exporter.rows_written} items")
+        print(f"💾 Saved to: {output_path}")
+        return
+
+    # Handle two-stage detail-page enrichment
+    elif args.url and args.selector and args.detail_field:
+        print(f"📑 Detail enrichment mode")
+        print(f"🔗 URL: {args.url}")
+        print(f"🎯 Link selector: {args.selector}")
+
+        detail_fields = {}
+        for field in args.detail_field:
+            name, separator, spec = field.partition('=')
+            if not separator or not name.strip() or not spec.strip():
+                print(f"❌ Invalid --detail-field '{field}' (expected NAME=SELECTOR[@ATTR])")
+                sys.exit(1)
+            detail_fields[name.strip()] = spec.strip()
+
+        scraper = WebTagScraper(parse_workers=args.parse_workers)
+        try:
+            data = scraper.scrape_with_details(
+                args.url,
+                args.selector,
+                detail_fields,
+                attribute=args.attribute if args.attribute != 'text' else 'href',
+                prefetch=args.prefetch or 8
+            )
+        finally:
+            scraper.close()
+
+    # Handle bounded-memory streaming of one huge page
+    elif args.url and args.selector and args.low_memory:
+        print(f"🎯 Low-memory streaming mode")
+        print(f"🔗 URL: {args.url}")
+        print(f"🎯 Selector: {args.selector}")
+
+        scraper = WebTagScraper()
+        exporter = DataExporter()
+        try:
+            output_path = exporter.export(
+                scraper.iter_scrape(args.url, args.selector, args.attribute, timeout=args.timeout),
+                args.output,
+                args.format
+            )
+        except Exception as e:
+            print(f"❌ Streaming error: {e}")
+            sys.exit(1)
+        finally:
+            scraper.close()
+
+        if not exporter.rows_written:
+            print("❌ No data found with the given parameters")
+            sys.exit(1)
+
+        print(f"✅ SUCCESS: Extracted {exporter.rows_written} items")
+        print(f"💾 Saved to: {output_path}")
+        return
 
     # Handle manual mode
     elif args.url and args.selector:
@@ -184,27 +846,39 @@ Examples:
         print(f"🏷️  Attribute: {args.attribute}")
         print(f"⚡ Mode: {args.mode}")
 
-        if args.mode == 'selenium' or (args.mode == 'auto' and args.pages > 1):
+        probe_pages = args.pages == 'auto'
+        profile = urlparse(args.url).netloc if args.persistent_profile else None
+
+        if args.mode == 'selenium' or (args.mode == 'auto' and not probe_pages and args.pages > 1):
             # Use Selenium for JavaScript-heavy sites or multi-page scraping
             print("🚀 Using Selenium mode...")
-            scraper = SeleniumScraper(headless=args.headless)
-            try:
-                if args.pages > 1:
-                    # Handle multi-page scraping with Selenium
-                    all_data = []
-                    for page in range(1, args.pages + 1):
-                        print(f"📄 Processing page {page}/{args.pages}")
-                        page_url = f"{args.url}?{args.page_param}={page}" if '?' in args.url else f"{args.url}?{args.page_param}={page}"
-                        page_data = scraper.scrape(
-                            page_url,
-                            args.selector,
-                            args.attribute,
-                            timeout=args.timeout
-                        )
-                        all_data.extend(page_data)
-                        time.sleep(args.delay)
-                    data = all_data
-                else:
+            if probe_pages:
+                print("⚠️ Page probing needs simple mode - scraping the first page only")
+            if not probe_pages and args.pages > 1:
+                # Pages render concurrently on a small pool of browsers
+                data = scrape_pages_with_browsers(
+                    args.url,
+                    args.selector,
+                    args.attribute,
+                    args.pages,
+                    page_param=args.page_param,
+                    drivers=args.drivers,
+                    headless=args.headless,
+                    timeout=args.timeout,
+                    delay=args.delay,
+                    page_load_strategy=args.page_load_strategy,
+                    block_resources=args.block_resources,
+                    profile=profile,
+                    disk_cache_mb=args.profile_cache_mb,
+                    remote=render_farm,
+                    trace_dir=args.trace
+                )
+            else:
+                scraper = SeleniumScraper(headless=args.headless, page_load_strategy=args.page_load_strategy,
+                                          block_resources=args.block_resources, profile=profile,
+                                          disk_cache_mb=args.profile_cache_mb, remote=render_farm,
+                                          trace_dir=args.trace)
+                try:
                     # Single page with Selenium
                     data = scraper.scrape(
                         args.url,
@@ -212,27 +886,61 @@ Examples:
                         args.attribute,
                         timeout=args.timeout
                     )
+                    if args.snapshot:
+                        scraper.save_snapshot(args.selector, args.attribute)
+                finally:
+                    scraper.close()
+        elif args.mode == 'auto' and not probe_pages:
+            # Single page: start simple mode now and Selenium after the hedge delay; first usable result wins
+            print(f"🏁 Hedged auto mode: simple now, Selenium after {args.hedge_delay}s")
+
+            def open_browser():
+                return SeleniumScraper(headless=args.headless, page_load_strategy=args.page_load_strategy,
+                                       block_resources=args.block_resources, profile=profile,
+                                       disk_cache_mb=args.profile_cache_mb, remote=render_farm,
+                                       trace_dir=args.trace)
+
+            def render(scraper):
+                items = scraper.scrape(args.url, args.selector, args.attribute, timeout=args.timeout)
+                if args.snapshot and items:
+                    scraper.save_snapshot(args.selector, args.attribute)
+                return items
+
+            http_scraper = WebTagScraper()
+            try:
+                data, _ = hedged_scrape(
+                    # No --delay here: JavaScript content is the browser's job
+                    lambda: http_scraper.scrape(args.url, args.selector, args.attribute, timeout=args.timeout),
+                    open_browser,
+                    render,
+                    domain=urlparse(args.url).netloc,
+                    hedge_delay=args.hedge_delay
+                )
             finally:
-                scraper.close()
+                http_scraper.close()
         else:
             # Use simple scraper
-            scraper = WebTagScraper()
-            if args.pages > 1:
-                data = scraper.scrape_multiple_pages(
-                    args.url,
-                    args.selector,
-                    args.attribute,
-                    pages=args.pages,
-                    page_param=args.page_param
-                )
-            else:
-                data = scraper.scrape(
-                    args.url,
-                    args.selector,
-                    args.attribute,
-                    delay=args.delay,
-                    timeout=args.timeout
-                )
+            scraper = WebTagScraper(parse_workers=args.parse_workers)
+            try:
+                if probe_pages or args.pages > 1:
+                    data = scraper.scrape_multiple_pages(
+                        args.url,
+                        args.selector,
+                        args.attribute,
+                        pages=args.pages,
+                        page_param=args.page_param,
+                        prefetch=args.prefetch
+                    )
+                else:
+                    data = scraper.scrape(
+                        args.url,
+                        args.selector,
+                        args.attribute,
+                        delay=args.delay,
+                        timeout=args.timeout
+                    )
+            finally:
+                scraper.close()
 
     else:
         print("❌ Please provide either a preset name or URL and selector")
@@ -242,7 +950,10 @@ Examples:
     # Export results
     if data:
         exporter = DataExporter()
-        output_path = exporter.export(data, args.output, args.format)
+        if isinstance(data[0], dict):
+            output_path = exporter.export_rows(data, args.output)
+        else:
+            output_path = exporter.export(data, args.output, args.format)
 
         print(f"✅ SUCCESS: Extracted {len(data)} items")
         print(f"💾 Saved to: {output_path}")
@@ -0,0 +1,157 @@
+"""
+Pagination detection and page URL helpers
+"""
+
+import re
+from urllib.parse import urljoin, urlparse, parse_qsl, urlencode, urlunparse
+
+from bs4 import NavigableString, Tag
+
+
+# Class/id fragments that mark a pagination container
+PAGINATION_HINTS = ('pagination', 'pager', 'page-numbers')
+
+# "Page 2 of 10", "Seite 2 von 10", "Página 2 de 10", "Pagina 2 di 10", "ページ 2 / 10"
+PAGE_OF_TOTAL = re.compile(
+    r'(?:page|pagina|página|seite|ページ)\D{0,10}?(\d+)\s*(?:of|von|de|di|sur|/)\s*(\d+)',
+    re.IGNORECASE
+)
+
+PAGE_PLACEHOLDER = '{page}'
+
+
+def build_page_url(base_url, page_number, page_param='page', template=None):
+    """
+    Build the URL for a specific page number
+
+    Uses a detected URL template when there is one, otherwise sets (or
+    replaces) the page parameter in the query string.
+    """
+    if template:
+        return template.replace(PAGE_PLACEHOLDER, str(page_number))
+
+    parts = urlparse(base_url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if any(key == page_param for key, _ in query):
+        query = [(key, str(page_number) if key == page_param else value) for key, value in query]
+    else:
+        query.append((page_param, str(page_number)))
+    return urlunparse(parts._replace(query=urlencode(query)))
+
+
+def _is_pagination_container(tag):
+    classes = tag.get('class') or []
+    names = ' '.join(classes).lower() + ' ' + (tag.get('id') or '').lower()
+    return any(hint in names for hint in PAGINATION_HINTS)
+
+
+def _container_of(tag, containers):
+    """Return the pagination container a tag sits in, if any"""
+    for parent in tag.parents:
+        if parent in containers:
+            return parent
+    return None
+
+
+def url_template_from_link(href, page_number, base_url=None):
+    """
+    Turn a link to a known page number into a '{page}' URL template
+
+    Looks for the number as a query value first, then as a path segment
+    such as /page/3/ or /3/.
+    """
+    url = urljoin(base_url, href) if base_url else href
+    parts = urlparse(url)
+    number = str(page_number)
+
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    for index, (key, value) in enumerate(query):
+        if value == number:
+            marker = '__PAGE__'
+            query[index] = (key, marker)
+            templated = urlunparse(parts._replace(query=urlencode(query)))
+            return templated.replace(marker, PAGE_PLACEHOLDER)
+
+    path, count = re.subn(rf'(?<=[/=-]){number}(?=/?$)', PAGE_PLACEHOLDER, parts.path)
+    if count:
+        return urlunparse(parts._replace(path=path))
+    return None
+
+
+def detect_pagination(soup, base_url=None, current_page=1):
+    """
+    Detect pagination in a single traversal of the parsed page
+
+    Collects pagination containers, numeric page links inside them,
+    rel="next" links (<a> and <link>) and "X of Y" text in every supported
+    language in one walk over the tree.
+
+    Returns:
+        Dict with any of: 'total_pages', 'selector', 'next_url', 'url_template'
+    """
+    containers = set()
+    container_selector = None
+    page_links = {}
+    next_href = None
+    text_total = None
+
+    for node in soup.descendants:
+        if isinstance(node, Tag):
+            if node.name in ('a', 'link') and next_href is None:
+                rel = node.get('rel') or []
+                if isinstance(rel, str):
+                    rel = rel.split()
+                if 'next' in [value.lower() for value in rel] and node.get('href'):
+                    next_href = node['href']
+
+            if _is_pagination_container(node):
+                containers.add(node)
+                if container_selector is None and node.get('class'):
+                    container_selector = '.' + '.'.join(node['class'])
+            continue
+
+        if not isinstance(node, NavigableString) or node.parent is None:
+            continue
+        if node.parent.name in ('script', 'style'):
+            continue
+
+        text = node.strip()
+        if not text:
+            continue
+
+        if text.isdigit() and containers:
+            link = node.parent if node.parent.name in ('a', 'li') else node.find_parent(['a', 'li'])
+            if link is not None and _container_of(link, containers) is not None:
+                page_links.setdefault(int(text), link.get('href') if link.name == 'a' else None)
+            continue
+
+        if text_total is None and any(char.isdigit() for char in text):
+            match = PAGE_OF_TOTAL.search(text)
+            if match:
+                text_total = int(match.group(2))
+
+    pagination_info = {}
+
+    if text_total:
+        pagination_info['total_pages'] = text_total
+    elif page_links:
+        pagination_info['total_pages'] = max(page_links)
+    if container_selector:
+        pagination_info['selector'] = container_selector
+
+    if next_href:
+        pagination_info['next_url'] = urljoin(base_url, next_href) if base_url else next_href
+
+    # Derive a URL template from the next link or any numbered page link
+    candidates = []
+    if next_href:
+        candidates.append((next_href, current_page + 1))
+    candidates.extend((href, number) for number, href in sorted(page_links.items())
+                      if href and number != current_page)
+    for href, number in candidates:
+        template = url_template_from_link(href, number, base_url)
+        if template:
+            pagination_info['url_template'] = template
+            break
+
+    return pagination_info
@@ -0,0 +1,104 @@
+"""
+Pipelined page prefetching
+
+While the current page is parsed, the next few pages are already
+downloading on a small thread pool, so network and CPU time overlap even
+when pages have to be processed strictly in order.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+class PagePrefetcher:
+    """
+    Download pages ahead of the parser
+
+    Args:
+        session: requests.Session shared with the scraper
+        depth: Maximum number of pages downloading or waiting to be consumed
+        timeout: Request timeout in seconds
+        delay: Minimum seconds between the start of two requests (politeness)
+    """
+
+    def __init__(self, session, depth=2, timeout=30, delay=0):
+        self.session = session
+        self.depth = max(1, depth)
+        self.timeout = timeout
+        self.delay = delay
+        self._executor = ThreadPoolExecutor(max_workers=self.depth)
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def __len__(self):
+        return len(self._futures)
+
+    def __contains__(self, url):
+        return url in self._futures
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def has_room(self):
+        """Check whether another page can be queued"""
+        return len(self._futures) < self.depth
+
+    def submit(self, url):
+        """
+        Start downloading a page in the background
+
+        Returns False if the page is already queued or the queue is full.
+        """
+        if url in self._futures or not self.has_room():
+            return False
+        self._futures[url] = self._executor.submit(self._download, url)
+        return True
+
+    def get(self, url):
+        """Wait for a page and return its raw bytes (None on network errors)"""
+        if url not in self._futures:
+            self._futures[url] = self._executor.submit(self._download, url)
+        future = self._futures.pop(url)
+
+        try:
+            return future.result()
+        except requests.RequestException as e:
+            print(f"❌ Network error: {e}")
+            return None
+
+    def discard(self, url):
+        """Drop a queued page that will not be consumed, freeing its slot"""
+        future = self._futures.pop(url, None)
+        if future is not None:
+            future.cancel()
+
+    def _download(self, url):
+        self._wait_turn()
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.content
+
+    def _wait_turn(self):
+        """Space request starts at least `delay` seconds apart"""
+        if not self.delay:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.delay
+        if start > now:
+            time.sleep(start - now)
+
+    def close(self):
+        """Cancel pages that were never consumed"""
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        self._executor.shutdown(wait=False)
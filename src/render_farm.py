@@ -0,0 +1,348 @@
+"""
+Remote WebDriver render farm
+
+Rendering on webdriver.Chrome is capped by one machine's CPU and RAM.
+RenderFarm spreads browser sessions over remote WebDriver endpoints - a
+Selenium Grid hub, standalone Selenium nodes or plain chromedriver
+processes on other hosts. Each new session goes to the endpoint with the
+most free capacity according to its /status; an endpoint that fails is
+benched for a while and the session is retried on the next one.
+
+LocalNodes starts several chromedriver processes on this machine as a
+docker-less stand-in for testing the farm code paths.
+"""
+
+import shutil
+import subprocess
+import threading
+import time
+
+import requests
+from selenium import webdriver
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+
+from src.driver_resolver import detect_chrome_version, resolve_chromedriver
+
+
+# /status answers are reused for this many seconds
+STATUS_TTL = 5
+# A failed endpoint gets no new sessions for this many seconds
+FAILURE_COOLDOWN = 60
+
+
+def free_slots(status):
+    """
+    Free session slots reported by a /status payload
+
+    Selenium Grid 4 lists every node with its slots; standalone chromedriver
+    only reports whether it is ready.
+
+    Returns:
+        Number of free slots, or None when the endpoint does not report them
+    """
+    value = status.get('value') or {}
+    nodes = value.get('nodes')
+    if nodes is None:
+        return None
+    free = 0
+    for node in nodes:
+        if node.get('availability', 'UP') != 'UP':
+            continue
+        free += sum(1 for slot in node.get('slots', []) if not slot.get('session'))
+    return free
+
+
+class RemoteChrome(webdriver.Remote):
+    """Remote Chrome session that still accepts CDP commands (readiness tracker, resource blocking)"""
+
+    def __init__(self, url, options):
+        executor = ChromiumRemoteConnection(url, 'goog', 'chrome', keep_alive=True)
+        super().__init__(command_executor=executor, options=options)
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        return self.execute("executeCdpCommand", {"cmd": cmd, "params": cmd_args})["value"]
+
+
+class RenderNode:
+    """One WebDriver endpoint and what the farm knows about it"""
+
+    def __init__(self, url, capacity):
+        self.url = url.rstrip('/')
+        self.capacity = capacity
+        self.active = 0
+        self.ready = True
+        self.reported_free = None
+        self.checked_at = 0
+        self.failed_until = 0
+
+    def free(self):
+        """Sessions this node can still take"""
+        if self.reported_free is not None:
+            return self.reported_free
+        return self.capacity - self.active
+
+    def __repr__(self):
+        return f"RenderNode({self.url}, active={self.active}, free={self.free()})"
+
+
+class RenderFarm:
+    """
+    Schedule browser sessions over remote WebDriver endpoints
+
+    Args:
+        endpoints: WebDriver URLs (e.g. http://grid:4444 or http://10.0.0.5:9515)
+        capacity: Sessions per endpoint when its /status does not report slots
+        wait_timeout: Seconds start() waits for free capacity before giving up
+    """
+
+    def __init__(self, endpoints, capacity=2, wait_timeout=120):
+        if not endpoints:
+            raise ValueError("RenderFarm needs at least one endpoint")
+        self.nodes = [RenderNode(url, capacity) for url in endpoints]
+        self.wait_timeout = wait_timeout
+        self._lock = threading.Lock()
+
+    def refresh(self, node):
+        """Ask an endpoint how many sessions it can take (call without holding the lock)"""
+        try:
+            response = requests.get(f"{node.url}/status", timeout=3)
+            status = response.json()
+            ready = bool((status.get('value') or {}).get('ready', True))
+            reported_free = free_slots(status)
+        except (requests.RequestException, ValueError) as e:
+            if node.ready:
+                print(f"⚠️ Render node {node.url} status failed: {e}")
+            ready, reported_free = False, node.reported_free
+        with self._lock:
+            node.ready = ready
+            node.reported_free = reported_free
+            node.checked_at = time.monotonic()
+
+    def _candidates(self):
+        """Usable nodes, most free capacity first"""
+        # /status requests run outside the lock so session starts don't queue behind them
+        now = time.monotonic()
+        with self._lock:
+            stale = [node for node in self.nodes
+                     if node.failed_until <= now and now - node.checked_at > STATUS_TTL]
+        for node in stale:
+            self.refresh(node)
+        with self._lock:
+            usable = [node for node in self.nodes
+                      if node.ready and node.failed_until <= now and node.free() > 0]
+            return sorted(usable, key=lambda node: node.free(), reverse=True)
+
+    def _reserve(self, node):
+        node.active += 1
+        if node.reported_free is not None:
+            # Counted by the node itself at the next /status refresh
+            node.reported_free -= 1
+
+    def release(self, node):
+        """Give back the capacity of a finished session"""
+        with self._lock:
+            node.active = max(0, node.active - 1)
+
+    def mark_failed(self, node):
+        """Stop scheduling sessions on a node for a while"""
+        with self._lock:
+            node.failed_until = time.monotonic() + FAILURE_COOLDOWN
+            node.checked_at = 0
+        print(f"🚧 Render node {node.url} benched for {FAILURE_COOLDOWN}s")
+
+    def start(self, options, label='Remote Chrome'):
+        """
+        Open a browser session on the node with the most free capacity
+
+        Nodes that refuse the session are benched and the next one is tried.
+
+        Returns:
+            (driver, node); pass node to release() once the driver has quit
+        """
+        started = time.monotonic()
+        last_error = None
+        while True:
+            for node in self._candidates():
+                with self._lock:
+                    if node.free() <= 0:
+                        continue
+                    self._reserve(node)
+                try:
+                    driver = RemoteChrome(node.url, options)
+                except Exception as e:
+                    print(f"⚠️ {label}: session on {node.url} failed: {e}")
+                    self.release(node)
+                    self.mark_failed(node)
+                    last_error = e
+                    continue
+                print(f"⏱️ {label} started on {node.url} in {time.monotonic() - started:.1f}s")
+                return driver, node
+
+            if time.monotonic() - started > self.wait_timeout:
+                raise RuntimeError(f"No render node had free capacity within {self.wait_timeout}s"
+                                   + (f" (last error: {last_error})" if last_error else ""))
+            time.sleep(1)
+
+    def total_capacity(self):
+        """Sessions the farm can run at once, as far as it knows"""
+        for node in self.nodes:
+            self.refresh(node)
+        with self._lock:
+            return sum(node.free() + node.active for node in self.nodes if node.ready)
+
+
+class LocalNodes:
+    """
+    Docker-less stand-in for a render farm: several local chromedriver processes
+
+    Example:
+        with LocalNodes(3) as nodes:
+            farm = RenderFarm(nodes.endpoints)
+
+    Args:
+        count: Number of chromedriver processes
+        base_port: Port of the first process; the others follow
+    """
+
+    def __init__(self, count=2, base_port=9600, startup_timeout=20):
+        driver_path, _ = resolve_chromedriver(detect_chrome_version())
+        driver_path = driver_path or shutil.which('chromedriver')
+        if not driver_path:
+            raise RuntimeError("LocalNodes needs a chromedriver on PATH or in the driver cache")
+
+        self.endpoints = []
+        self._processes = []
+        for index in range(count):
+            port = base_port + index
+            process = subprocess.Popen([driver_path, f"--port={port}"],
+                                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            self._processes.append(process)
+            self.endpoints.append(f"http://127.0.0.1:{port}")
+
+        deadline = time.monotonic() + startup_timeout
+        for endpoint, process in zip(self.endpoints, self._processes):
+            while True:
+                try:
+                    if requests.get(f"{endpoint}/status", timeout=1).ok:
+                        break
+                except requests.RequestException:
+                    pass
+                if process.poll() is not None or time.monotonic() > deadline:
+                    self.close()
+                    raise RuntimeError(f"Local render node {endpoint} did not start")
+                time.sleep(0.2)
+        print(f"🖥️ Started {count} local render nodes: {', '.join(self.endpoints)}")
+
+    def close(self):
+        """Stop every chromedriver process"""
+        for process in self._processes:
+            if process.poll() is None:
+                process.terminate()
+        for process in self._processes:
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self._processes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _fake_endpoint(slots=None, refuse=False, status_delay=0):
+    """WebDriver endpoint stub for test_scheduling(); returns (url, server)"""
+    import itertools
+    import json
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    session_ids = itertools.count()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send(self, code, value):
+            body = json.dumps({'value': value}).encode()
+            self.send_response(code)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            time.sleep(status_delay)
+            value = {'ready': True}
+            if slots is not None:
+                value['nodes'] = [{'availability': 'UP', 'slots': [{'session': None}] * slots}]
+            self._send(200, value)
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            if self.path == '/session':
+                if refuse:
+                    return self._send(500, {'error': 'session not created', 'message': 'node broken',
+                                            'stacktrace': ''})
+                return self._send(200, {'sessionId': f"s{next(session_ids)}",
+                                        'capabilities': {'browserName': 'chrome'}})
+            self._send(200, None)
+
+        def do_DELETE(self):
+            self._send(200, None)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}", server
+
+
+def test_scheduling():
+    """Sessions go to the node with the most free slots; a node that refuses sessions is benched"""
+    from selenium.webdriver.chrome.options import Options
+
+    small, small_server = _fake_endpoint()
+    grid, grid_server = _fake_endpoint(slots=3)
+    broken, broken_server = _fake_endpoint(slots=5, refuse=True)
+    slow, slow_server = _fake_endpoint(slots=1, status_delay=1)
+    servers = [small_server, grid_server, broken_server, slow_server]
+    drivers = []
+    try:
+        farm = RenderFarm([small, grid, broken], capacity=1, wait_timeout=5)
+        by_url = {node.url: node for node in farm.nodes}
+
+        driver, node = farm.start(Options(), label='test')
+        drivers.append((driver, node))
+        assert node.url == grid, f"expected the grid node, got {node.url}"
+        assert by_url[broken].failed_until > time.monotonic(), "refusing node was not benched"
+
+        # Grid still has 2 free slots, the standalone node 1
+        driver, node = farm.start(Options(), label='test')
+        drivers.append((driver, node))
+        assert node.url == grid
+        print("✅ Capacity-ordered placement and benching work")
+
+        # A slow /status on one node must not serialize session starts on the others
+        farm = RenderFarm([slow, small, grid], capacity=2, wait_timeout=5)
+        placed = []
+        started = time.monotonic()
+        threads = [threading.Thread(target=lambda: placed.append(farm.start(Options(), label='test')))
+                   for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+        drivers += placed
+        assert len(placed) == 3
+        assert elapsed < 1.8, f"session starts were serialized ({elapsed:.1f}s)"
+        print(f"✅ Concurrent starts with a slow node took {elapsed:.1f}s")
+    finally:
+        for driver, node in drivers:
+            driver.quit()
+        for server in servers:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    test_scheduling()
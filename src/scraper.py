@@ -5,13 +5,150 @@ Enhanced Web Scraper with JavaScript content handling
 import requests
 from bs4 import BeautifulSoup
 import time
+import hashlib
 import logging
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
 from urllib.parse import urljoin, urlparse
 
+from src.api_recipe import build_recipe_request, recipe_page_values
+from src.pagination import build_page_url
+from src.prefetch import PagePrefetcher
+from src.streaming import iter_extract
+
+
+# Result placed in the page pipeline for downloads or parses that failed
+FETCH_FAILED = object()
+
+
+def extract_attribute(element, attribute):
+    """Extract specific attribute from element"""
+    if attribute == 'text':
+        return element.get_text(strip=True)
+    elif attribute in element.attrs:
+        return element[attribute]
+    elif attribute == 'html':
+        return str(element)
+    else:
+        return element.get(attribute, '')
+
+
+def page_fingerprint(items):
+    """Fingerprint a page's extracted items (None for an empty page)"""
+    if not items:
+        return None
+    return hashlib.sha1('\n'.join(items).encode('utf-8')).hexdigest()
+
+
+def extract_from_html(content, css_selector, attribute='text', contains_text=None):
+    """
+    Parse raw HTML and extract matching content
+
+    Runs in parse worker processes, so it only takes and returns plain
+    picklable values: the soup never leaves the worker.
+
+    Returns:
+        Tuple of (page title or None, number of matched elements, extracted strings)
+    """
+    soup = BeautifulSoup(content, 'html.parser')
+
+    title = soup.find('title')
+    title_text = title.get_text(strip=True) if title else None
+
+    elements = soup.select(css_selector)
+
+    extracted_data = []
+    for element in elements:
+        try:
+            # Apply text filter if specified
+            if contains_text and contains_text not in str(element):
+                continue
+
+            # Extract content based on attribute
+            content = extract_attribute(element, attribute)
+            if content and content.strip():
+                extracted_data.append(content)
+
+        except Exception as e:
+            logging.warning(f"Error processing element: {e}")
+            continue
+
+    return title_text, len(elements), extracted_data
+
+
+def extract_items(content, css_selector, attribute='text', contains_text=None):
+    """Parse raw HTML and return only the extracted strings"""
+    return extract_from_html(content, css_selector, attribute, contains_text)[2]
+
+
+def extract_items_and_links(content, css_selector, attribute='text', follow_selector=None):
+    """
+    Parse a crawled page once for both its items and the links to follow
+
+    Returns:
+        Tuple of (extracted strings, raw href values of follow_selector matches)
+    """
+    soup = BeautifulSoup(content, 'html.parser')
+
+    items = []
+    for element in soup.select(css_selector):
+        value = extract_attribute(element, attribute)
+        if isinstance(value, str) and value.strip():
+            items.append(value)
+
+    links = []
+    if follow_selector:
+        links = [element['href'] for element in soup.select(follow_selector) if element.get('href')]
+    return items, links
+
+
+def parse_field_spec(spec):
+    """
+    Normalise a detail field spec to {'selector': ..., 'attribute': ...}
+
+    Accepts 'selector', 'selector@attribute' or a dict with those keys.
+    """
+    if isinstance(spec, dict):
+        return {'selector': spec['selector'], 'attribute': spec.get('attribute', 'text')}
+    selector, _, attribute = spec.rpartition('@') if '@' in spec else (spec, '', 'text')
+    return {'selector': selector.strip(), 'attribute': attribute.strip() or 'text'}
+
+
+def extract_fields(content, fields):
+    """
+    Parse a detail page and extract one value per field
+
+    Args:
+        content: Raw HTML
+        fields: {field: {'selector': ..., 'attribute': ...}} (see parse_field_spec)
+
+    Returns:
+        {field: value} using the first non-empty match of each selector
+    """
+    soup = BeautifulSoup(content, 'html.parser')
+    values = {}
+    for name, field in fields.items():
+        for element in soup.select(field['selector']):
+            value = extract_attribute(element, field['attribute'])
+            if isinstance(value, list):
+                value = ' '.join(value)
+            if value and value.strip():
+                values[name] = value.strip()
+                break
+    return values
+
 
 class WebTagScraper:
-    def __init__(self):
+    def __init__(self, parse_workers=None):
+        """
+        Args:
+            parse_workers: Number of processes used to parse pages in multi-page
+                and batch runs (None parses in the calling process)
+        """
         self.session = requests.Session()
+        self.parse_workers = parse_workers
+        self._parse_pool = None
         self.setup_session()
 
     def setup_session(self):
@@ -47,17 +184,16 @@ class WebTagScraper:
             response = self.session.get(url, timeout=timeout)
             response.raise_for_status()
 
-            # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # Parse HTML and extract
+            title, matched, extracted_data = extract_from_html(
+                response.content, css_selector, attribute, contains_text
+            )
 
             # Debug: Show page title to verify we got the page
-            title = soup.find('title')
             if title:
-                print(f"📄 Page title: {title.get_text(strip=True)}")
-
-            elements = soup.select(css_selector)
+                print(f"📄 Page title: {title}")
 
-            if not elements:
+            if not matched:
                 print(f"❌ No elements found with selector: {css_selector}")
                 print("💡 Try these alternatives:")
                 print("   - Simpler selector like 'div' or 'a'")
@@ -65,22 +201,6 @@ class WebTagScraper:
                 print("   - Try the page in browser to see actual content")
                 return []
 
-            extracted_data = []
-            for element in elements:
-                try:
-                    # Apply text filter if specified
-                    if contains_text and contains_text not in str(element):
-                        continue
-
-                    # Extract content based on attribute
-                    content = self._extract_attribute(element, attribute)
-                    if content and content.strip():
-                        extracted_data.append(content)
-
-                except Exception as e:
-                    logging.warning(f"Error processing element: {e}")
-                    continue
-
             print(f"✅ Found {len(extracted_data)} items matching the criteria")
 
             # Show sample of what was found
@@ -97,6 +217,30 @@ class WebTagScraper:
             print(f"❌ Scraping error: {e}")
             return []
 
+    def iter_scrape(self, url, css_selector, attribute='text', contains_text=None, timeout=30,
+                    chunk_size=256 * 1024):
+        """
+        Bounded-memory variant of scrape() that yields results as they are parsed
+
+        The body is streamed in chunks and never held in full, and each
+        finished subtree is freed, so huge single-page directories stay
+        within a few MB. Only the selector subset of StreamingSelector is
+        supported.
+        """
+        print(f"🔄 Streaming content from: {url}")
+
+        count = 0
+        with self.session.get(url, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            for content in iter_extract(response.iter_content(chunk_size), css_selector,
+                                        attribute, contains_text):
+                count += 1
+                if count <= 3:
+                    print(f"📋 Sample result: {content}")
+                yield content
+
+        print(f"✅ Streamed {count} items matching the criteria")
+
     def scrape_exhibition_exhibitors(self, url, css_selector, attribute='text', fallback_selectors=None):
         """
         Specialized method for exhibition websites with multiple selector fallbacks
@@ -159,42 +303,445 @@ class WebTagScraper:
 
         return unique_data
 
-    def scrape_multiple_pages(self, base_url, css_selector, attribute='text', pages=5, page_param='page'):
+    def scrape_multiple_pages(self, base_url, css_selector, attribute='text', pages=5, page_param='page',
+                              prefetch=0):
         """
         Scrape multiple pages with pagination
-        """
-        all_data = []
 
-        for page in range(1, pages + 1):
-            print(f"📄 Scraping page {page}/{pages}")
+        Every page is fingerprinted and the run stops as soon as a page is
+        empty or repeats an earlier one.
 
-            # Construct URL with page parameter
-            if '?' in base_url:
-                url = f"{base_url}&{page_param}={page}"
-            else:
-                url = f"{base_url}?{page_param}={page}"
+        Args:
+            pages: Number of pages, or 'auto' to probe how many pages exist
+            page_param: URL parameter holding the page number
+            prefetch: Number of pages to download ahead while the current one is parsed
+        """
+        cache = {}
+        if pages == 'auto':
+            pages = self.probe_page_count(base_url, css_selector, attribute, page_param, cache=cache)
 
-            page_data = self.scrape(url, css_selector, attribute, delay=2)
+        all_data = []
+        seen_fingerprints = set()
+        scraped_pages = 0
+
+        page_results = self._iter_page_results(base_url, css_selector, attribute, pages, page_param, cache,
+                                               prefetch)
+        for page, page_data in page_results:
+            fingerprint = page_fingerprint(page_data)
+            if fingerprint is None:
+                print(f"✅ Page {page} is empty - stopping")
+                break
+            if fingerprint in seen_fingerprints:
+                print(f"✅ Page {page} repeats an earlier page - stopping")
+                break
+
+            seen_fingerprints.add(fingerprint)
+            scraped_pages += 1
             all_data.extend(page_data)
-
-            # Small delay between pages to be respectful
-            time.sleep(1)
+        page_results.close()
 
         # Clean and deduplicate
         cleaned_data = self._clean_exhibition_data(all_data)
-        print(f"📊 Total unique exhibitors across {pages} pages: {len(cleaned_data)}")
+        print(f"📊 Total unique exhibitors across {scraped_pages} pages: {len(cleaned_data)}")
         return cleaned_data
 
+    def probe_page_count(self, base_url, css_selector, attribute='text', page_param='page', max_pages=1024,
+                         cache=None):
+        """
+        Find how many pages exist with an exponential probe plus binary search
+
+        Probes pages 1, 2, 4, 8... until one comes back empty or repeats an
+        earlier page, then binary-searches the boundary. Handles sites that
+        return an empty page, page 1, or the last page again when the page
+        number is out of range. Probed pages are kept in `cache` so they are
+        not downloaded twice.
+
+        Returns:
+            Number of the last page that exists (0 if page 1 is empty)
+        """
+        cache = {} if cache is None else cache
+
+        def probe(page):
+            if page not in cache:
+                print(f"🔎 Probing page {page}")
+                url = build_page_url(base_url, page, page_param)
+                cache[page] = self._fetch_page_items(url, css_selector, attribute)
+            return page_fingerprint(cache[page])
+
+        first = probe(1)
+        if first is None:
+            print("❌ Page 1 is empty - nothing to paginate")
+            return 0
+
+        seen = {first: 1}
+        good, bad, end_fingerprint = 1, None, None
+        while good < max_pages:
+            page = min(good * 2, max_pages)
+            fingerprint = probe(page)
+            if fingerprint is None or fingerprint in seen:
+                bad, end_fingerprint = page, fingerprint
+                break
+            seen[fingerprint] = page
+            good = page
+
+        if bad is None:
+            print(f"📖 Reached probe limit of {max_pages} pages")
+            return good
+
+        # Out-of-range pages either come back empty / as page 1 (the boundary is
+        # the first such page minus one) or repeat the last page (the boundary is
+        # the first page showing that content)
+        repeats_last = end_fingerprint is not None and seen[end_fingerprint] > 1
+        if repeats_last:
+            low = max(page for page in seen.values() if page < seen[end_fingerprint])
+            high = seen[end_fingerprint]
+        else:
+            low, high = good, bad
+
+        while high - low > 1:
+            middle = (low + high) // 2
+            fingerprint = probe(middle)
+            if fingerprint is None or fingerprint == end_fingerprint:
+                high = middle
+            else:
+                low = middle
+
+        total_pages = high if repeats_last else high - 1
+        print(f"📖 Detected {total_pages} pages ({len(cache)} probe requests)")
+        return total_pages
+
+    def _iter_page_results(self, base_url, css_selector, attribute, pages, page_param, cache, prefetch=0):
+        """Yield (page, items) in page order, reusing pages already in cache"""
+        if not self.parse_workers and not prefetch:
+            for page in range(1, pages + 1):
+                if page in cache:
+                    yield page, cache[page]
+                    continue
+
+                print(f"📄 Scraping page {page}/{pages}")
+                url = build_page_url(base_url, page, page_param)
+                yield page, self.scrape(url, css_selector, attribute, delay=2)
+
+                # Small delay between pages to be respectful
+                time.sleep(1)
+            return
+
+        urls = ((page, build_page_url(base_url, page, page_param)) for page in range(1, pages + 1))
+        parse = partial(extract_items, css_selector=css_selector, attribute=attribute)
+        yield from self._iter_url_results(urls, parse, prefetch, cache)
+
+    def scrape_urls(self, urls, css_selector, attribute='text', prefetch=4, delay=0):
+        """
+        Scrape a stream of URLs with the concurrent fetcher
+
+        Pages download `prefetch` ahead and are parsed on the parse pool when
+        parse_workers is set. URLs may come from a generator, e.g. sitemap
+        discovery, and are never collected into a list.
+
+        Yields:
+            (url, extracted items) in input order
+        """
+        pairs = ((url, url) for url in urls)
+        parse = partial(extract_items, css_selector=css_selector, attribute=attribute)
+        yield from self._iter_url_results(pairs, parse, prefetch, delay=delay)
+
+    def scrape_with_details(self, url, link_selector, detail_fields, attribute='href', prefetch=8, delay=0):
+        """
+        Two-stage scrape: directory links first, then every detail page concurrently
+
+        Args:
+            url: Directory page URL
+            link_selector: CSS selector for the links to the detail pages
+            detail_fields: {field: spec} applied to each detail page, where spec
+                is 'selector', 'selector@attribute' or {'selector': ..., 'attribute': ...}
+            attribute: Attribute holding the detail page URL
+            prefetch: Number of detail pages downloading at once
+
+        Returns:
+            One dict per detail page with 'url' plus every detail field
+        """
+        print(f"🔗 Stage 1: collecting detail links with {link_selector}")
+        links = []
+        seen = set()
+        for href in self.scrape(url, link_selector, attribute):
+            link = urljoin(url, href)
+            if link not in seen:
+                seen.add(link)
+                links.append(link)
+
+        if not links:
+            return []
+
+        fields = {name: parse_field_spec(spec) for name, spec in detail_fields.items()}
+        print(f"📑 Stage 2: fetching {len(links)} detail pages ({prefetch} at a time)")
+
+        rows = []
+        parse = partial(extract_fields, fields=fields)
+        pairs = ((link, link) for link in links)
+        for link, values in self._iter_url_results(pairs, parse, prefetch, delay=delay, empty={}):
+            row = {'url': link}
+            row.update({name: values.get(name, '') for name in fields})
+            rows.append(row)
+
+        enriched = sum(1 for row in rows if any(row[name] for name in fields))
+        print(f"✅ Enriched {enriched}/{len(rows)} rows with {', '.join(fields)}")
+        return rows
+
+    def scrape_api(self, recipe, max_pages=500, delay=0.5, timeout=30):
+        """
+        Page through a JSON endpoint described by an API recipe
+
+        Stops at the first empty or repeated page, like scrape_multiple_pages.
+
+        Args:
+            recipe: Recipe dict from EnhancedSeleniumScraper.discover_api()
+            max_pages: Safety limit on the number of requests
+            delay: Seconds between requests
+        """
+        print(f"🔌 Replaying JSON API: {recipe['url']} ({recipe['param']} from {recipe['start']} step {recipe['step']})")
+        all_data = []
+        seen_pages = set()
+
+        for index in range(max_pages):
+            value = recipe['start'] + index * recipe['step']
+            method, url, body = build_recipe_request(recipe, value)
+            try:
+                response = self.session.request(method, url, json=body, headers=recipe.get('headers'),
+                                                timeout=timeout)
+                response.raise_for_status()
+                values = recipe_page_values(recipe, response.json())
+            except (requests.RequestException, ValueError) as e:
+                print(f"❌ API page {index + 1} failed: {e}")
+                break
+
+            fingerprint = page_fingerprint(values)
+            if fingerprint is None:
+                print(f"🛑 API page {index + 1} is empty - stopping")
+                break
+            if fingerprint in seen_pages:
+                print(f"🛑 API page {index + 1} repeats an earlier page - stopping")
+                break
+            seen_pages.add(fingerprint)
+
+            print(f"✅ API page {index + 1}: {len(values)} items")
+            all_data.extend(values)
+            time.sleep(delay)
+
+        print(f"🎯 Total extracted via API: {len(all_data)} items")
+        return all_data
+
+    def crawl(self, frontier, css_selector, attribute='text', follow_selector=None, max_pages=None,
+              max_depth=None, same_domain=True, prefetch=4, delay=0):
+        """
+        Drain a CrawlFrontier: fetch queued URLs, store their items, queue new links
+
+        Progress is committed to the frontier after every page, so an
+        interrupted crawl resumes from the database.
+
+        Args:
+            frontier: CrawlFrontier holding the queue (seed it with add())
+            css_selector: CSS selector for the content to extract
+            follow_selector: CSS selector for links to enqueue (e.g. 'a.next, .exhibitor a')
+            max_pages: Stop after this many pages in this run
+            max_depth: Do not follow links deeper than this
+            same_domain: Only follow links on the domain they were found on
+            prefetch: Number of pages downloading at once
+
+        Returns:
+            Number of pages completed in this run
+        """
+        parse = partial(extract_items_and_links, css_selector=css_selector, attribute=attribute,
+                        follow_selector=follow_selector)
+        completed = 0
+
+        while max_pages is None or completed < max_pages:
+            batch_size = prefetch + 1
+            if max_pages is not None:
+                batch_size = min(batch_size, max_pages - completed)
+            batch = frontier.claim(batch_size)
+            if not batch:
+                break
+
+            depths = dict(batch)
+            pairs = ((url, url) for url, _ in batch)
+            for url, result in self._iter_url_results(pairs, parse, prefetch, delay=delay, empty=FETCH_FAILED):
+                if result is FETCH_FAILED:
+                    frontier.fail(url, 'download or parse failed')
+                    continue
+
+                items, links = result
+                frontier.complete(url, items)
+                completed += 1
+
+                depth = depths[url] + 1
+                if follow_selector and (max_depth is None or depth <= max_depth):
+                    host = urlparse(url).netloc
+                    targets = (urljoin(url, link).split('#')[0] for link in links)
+                    targets = [target for target in targets
+                               if target.startswith(('http://', 'https://'))
+                               and (not same_domain or urlparse(target).netloc == host)]
+                    frontier.add_many(targets, depth=depth)
+
+            stats = frontier.stats()
+            print(f"🕸️ Crawl progress: {stats['done']} done, {stats['queued']} queued, {stats['failed']} failed")
+
+        print(f"✅ Crawled {completed} pages this run")
+        return completed
+
+    def _iter_url_results(self, urls, parse, prefetch=0, cache=None, delay=1, empty=None):
+        """
+        Yield (key, parse(content)) for (key, url) pairs in order
+
+        `parse` must be picklable (a module-level function or partial) so it
+        can run on the parse pool. Failed downloads and pages that fail to
+        parse yield `empty`.
+        """
+        empty = [] if empty is None else empty
+        contents = self._iter_page_contents(urls, prefetch, cache, delay)
+
+        if self.parse_workers:
+            yield from self._parse_pooled(contents, parse, empty)
+            return
+
+        for key, content, known in contents:
+            if known is None:
+                if content is None:
+                    known = empty
+                else:
+                    try:
+                        known = parse(content)
+                    except Exception as e:
+                        print(f"⚠️ Parse error on {self._result_label(key)}: {e}")
+                        known = empty
+                    else:
+                        print(f"✅ {self._result_label(key)}: {self._item_count(known)} items")
+            yield key, known
+
+    def _iter_page_contents(self, urls, prefetch=0, cache=None, delay=1):
+        """
+        Download (key, url) pairs in order
+
+        Yields (key, raw bytes, None), (key, None, result) for pages already
+        in cache, or (key, None, None) for failed downloads. With prefetch,
+        the next `prefetch` pages download in the background while the
+        caller works on the current one.
+        """
+        cache = cache or {}
+
+        if not prefetch:
+            for key, url in urls:
+                if key in cache:
+                    yield key, None, cache[key]
+                    continue
+
+                print(f"📄 Downloading {url}")
+                yield key, self._fetch(url), None
+
+                # Small delay between pages to be respectful
+                time.sleep(delay)
+            return
+
+        print(f"⏩ Prefetching {prefetch} pages ahead")
+        with PagePrefetcher(self.session, depth=prefetch + 1, delay=delay) as prefetcher:
+            pending = deque()
+
+            def next_ready():
+                key, url = pending.popleft()
+                if key in cache:
+                    return key, None, cache[key]
+                print(f"📄 Downloading {url}")
+                return key, prefetcher.get(url), None
+
+            for key, url in urls:
+                pending.append((key, url))
+                if key not in cache:
+                    prefetcher.submit(url)
+                if len(pending) > prefetch:
+                    yield next_ready()
+
+            while pending:
+                yield next_ready()
+
+    def _parse_pooled(self, contents, parse, empty):
+        """
+        Parse downloaded pages on the process pool, yielding results in order
+
+        Raw bytes are handed to the parse workers as they arrive, so the next
+        download starts while earlier pages are still being parsed.
+        """
+        print(f"⚙️ Parsing with {self.parse_workers} worker processes")
+        pool = self._get_parse_pool()
+        entries = deque()
+
+        def finished(wait):
+            # Entries are (key, future) for pages being parsed or (key, result)
+            while entries and (wait or not isinstance(entries[0][1], Future) or entries[0][1].done()):
+                key, result = entries.popleft()
+                if isinstance(result, Future):
+                    try:
+                        result = result.result()
+                    except Exception as e:
+                        print(f"⚠️ Parse error on {self._result_label(key)}: {e}")
+                        result = empty
+                    else:
+                        print(f"✅ {self._result_label(key)}: {self._item_count(result)} items")
+                yield key, result
+
+        for key, content, known in contents:
+            if known is not None:
+                entries.append((key, known))
+            elif content is None:
+                entries.append((key, empty))
+            else:
+                entries.append((key, pool.submit(parse, content)))
+
+            yield from finished(wait=False)
+
+        yield from finished(wait=True)
+
+    @staticmethod
+    def _item_count(result):
+        """Number of extracted items in a parse result (crawl results are (items, links))"""
+        return len(result[0]) if isinstance(result, tuple) else len(result)
+
+    @staticmethod
+    def _result_label(key):
+        """Readable name for a page number or URL in progress messages"""
+        return f"Page {key}" if isinstance(key, int) else key
+
+    def _fetch_page_items(self, url, css_selector, attribute='text'):
+        """Download one page and extract its items in this process"""
+        content = self._fetch(url)
+        if content is None:
+            return []
+        return extract_items(content, css_selector, attribute)
+
+    def _fetch(self, url, timeout=30):
+        """Download a page and return its raw bytes (None on network errors)"""
+        try:
+            response = self.session.get(url, timeout=timeout)
+            response.raise_for_status()
+            return response.content
+        except requests.RequestException as e:
+            print(f"❌ Network error: {e}")
+            return None
+
+    def _get_parse_pool(self):
+        """Create the parse worker pool on first use"""
+        if self._parse_pool is None:
+            self._parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers)
+        return self._parse_pool
+
+    def close(self):
+        """Shut down the parse worker pool and HTTP session"""
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown()
+            self._parse_pool = None
+        self.session.close()
+
     def _extract_attribute(self, element, attribute):
         """Extract specific attribute from element"""
-        if attribute == 'text':
-            return element.get_text(strip=True)
-        elif attribute in element.attrs:
-            return element[attribute]
-        elif attribute == 'html':
-            return str(element)
-        else:
-            return element.get(attribute, '')
+        return extract_attribute(element, attribute)
 
     def scrape_with_retry(self, url, css_selector, attribute='text', retries=2, delay=3):
         """
@@ -350,15 +897,97 @@ def test_exhibition_scraping():
             print("❌ No results - likely requires JavaScript/Selenium")
 
 
+def _synthetic_directory_page(entries=2000):
+    """Build an exhibitor-directory style page for offline benchmarks"""
+    rows = []
+    for i in range(entries):
+        rows.append(
+            f'<div class="exhibitor-list-card"><div class="exhibitor-list-card-content">'
+            f'<h5>Company {i} GmbH</h5><span class="stand">Hall {i % 12}, Stand {i}</span>'
+            f'<a href="/exhibitor/{i}">Profile</a></div></div>'
+        )
+    return ("<html><head><title>Synthetic Directory</title></head><body>"
+            + "".join(rows) + "</body></html>").encode('utf-8')
+
+
+def benchmark_parse_scaling(worker_counts=(1, 2, 4, 8), pages=32, entries=2000):
+    """
+    Measure parse throughput of the worker pool on 1, 2, 4 and 8 cores
+
+    Uses a synthetic page so only parsing and selection are timed.
+    """
+    import os
+
+    content = _synthetic_directory_page(entries)
+    selector = '.exhibitor-list-card-content h5'
+
+    print("⚙️ PARSE WORKER SCALING BENCHMARK")
+    print("=" * 50)
+    print(f"📄 {pages} pages x {len(content) / 1024:.0f} KB, {os.cpu_count()} CPUs available")
+
+    baseline = None
+    for workers in worker_counts:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Warm up so process start-up is not part of the measurement
+            list(pool.map(extract_from_html, [content] * workers, [selector] * workers))
+
+            start = time.perf_counter()
+            results = list(pool.map(extract_from_html, [content] * pages, [selector] * pages))
+            elapsed = time.perf_counter() - start
+
+        assert all(len(items) == entries for _, _, items in results)
+        baseline = baseline or elapsed
+        print(f"   {workers} workers: {elapsed:6.2f}s  "
+              f"{pages / elapsed:6.1f} pages/s  speedup x{baseline / elapsed:.2f}")
+
+
+def test_bounded_memory(page_mb=50, limit_mb=16):
+    """Stream a synthetic 50 MB directory page and assert peak memory stays bounded"""
+    import tracemalloc
+
+    row = (b'<div class="exhibitor-list-card"><div class="exhibitor-list-card-content">'
+           b'<h5>Company %d GmbH</h5><span class="stand">Stand %d</span></div></div>')
+
+    def chunks():
+        yield b"<html><head><title>Huge Directory</title></head><body>"
+        produced, i = 0, 0
+        while produced < page_mb * 1024 * 1024:
+            chunk = b"".join(row % (n, n) for n in range(i, i + 1000))
+            produced += len(chunk)
+            i += 1000
+            yield chunk
+        yield b"</body></html>"
+
+    print(f"🧪 Streaming a synthetic {page_mb} MB page...")
+    tracemalloc.start()
+    count = 0
+    for _ in iter_extract(chunks(), '.exhibitor-list-card-content h5'):
+        count += 1
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    peak_mb = peak / (1024 * 1024)
+    print(f"📊 Extracted {count} items, peak traced memory {peak_mb:.1f} MB")
+    assert count > 0
+    assert peak_mb < limit_mb, f"Peak memory {peak_mb:.1f} MB exceeds {limit_mb} MB"
+    print("✅ Memory stayed bounded")
+
+
 if __name__ == "__main__":
     print("🌐 WebTag Scraper - Enhanced Edition")
     print("Choose test mode:")
     print("1. Basic functionality test")
     print("2. Exhibition scraping test")
+    print("3. Parse worker scaling benchmark")
+    print("4. Bounded-memory streaming test")
 
-    choice = input("Enter choice (1 or 2): ").strip()
+    choice = input("Enter choice (1-4): ").strip()
 
     if choice == "2":
         test_exhibition_scraping()
+    elif choice == "3":
+        benchmark_parse_scaling()
+    elif choice == "4":
+        test_bounded_memory()
     else:
         test_scraper()
\ No newline at end of file
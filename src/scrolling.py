@@ -0,0 +1,175 @@
+"""
+Adaptive infinite-scroll loop
+
+A fixed pause after every scroll is either too long (fast sites) or too
+short (slow APIs), and three stable counts at the end add several seconds
+of pure waiting. AdaptiveScroller instead polls the page after each scroll
+and moves on as soon as new nodes appear or the network goes idle. The
+longest it waits is learned per domain from past load latencies (p95) and
+stored on disk, so later runs on the same site tighten automatically. The
+loop ends as soon as the bottom of the page is reached without new content.
+"""
+
+import json
+import os
+import threading
+import time
+
+from src.browser_scripts import READINESS_TRACKER, SCROLL_PROBE, SCROLL_TO_END
+from src.command_trace import sleep
+
+
+LATENCY_STORE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'webtag-extractor', 'scroll_latency.json')
+
+# Samples kept per domain, and how many are needed before the learned timeout is used
+MAX_SAMPLES = 50
+MIN_SAMPLES = 5
+
+# Bounds for the learned timeout (seconds)
+MIN_TIMEOUT = 0.5
+MAX_TIMEOUT = 30
+
+# Scroll handlers are often debounced: the network only counts as idle once
+# nothing has happened for this long after the scroll
+IDLE_GRACE_MS = 500
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+class LatencyStore:
+    """
+    Per-domain scroll load latencies, persisted as JSON
+
+    Args:
+        path: JSON file holding {domain: [seconds, ...]}
+    """
+
+    def __init__(self, path=LATENCY_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self._samples = json.load(f)
+        except (OSError, ValueError):
+            self._samples = {}
+
+    def record(self, domain, seconds):
+        """Remember how long new content took to appear after a scroll"""
+        with self._lock:
+            samples = self._samples.setdefault(domain, [])
+            samples.append(round(seconds, 3))
+            del samples[:-MAX_SAMPLES]
+
+    def timeout_for(self, domain, default):
+        """
+        Longest wait after a scroll on this domain
+
+        Returns:
+            1.5 x the p95 latency seen so far, or default until enough samples exist
+        """
+        with self._lock:
+            samples = list(self._samples.get(domain, []))
+        if len(samples) < MIN_SAMPLES:
+            return default
+        return min(MAX_TIMEOUT, max(MIN_TIMEOUT, percentile(samples, 0.95) * 1.5))
+
+    def save(self):
+        """Write the samples back to disk"""
+        with self._lock:
+            data = {domain: list(samples) for domain, samples in self._samples.items()}
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+        except OSError as e:
+            print(f"⚠️ Could not save scroll latencies: {e}")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_latency_store():
+    """Latency store shared by every scroller in this process"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = LatencyStore()
+        return _store
+
+
+class AdaptiveScroller:
+    """
+    Scroll a page step by step, waiting only as long as the site needs
+
+    Args:
+        driver: Selenium WebDriver on the page to scroll
+        domain: Key for the learned timeout (usually the page's netloc)
+        css_selector: List entries; new matches count as new content
+        cold_timeout: Longest wait per scroll until the domain has a latency history
+        long_poll_ms: Requests open longer than this do not keep the network busy
+        store: LatencyStore (defaults to the shared on-disk store)
+    """
+
+    def __init__(self, driver, domain, css_selector=None, cold_timeout=3, long_poll_ms=10000, store=None):
+        self.driver = driver
+        self.domain = domain
+        self.css_selector = css_selector
+        self.long_poll_ms = long_poll_ms
+        self.store = store or get_latency_store()
+        self.timeout = self.store.timeout_for(domain, cold_timeout)
+        self.waited = 0.0
+
+    def _probe(self):
+        status = self.driver.execute_script(SCROLL_PROBE, self.css_selector, self.long_poll_ms)
+        if status['pending'] is None:
+            # No CDP hook on this page - track the network from now on
+            self.driver.execute_script(READINESS_TRACKER)
+        return status
+
+    def scroll(self):
+        """
+        Scroll to the end and wait for new content, network idle or the timeout
+
+        Returns:
+            Dict with grew (new nodes or a taller page), at_bottom and waited (seconds)
+        """
+        before = self._probe()
+        self.driver.execute_script(SCROLL_TO_END, self.css_selector)
+        started = time.monotonic()
+        grew = False
+
+        while True:
+            sleep(0.1)
+            try:
+                status = self._probe()
+            except Exception:
+                # Navigation in progress
+                status = None
+
+            elapsed = time.monotonic() - started
+            if status is not None:
+                grew = (status['buffered'] > before['buffered'] or status['count'] > before['count']
+                        or status['height'] > before['height'])
+                if grew:
+                    self.store.record(self.domain, elapsed)
+                    break
+                idle = (status['pending'] == 0 and status['quiet_ms'] is not None
+                        and status['quiet_ms'] >= IDLE_GRACE_MS and elapsed * 1000 >= IDLE_GRACE_MS)
+                if idle:
+                    break
+            if elapsed >= self.timeout:
+                break
+
+        self.waited += elapsed
+        at_bottom = status is not None and status['at_bottom'] and not grew
+        return {'grew': grew, 'at_bottom': at_bottom, 'waited': elapsed}
+
+    def save(self):
+        """Persist the latencies learned during this run"""
+        self.store.save()
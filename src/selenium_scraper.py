@@ -2,21 +2,124 @@
 Enhanced Selenium Scraper with Exhibitor Directory Specialization
 """
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
 import time
+import json
 import logging
+from urllib.parse import urlparse
+
+from src.api_recipe import collect_json_exchanges, find_api_recipe
+from src.browser_profiles import ProfileLease
+from src.browser_scripts import (CLICK_LOAD_MORE, HARVEST_DRAIN, HARVEST_INSTALL, READINESS_PROBE,
+                                 READINESS_TRACKER)
+from src.command_trace import CommandTracer, sleep, traced_scrape
+from src.driver_resolver import start_chrome
+from src.scrolling import AdaptiveScroller
+from src.snapshots import save_snapshot
+
+# Broad selector used to track progress when no harvest has been started
+COMPANY_SELECTOR = '.exhibitor-name, .company-name, h2, h3, [class*="exhibitor"], [class*="company"]'
+
+# Winning Load More / Next locator per (domain, kind), shared by every browser in the process
+BUTTON_LOCATORS = {}
+
+# URL patterns for CDP Network.setBlockedURLs ('*' matches any characters)
+FONT_PATTERNS = ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot']
+MEDIA_PATTERNS = ['*.mp4', '*.webm', '*.ogg', '*.mp3', '*.m3u8', '*.mov', '*.avi']
+IMAGE_PATTERNS = ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico']
+STYLESHEET_PATTERNS = ['*.css']
+TRACKER_PATTERNS = [
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*googlesyndication.com*',
+    '*googleadservices.com*', '*facebook.net*', '*connect.facebook.com*', '*hotjar.com*', '*clarity.ms*',
+    '*linkedin.com/px*', '*snap.licdn.com*', '*segment.io*', '*cdn.segment.com*', '*hubspot.com*',
+    '*hs-analytics.net*', '*adsrvr.org*', '*criteo.com*', '*taboola.com*', '*outbrain.com*',
+]
+
+# 'standard' drops everything a text extraction never needs; 'aggressive' also
+# drops stylesheets, which can change what counts as visible text on some sites
+BLOCKING_PROFILES = {
+    'none': {'images': False, 'patterns': []},
+    'trackers': {'images': False, 'patterns': TRACKER_PATTERNS},
+    'standard': {'images': True, 'patterns': FONT_PATTERNS + MEDIA_PATTERNS + TRACKER_PATTERNS},
+    'aggressive': {'images': True,
+                   'patterns': FONT_PATTERNS + MEDIA_PATTERNS + TRACKER_PATTERNS + STYLESHEET_PATTERNS},
+}
+
+
+def resolve_blocking(spec):
+    """
+    Turn a blocking spec into (block_images, url_patterns)
+
+    Args:
+        spec: Profile name ('none', 'trackers', 'standard', 'aggressive'), or a
+            dict such as {"profile": "standard", "images": false,
+            "allow": ["*.css"], "block": ["*chat-widget*"]} for presets that
+            need some resources back
+    """
+    if spec is None:
+        spec = 'none'
+    if isinstance(spec, str):
+        spec = {'profile': spec}
+
+    profile_name = spec.get('profile', 'standard')
+    if profile_name not in BLOCKING_PROFILES:
+        raise ValueError(f"Unknown blocking profile: {profile_name}")
+    profile = BLOCKING_PROFILES[profile_name]
+
+    block_images = spec.get('images', profile['images'])
+    allowed = set(spec.get('allow', []))
+    patterns = [pattern for pattern in profile['patterns'] if pattern not in allowed]
+    patterns += [pattern for pattern in spec.get('block', []) if pattern not in patterns]
+    if block_images and 'images' not in allowed:
+        # Preferences stop <img> loads; the patterns also catch CSS backgrounds and preloads
+        patterns += [pattern for pattern in IMAGE_PATTERNS if pattern not in allowed]
+    else:
+        block_images = False
+    return block_images, patterns
+
+
+class ScrapeCancelled(Exception):
+    """Raised inside a scrape once its cancel_event is set"""
+
 
 class EnhancedSeleniumScraper:
-    def __init__(self, headless=True):
+    def __init__(self, headless=True, page_load_strategy='normal', block_resources='standard',
+                 capture_network=False, profile=None, disk_cache_mb=256, remote=None, trace_dir=None):
+        """
+        Args:
+            headless: Run Chrome without a window
+            page_load_strategy: 'normal' waits for every subresource on driver.get();
+                'eager' returns at DOMContentLoaded and leaves the rest to wait_until_ready()
+            block_resources: Blocking profile name or dict (see resolve_blocking)
+            capture_network: Record network traffic in the performance log (needed by discover_api)
+            profile: Domain or preset name whose persistent Chrome profile and disk cache
+                are reused between runs (None starts from a blank temporary profile)
+            disk_cache_mb: Disk cache limit for the persistent profile
+            remote: RenderFarm to open the browser on instead of this machine
+            trace_dir: Record every WebDriver command and sleep, print a summary after
+                each scrape and write JSON traces to this directory (None disables tracing)
+        """
         self.headless = headless
+        self.remote = remote
+        self.render_node = None
+        self.tracer = CommandTracer(trace_dir) if trace_dir else None
+        self.profile = profile
+        self.disk_cache_mb = disk_cache_mb
+        self._profile_lease = None
+        self.page_load_strategy = page_load_strategy
+        self.capture_network = capture_network
+        self.block_images, self.blocked_urls = resolve_blocking(block_resources)
         self.driver = None
+        self.pages_loaded = 0
+        self.current_domain = None
+        self._harvest = None
+        self._harvested = {}
+        # threading.Event set by whoever no longer needs the running scrape (see src/hedging.py)
+        self.cancel_event = None
         self.setup_driver()
 
     def setup_driver(self):
@@ -29,15 +132,256 @@ class EnhancedSeleniumScraper:
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--window-size=1920,1080")
         chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+        chrome_options.page_load_strategy = self.page_load_strategy
+        if self.block_images:
+            chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        if self.capture_network:
+            chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        if self.profile and self.remote is not None:
+            print("⚠️ Persistent profiles live on this machine - not used on remote render nodes")
+        elif self.profile:
+            self._profile_lease = ProfileLease(self.profile, disk_cache_mb=self.disk_cache_mb)
+            for argument in self._profile_lease.chrome_arguments():
+                chrome_options.add_argument(argument)
+            print(f"🗂️ Using persistent profile: {self._profile_lease.path}")
 
         try:
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            if self.remote is not None:
+                self.driver, self.render_node = self.remote.start(chrome_options, label="Enhanced Selenium Chrome")
+            else:
+                self.driver = start_chrome(chrome_options, label="Enhanced Selenium Chrome")
             print("✅ Enhanced Selenium Chrome driver initialized successfully")
+            if self.tracer is not None:
+                self.tracer.attach(self.driver)
         except Exception as e:
             print(f"❌ Failed to initialize Enhanced Selenium driver: {e}")
+            if self._profile_lease:
+                self._profile_lease.release()
             raise
 
+        try:
+            # Track network and DOM activity from the first script of every page
+            self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": READINESS_TRACKER})
+        except Exception as e:
+            print(f"⚠️ Readiness tracker not preinstalled ({e}) - it will be injected after each load")
+
+        if self.blocked_urls:
+            try:
+                self.driver.execute_cdp_cmd("Network.enable", {})
+                self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.blocked_urls})
+                print(f"🚫 Blocking {len(self.blocked_urls)} resource patterns"
+                      f"{' and images' if self.block_images else ''}")
+            except Exception as e:
+                print(f"⚠️ Could not set up resource blocking: {e}")
+
+    def check_cancelled(self):
+        """Stop the running scrape once cancel_event is set"""
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise ScrapeCancelled("scrape cancelled")
+
+    def wait_until_ready(self, timeout=15, quiet_ms=500, long_poll_ms=10000):
+        """
+        Wait until no fetch/XHR is in flight and the DOM has stopped changing
+
+        Args:
+            timeout: Give up after this many seconds
+            quiet_ms: How long the page must stay quiet
+            long_poll_ms: Requests open longer than this are ignored (long-polling, analytics)
+
+        Returns:
+            True when the page went quiet, False on timeout
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            self.check_cancelled()
+            try:
+                status = self.driver.execute_script(READINESS_PROBE, long_poll_ms)
+                if status is None:
+                    # Page loaded without the CDP hook - start tracking from now
+                    self.driver.execute_script(READINESS_TRACKER)
+                elif status['state'] != 'loading' and not status['pending'] and status['quiet_ms'] >= quiet_ms:
+                    return True
+            except Exception:
+                # Navigation in progress; the next probe sees the new document
+                pass
+
+            if time.monotonic() >= deadline:
+                print(f"⚠️ Page still busy after {timeout}s - continuing")
+                return False
+            sleep(0.1)
+
+    def _load(self, url):
+        """Navigate to a URL, counting page loads for driver recycling"""
+        self.driver.get(url)
+        self.pages_loaded += 1
+        self.current_domain = urlparse(url).netloc
+
+    def is_healthy(self):
+        """Check that the browser still answers commands"""
+        try:
+            return self.driver is not None and self.driver.execute_script("return 1;") == 1
+        except Exception:
+            if self.render_node is not None:
+                # The node probably died - schedule new sessions elsewhere
+                self.remote.mark_failed(self.render_node)
+            return False
+
+    def js_heap_mb(self):
+        """Used JS heap of the current page in MB (None if the browser does not report it)"""
+        try:
+            used = self.driver.execute_script(
+                "return window.performance && performance.memory ? performance.memory.usedJSHeapSize : null;"
+            )
+            return used / (1024 * 1024) if used else None
+        except Exception:
+            return None
+
+    def reset_state(self):
+        """Close extra tabs and clear cookies and storage so the next job starts clean"""
+        handles = self.driver.window_handles
+        for handle in handles[1:]:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        self.driver.switch_to.window(handles[0])
+        self._harvest = None
+        self._harvested = {}
+        try:
+            # delete_all_cookies() only covers the current domain; CDP clears every site
+            self.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        except Exception:
+            self.driver.delete_all_cookies()
+        try:
+            self.driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except Exception:
+            # about:blank and some error pages have no storage
+            pass
+        self.driver.get("about:blank")
+
+    def start_harvest(self, css_selector, attribute='text'):
+        """
+        Collect matching elements incrementally as the page adds them
+
+        Values are buffered in the page by a MutationObserver and drained
+        into an ordered set after every click or scroll, so items that a
+        virtualized list later removes are still captured.
+        """
+        self._harvest = (css_selector, attribute)
+        self._harvested = {}
+        self.driver.execute_script(HARVEST_INSTALL, css_selector, attribute)
+        return self.drain_harvest()
+
+    def drain_harvest(self):
+        """Move newly buffered values into the harvest; returns how many were new"""
+        if self._harvest is None:
+            return 0
+        values = self.driver.execute_script(HARVEST_DRAIN)
+        if values is None:
+            # A navigation replaced the document - observe the new one
+            self.driver.execute_script(HARVEST_INSTALL, *self._harvest)
+            values = self.driver.execute_script(HARVEST_DRAIN) or []
+
+        before = len(self._harvested)
+        for value in values:
+            self._harvested.setdefault(value, None)
+        return len(self._harvested) - before
+
+    def harvested(self, contains_text=None):
+        """Harvested values in the order they first appeared"""
+        return [value for value in self._harvested
+                if not contains_text or contains_text in value]
+
+    def save_snapshot(self, css_selector=None, attribute=None, preset=None):
+        """
+        Store the rendered page for offline re-extraction (see src/snapshots.py)
+
+        Returns:
+            Snapshot path, or None if the page could not be saved
+        """
+        try:
+            return save_snapshot(self.driver.page_source, self.driver.current_url, preset=preset,
+                                 selector=css_selector, attribute=attribute)
+        except Exception as e:
+            print(f"⚠️ Could not save snapshot: {e}")
+            return None
+
+    @traced_scrape
+    def discover_api(self, url, css_selector, attribute='text', max_load_more=3):
+        """
+        Find the JSON endpoint that feeds a directory page
+
+        Loads the page, clicks Load More a few times, then matches the JSON
+        responses seen in the performance log against what the selector
+        extracts from the rendered page.
+
+        Returns:
+            API recipe dict for WebTagScraper.scrape_api(), or None
+        """
+        if not self.capture_network:
+            raise ValueError("discover_api needs EnhancedSeleniumScraper(capture_network=True)")
+
+        try:
+            print(f"🔍 Discovering JSON API behind: {url}")
+            self._load(url)
+            self.wait_until_ready()
+            WebDriverWait(self.driver, 30).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, css_selector))
+            )
+
+            self.start_harvest(css_selector, attribute)
+            self.handle_load_more_exhibitors(max_load_more)
+            samples = self.harvested()
+
+            exchanges = collect_json_exchanges(self.driver.get_log('performance'))
+            print(f"📡 Recorded {len(exchanges)} JSON responses")
+            for exchange in exchanges:
+                try:
+                    body = self.driver.execute_cdp_cmd("Network.getResponseBody",
+                                                       {"requestId": exchange['request_id']})
+                    exchange['data'] = json.loads(body['body'])
+                except Exception:
+                    # Bodies of evicted or non-JSON responses are simply skipped
+                    exchange['data'] = None
+
+            recipe = find_api_recipe(exchanges, samples)
+            if recipe:
+                print(f"✅ Found API: {recipe['method']} {recipe['url']}")
+                print(f"   Paging: {recipe['param']} from {recipe['start']} step {recipe['step']}, "
+                      f"items at '{recipe['items_path']}', field '{recipe['field']}'")
+            else:
+                print("❌ No JSON endpoint matched the page content")
+            return recipe
+
+        except Exception as e:
+            print(f"❌ API discovery error: {e}")
+            return None
+
+    def click_load_more(self, kind='more'):
+        """
+        Find and click the best Load More / Next control in one script call
+
+        Candidates are scored in the page by visible text (several languages),
+        aria-label, rel="next" and class hints. The winning locator is cached
+        per domain and tried first next time.
+
+        Args:
+            kind: 'more' for Load More buttons, 'next' for next-page links, 'any' for both
+
+        Returns:
+            Dict with the clicked control's locator, text and score, or None
+        """
+        key = (self.current_domain, kind)
+        try:
+            result = self.driver.execute_script(CLICK_LOAD_MORE, kind, BUTTON_LOCATORS.get(key))
+        except Exception as e:
+            print(f"⚠️ Button discovery failed: {e}")
+            return None
+
+        if result:
+            BUTTON_LOCATORS[key] = result['locator']
+            print(f"🔄 Clicking: {result['text'] or result['locator']} (score {result['score']})")
+        return result
+
     def handle_load_more_exhibitors(self, max_clicks=20):
         """
         Specialized method for exhibitor directories with Load More buttons
@@ -47,60 +391,29 @@ class EnhancedSeleniumScraper:
         """
         print(f"🔄 Handling exhibitor directory Load More (max {max_clicks} clicks)...")
 
+        if self._harvest is None:
+            self.start_harvest(COMPANY_SELECTOR)
+
         click_count = 0
-        last_company_count = 0
         no_new_companies_count = 0
 
         while click_count < max_clicks:
+            self.check_cancelled()
             click_count += 1
 
-            # Count current companies before clicking
-            current_companies = self.driver.find_elements(By.CSS_SELECTOR, '.exhibitor-name, .company-name, h2, h3, [class*="exhibitor"], [class*="company"]')
-            current_count = len(current_companies)
-            print(f"📊 Before click {click_count}: {current_count} companies")
-
-            # Try to find and click Load More button
-            load_more_clicked = False
-            load_more_selectors = [
-                'button[class*="load"]',
-                'button[class*="more"]',
-                'a[class*="load"]',
-                'a[class*="more"]',
-                '.load-more',
-                '.show-more',
-                'button:contains("Load")',
-                'button:contains("More")',
-                'button:contains("Show")',
-                '[data-load-more]',
-                '.btn[class*="more"]'
-            ]
-
-            for selector in load_more_selectors:
-                try:
-                    buttons = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for button in buttons:
-                        if button.is_displayed() and button.is_enabled():
-                            print(f"🔄 Clicking Load More: {selector}")
-                            self.driver.execute_script("arguments[0].click();", button)
-                            load_more_clicked = True
-
-                            # Wait for new content to load
-                            time.sleep(4)
-                            break
-                    if load_more_clicked:
-                        break
-                except:
-                    continue
-
-            # Count companies after clicking
-            new_companies = self.driver.find_elements(By.CSS_SELECTOR, '.exhibitor-name, .company-name, h2, h3, [class*="exhibitor"], [class*="company"]')
-            new_count = len(new_companies)
-
-            print(f"📊 After click {click_count}: {new_count} companies")
+            # Find and click the Load More button in a single round trip
+            load_more_clicked = self.click_load_more('more') is not None
+            if load_more_clicked:
+                # Wait for new content to load
+                self.wait_until_ready()
+
+            # Only the nodes added since the last click are transferred
+            new_count = self.drain_harvest()
+            print(f"📊 After click {click_count}: {len(self._harvested)} companies")
 
             # Check if we got new companies
-            if new_count > current_count:
-                print(f"✅ Loaded {new_count - current_count} new companies")
+            if new_count:
+                print(f"✅ Loaded {new_count} new companies")
                 no_new_companies_count = 0
             else:
                 no_new_companies_count += 1
@@ -115,13 +428,10 @@ class EnhancedSeleniumScraper:
                 print("✅ No new companies for 2 consecutive clicks - stopping")
                 break
 
-            if new_count >= 691:  # Target count reached
-                print("🎯 Reached target company count!")
-                break
-
         print(f"✅ Completed Load More process: {click_count} clicks")
         return click_count
 
+    @traced_scrape
     def scrape_exhibitor_directory(self, url, css_selector, attribute='text', contains_text=None, max_load_more=15):
         """
         Specialized method for exhibitor directories
@@ -135,11 +445,11 @@ class EnhancedSeleniumScraper:
         """
         try:
             print(f"🚀 Opening exhibitor directory: {url}")
-            self.driver.get(url)
+            self._load(url)
 
             # Wait for initial load
             print("⏳ Waiting for initial page load...")
-            time.sleep(5)
+            self.wait_until_ready()
 
             # Wait for initial companies
             print(f"⏳ Waiting for initial companies: {css_selector}")
@@ -147,44 +457,23 @@ class EnhancedSeleniumScraper:
                 EC.presence_of_element_located((By.CSS_SELECTOR, css_selector))
             )
 
-            # Handle Load More buttons
+            # Harvest companies as they are added, then handle Load More buttons
+            self.start_harvest(css_selector, attribute)
             self.handle_load_more_exhibitors(max_load_more)
 
             # Final scroll to ensure all content is loaded
             print("🔄 Final scroll to load any remaining content...")
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(3)
+            self.wait_until_ready()
+            self.drain_harvest()
 
-            # Extract all companies
-            elements = self.driver.find_elements(By.CSS_SELECTOR, css_selector)
+            # Harvested values are already unique and in order of appearance
+            unique_data = self.harvested(contains_text)
 
-            if not elements:
+            if not unique_data:
                 print(f"❌ No companies found with selector: {css_selector}")
                 return []
 
-            print(f"✅ Found {len(elements)} elements total")
-
-            extracted_data = []
-            for element in elements:
-                try:
-                    if attribute == 'text':
-                        content = element.text.strip()
-                    else:
-                        content = element.get_attribute(attribute)
-
-                    if content and (not contains_text or contains_text in content):
-                        extracted_data.append(content)
-
-                except Exception as e:
-                    print(f"⚠️ Error processing element: {e}")
-                    continue
-
-            # Remove duplicates while preserving order
-            unique_data = []
-            for item in extracted_data:
-                if item not in unique_data:
-                    unique_data.append(item)
-
             print(f"🎯 Extracted {len(unique_data)} unique companies")
 
             # Show sample results
@@ -194,6 +483,9 @@ class EnhancedSeleniumScraper:
 
             return unique_data
 
+        except ScrapeCancelled:
+            print("🛑 Scrape cancelled")
+            return []
         except Exception as e:
             print(f"❌ Exhibitor directory scraping error: {e}")
             return []
@@ -207,41 +499,18 @@ class EnhancedSeleniumScraper:
         page_count = 0
 
         while page_count < max_pages:
+            self.check_cancelled()
             page_count += 1
             print(f"📄 Processing page {page_count}...")
 
-            # Wait for content to load
-            time.sleep(3)
-
-            # Try to find and click "Load More" or "Next" buttons
-            load_more_selectors = [
-                'button[class*="load"]',
-                'button[class*="more"]',
-                'a[class*="load"]',
-                'a[class*="more"]',
-                '.load-more',
-                '.show-more',
-                '.next',
-                '.pagination-next',
-                'button:contains("Load")',
-                'button:contains("More")',
-                'button:contains("Show")',
-                'a:contains("Next")',
-                'a:contains(">")'
-            ]
-
-            clicked = False
-            for selector in load_more_selectors:
-                try:
-                    button = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    if button.is_displayed() and button.is_enabled():
-                        print(f"🔄 Clicking: {selector}")
-                        self.driver.execute_script("arguments[0].click();", button)
-                        clicked = True
-                        time.sleep(3)
-                        break
-                except:
-                    continue
+            # Wait for content to load, and collect it before a click can navigate away
+            self.wait_until_ready()
+            self.drain_harvest()
+
+            # Find and click "Load More" or "Next" in a single round trip
+            clicked = self.click_load_more('any') is not None
+            if clicked:
+                self.wait_until_ready()
 
             if not clicked:
                 print("✅ No more pages/buttons found")
@@ -250,39 +519,58 @@ class EnhancedSeleniumScraper:
         print(f"✅ Processed {page_count} pages")
         return page_count
 
-    def scroll_until_no_new_content(self, css_selector, max_scrolls=20, scroll_pause=3):
+    def scroll_until_no_new_content(self, css_selector, max_scrolls=20, scroll_pause=3, attribute='text'):
         """
         Scroll until no new elements are loaded
+
+        Elements are harvested as they appear, so each step costs the same
+        however long the list grows and virtualized rows are not lost. After
+        each scroll the loop moves on as soon as new nodes appear or the
+        network goes idle, and stops once the bottom is reached without new
+        content (see src/scrolling.py).
+
+        Args:
+            scroll_pause: Longest wait per scroll until this domain has a latency
+                history; afterwards the learned p95-based timeout is used
+
+        Returns:
+            Number of distinct values harvested
         """
         print(f"🔄 Scrolling to load all content for: {css_selector}")
 
-        last_element_count = 0
+        if self._harvest != (css_selector, attribute):
+            self.start_harvest(css_selector, attribute)
+
+        domain = self.current_domain or urlparse(self.driver.current_url).netloc
+        scroller = AdaptiveScroller(self.driver, domain, css_selector, cold_timeout=scroll_pause)
+        print(f"⏱️ Waiting up to {scroller.timeout:.1f}s per scroll on {domain}")
+
         same_count_streak = 0
         scroll_attempts = 0
 
-        while scroll_attempts < max_scrolls and same_count_streak < 3:
+        while scroll_attempts < max_scrolls and same_count_streak < 2:
+            self.check_cancelled()
             scroll_attempts += 1
 
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            print(f"📜 Scroll {scroll_attempts}/{max_scrolls} - Waiting {scroll_pause}s...")
-            time.sleep(scroll_pause)
-
-            current_elements = self.driver.find_elements(By.CSS_SELECTOR, css_selector)
-            current_count = len(current_elements)
-
-            print(f"📊 Element count: {current_count} (previous: {last_element_count})")
+            step = scroller.scroll()
+            new_count = self.drain_harvest()
+            print(f"📜 Scroll {scroll_attempts}/{max_scrolls} ({step['waited']:.1f}s) - "
+                  f"Harvested: {len(self._harvested)} (+{new_count})")
 
-            if current_count == last_element_count:
-                same_count_streak += 1
-                print(f"✅ Count stable {same_count_streak}/3")
-            else:
+            if new_count or step['grew']:
                 same_count_streak = 0
+            elif step['at_bottom']:
+                print("✅ Reached the bottom of the page")
+                break
+            else:
+                same_count_streak += 1
+                print(f"✅ Count stable {same_count_streak}/2")
 
-            last_element_count = current_count
-
-        print(f"✅ Final element count: {last_element_count}")
-        return last_element_count
+        scroller.save()
+        print(f"✅ Final element count: {len(self._harvested)} ({scroller.waited:.1f}s spent waiting)")
+        return len(self._harvested)
 
+    @traced_scrape
     def scrape_with_complete_coverage(self, url, css_selector, attribute='text', contains_text=None,
                                     timeout=30, max_scrolls=25, scroll_pause=3, handle_pagination=True):
         """
@@ -290,43 +578,28 @@ class EnhancedSeleniumScraper:
         """
         try:
             print(f"🚀 Opening browser: {url}")
-            self.driver.get(url)
+            self._load(url)
 
-            time.sleep(5)
+            self.wait_until_ready()
 
             print(f"⏳ Waiting for initial elements: {css_selector}")
             WebDriverWait(self.driver, timeout).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, css_selector))
             )
 
+            self.start_harvest(css_selector, attribute)
+
             if handle_pagination:
                 self.handle_pagination(max_pages=10)
 
-            final_count = self.scroll_until_no_new_content(css_selector, max_scrolls, scroll_pause)
+            self.scroll_until_no_new_content(css_selector, max_scrolls, scroll_pause, attribute)
 
-            elements = self.driver.find_elements(By.CSS_SELECTOR, css_selector)
+            extracted_data = self.harvested(contains_text)
 
-            if not elements:
+            if not extracted_data:
                 print(f"❌ No elements found with selector: {css_selector}")
                 return []
 
-            print(f"✅ Found {len(elements)} elements after comprehensive loading")
-
-            extracted_data = []
-            for element in elements:
-                try:
-                    if attribute == 'text':
-                        content = element.text.strip()
-                    else:
-                        content = element.get_attribute(attribute)
-
-                    if content and (not contains_text or contains_text in content):
-                        extracted_data.append(content)
-
-                except Exception as e:
-                    print(f"⚠️ Error processing element: {e}")
-                    continue
-
             print(f"🎯 Extracted {len(extracted_data)} items")
 
             if extracted_data:
@@ -338,6 +611,9 @@ class EnhancedSeleniumScraper:
         except TimeoutException:
             print(f"❌ Timeout waiting for elements: {css_selector}")
             return []
+        except ScrapeCancelled:
+            print("🛑 Scrape cancelled")
+            return []
         except Exception as e:
             print(f"❌ Comprehensive scraping error: {e}")
             return []
@@ -349,8 +625,18 @@ class EnhancedSeleniumScraper:
     def close(self):
         """Close the browser"""
         if self.driver:
-            self.driver.quit()
+            try:
+                self.driver.quit()
+            finally:
+                self.driver = None
+                if self.render_node is not None:
+                    self.remote.release(self.render_node)
+                    self.render_node = None
             print("✅ Enhanced Selenium browser closed")
+        if self._profile_lease:
+            # Only after Chrome has exited and flushed the profile
+            self._profile_lease.release()
+            self._profile_lease = None
 
     def __del__(self):
         """Ensure browser closes on destruction"""
@@ -0,0 +1,197 @@
+"""
+Deterministic sharding of batch work across machines
+
+Every URL or preset name is assigned to a shard by a stable hash, so N
+machines started with --shard 0/N ... --shard N-1/N split the work without
+talking to each other. Each shard writes its CSV plus a small JSON manifest,
+and merge_shards() combines them with global de-duplication.
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+from datetime import datetime
+
+
+# Columns that differ between otherwise identical rows
+VOLATILE_COLUMNS = ('Extraction_Date',)
+
+# Source columns left out of the de-duplication key, per runner. Preset
+# shards often list the same company under different presets, so only the
+# content counts there. Input shards keep URL and Selector in the key:
+# identical text (a "Next" link, a price) from two different pages is
+# different data.
+IGNORED_SOURCE_COLUMNS = {
+    'presets': ('Preset',),
+    'input': (),
+}
+
+
+def parse_shard(value):
+    """argparse type for --shard: 'i/N' with 0 <= i < N"""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError("must look like i/N, e.g. 0/4")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"shard index must be between 0 and {count - 1}")
+    return index, count
+
+
+def shard_of(key, count):
+    """Stable shard number for a key (same on every machine and Python run)"""
+    digest = hashlib.blake2b(key.strip().encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % count
+
+
+def in_shard(key, shard):
+    """Check whether a key belongs to shard (index, count); None means no sharding"""
+    return shard is None or shard_of(key, shard[1]) == shard[0]
+
+
+def shard_filename(filename, shard):
+    """outputs.csv -> outputs.shard-0-of-4.csv"""
+    stem, ext = os.path.splitext(filename)
+    return f"{stem}.shard-{shard[0]}-of-{shard[1]}{ext or '.csv'}"
+
+
+def manifest_path(output_path):
+    """Manifest written next to a shard's output file"""
+    return os.path.splitext(output_path)[0] + '.manifest.json'
+
+
+def write_manifest(output_path, shard, mode, rows, assigned, failed=0, complete=True):
+    """
+    Describe a finished shard so merge_shards() can check completeness
+
+    Args:
+        output_path: The shard's CSV file
+        shard: (index, count) tuple
+        mode: Runner that produced it ('input' or 'presets')
+        rows: Rows written to the CSV
+        assigned: Work units (URLs or presets) this shard was given
+        failed: Work units that produced no result
+        complete: False when the run was interrupted and the CSV is truncated
+    """
+    manifest = {
+        'shard': shard[0],
+        'shards': shard[1],
+        'mode': mode,
+        'output': os.path.basename(output_path),
+        'rows': rows,
+        'assigned': assigned,
+        'failed': failed,
+        'complete': complete,
+        'finished': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    path = manifest_path(output_path)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return path
+
+
+def _row_key(row, fieldnames, ignored=()):
+    values = '\x1f'.join(row.get(name) or '' for name in fieldnames
+                          if name not in VOLATILE_COLUMNS and name not in ignored)
+    return hashlib.blake2b(values.encode('utf-8'), digest_size=16).digest()
+
+
+def merge_shards(manifest_paths, output_path):
+    """
+    Combine shard outputs into one CSV, dropping duplicate rows across shards
+
+    For preset shards, rows count as duplicates when their extracted content
+    matches, whatever preset produced them; for input shards the URL and
+    selector must match too. The first occurrence (lowest shard) is kept.
+    Shard files are found relative to their manifests, so a directory of
+    outputs copied from several machines can be merged as is.
+
+    Returns:
+        Dict with 'rows', 'duplicates', 'missing' (shard numbers never seen)
+        and 'partial' (shards whose run was interrupted)
+    """
+    manifests = []
+    for path in manifest_paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        manifest['path'] = os.path.join(os.path.dirname(path), manifest['output'])
+        manifests.append(manifest)
+    if not manifests:
+        raise ValueError("No shard manifests given")
+
+    counts = {manifest['shards'] for manifest in manifests}
+    if len(counts) > 1:
+        raise ValueError(f"Manifests come from different shard counts: {sorted(counts)}")
+    modes = {manifest.get('mode') for manifest in manifests}
+    if len(modes) > 1:
+        raise ValueError(f"Manifests come from different runners: {sorted(map(str, modes))}")
+    ignored = IGNORED_SOURCE_COLUMNS.get(modes.pop(), ())
+    missing = sorted(set(range(counts.pop())) - {manifest['shard'] for manifest in manifests})
+    if missing:
+        print(f"⚠️ Missing shards: {missing}")
+    partial = sorted(manifest['shard'] for manifest in manifests if not manifest.get('complete', True))
+    if partial:
+        print(f"⚠️ Interrupted shards (truncated output, re-run them): {partial}")
+
+    manifests.sort(key=lambda manifest: manifest['shard'])
+
+    # Union of the shard headers, in first-seen order
+    fieldnames = []
+    for manifest in manifests:
+        with open(manifest['path'], 'r', newline='', encoding='utf-8') as f:
+            for name in next(csv.reader(f), []):
+                if name not in fieldnames:
+                    fieldnames.append(name)
+
+    seen = set()
+    rows = 0
+    duplicates = 0
+    with open(output_path, 'w', newline='', encoding='utf-8') as out:
+        writer = csv.DictWriter(out, fieldnames=fieldnames)
+        writer.writeheader()
+        for manifest in manifests:
+            print(f"🧩 Merging shard {manifest['shard']}/{manifest['shards']}: {manifest['output']}")
+            with open(manifest['path'], 'r', newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    key = _row_key(row, fieldnames, ignored)
+                    if key in seen:
+                        duplicates += 1
+                        continue
+                    seen.add(key)
+                    writer.writerow(row)
+                    rows += 1
+
+    return {'rows': rows, 'duplicates': duplicates, 'missing': missing, 'partial': partial}
+
+
+def test_merge():
+    """Preset shards share content rows; input shards keep equal text from different URLs"""
+    import tempfile
+
+    def write_shard(directory, mode, index, column, rows):
+        path = os.path.join(directory, shard_filename('out.csv', (index, 2)))
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow([column, 'Extracted_Content', 'Extraction_Date'])
+            for source, content in rows:
+                writer.writerow([source, content, f"2024-01-0{index + 1} 12:00:00"])
+        return write_manifest(path, (index, 2), mode, len(rows), 1)
+
+    with tempfile.TemporaryDirectory() as directory:
+        manifests = [write_shard(directory, 'presets', 0, 'Preset', [('Expo A', 'Acme'), ('Expo A', 'Beta')]),
+                     write_shard(directory, 'presets', 1, 'Preset', [('Expo B', 'Acme')])]
+        result = merge_shards(manifests, os.path.join(directory, 'presets.csv'))
+        assert (result['rows'], result['duplicates']) == (2, 1), result
+
+        manifests = [write_shard(directory, 'input', 0, 'URL', [('https://a.example/', 'Next')]),
+                     write_shard(directory, 'input', 1, 'URL', [('https://b.example/', 'Next'),
+                                                                ('https://b.example/', 'Next')])]
+        result = merge_shards(manifests, os.path.join(directory, 'input.csv'))
+        assert (result['rows'], result['duplicates']) == (2, 1), result
+    print("✅ Shard merge keeps equal content from different URLs")
+
+
+if __name__ == "__main__":
+    test_merge()
@@ -0,0 +1,121 @@
+"""
+Sitemap-driven URL discovery for exhibitor directories
+
+Many exhibition platforms list every exhibitor profile in sitemap.xml, so a
+full directory can be enumerated over plain HTTP instead of clicking
+"Load More" in a browser.
+"""
+
+import gzip
+import re
+import xml.etree.ElementTree as ET
+from collections import deque
+from urllib.parse import urljoin, urlparse
+
+import requests
+
+
+def _local_name(tag):
+    """Strip the XML namespace from a tag"""
+    return tag.rsplit('}', 1)[-1]
+
+
+class SitemapDiscovery:
+    """Enumerate URLs from robots.txt sitemaps, sitemap indexes and gzip sitemaps"""
+
+    def __init__(self, session=None, timeout=30):
+        self.session = session or requests.Session()
+        self.timeout = timeout
+
+    def sitemaps_from_robots(self, site_url):
+        """Read Sitemap: lines from robots.txt (falls back to /sitemap.xml)"""
+        parts = urlparse(site_url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        sitemaps = []
+
+        try:
+            response = self.session.get(urljoin(origin, '/robots.txt'), timeout=self.timeout)
+            if response.ok:
+                for line in response.text.splitlines():
+                    if line.lower().startswith('sitemap:'):
+                        sitemaps.append(line.split(':', 1)[1].strip())
+        except requests.RequestException as e:
+            print(f"⚠️ Could not read robots.txt: {e}")
+
+        if not sitemaps:
+            sitemaps.append(urljoin(origin, '/sitemap.xml'))
+        return sitemaps
+
+    def iter_urls(self, site_url, pattern=None, max_sitemaps=500):
+        """
+        Yield page URLs from every sitemap reachable from the site
+
+        Args:
+            site_url: Any URL on the site, or a sitemap URL directly
+            pattern: Regex a URL must match to be yielded (e.g. '/exhibitors/')
+            max_sitemaps: Safety limit on the number of sitemap files read
+        """
+        url_filter = re.compile(pattern) if pattern else None
+
+        if site_url.endswith(('.xml', '.xml.gz')):
+            queue = deque([site_url])
+        else:
+            queue = deque(self.sitemaps_from_robots(site_url))
+
+        visited = set()
+        seen_urls = set()
+        found = 0
+
+        while queue and len(visited) < max_sitemaps:
+            sitemap_url = queue.popleft()
+            if sitemap_url in visited:
+                continue
+            visited.add(sitemap_url)
+            print(f"🗺️ Reading sitemap: {sitemap_url}")
+
+            try:
+                for kind, loc in self._iter_entries(sitemap_url):
+                    if kind == 'sitemap':
+                        queue.append(loc)
+                    elif (url_filter is None or url_filter.search(loc)) and loc not in seen_urls:
+                        seen_urls.add(loc)
+                        found += 1
+                        yield loc
+            except (requests.RequestException, ET.ParseError, OSError) as e:
+                print(f"⚠️ Skipping sitemap {sitemap_url}: {e}")
+
+        print(f"✅ Sitemap discovery found {found} URLs in {len(visited)} sitemaps")
+
+    def _iter_entries(self, sitemap_url):
+        """
+        Stream one sitemap file
+
+        Yields ('sitemap', url) for sitemap-index children and ('url', url)
+        for pages. The file is parsed incrementally, gzip or not, and each
+        entry is cleared once read.
+        """
+        with self.session.get(sitemap_url, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            # Transfer-level gzip is undone by urllib3; .xml.gz files still need unpacking
+            response.raw.decode_content = True
+            stream = response.raw
+            content_type = response.headers.get('Content-Type', '')
+            if sitemap_url.endswith('.gz') or 'gzip' in content_type:
+                stream = gzip.GzipFile(fileobj=stream)
+
+            root = None
+            loc = None
+            for event, element in ET.iterparse(stream, events=('start', 'end')):
+                if root is None:
+                    root = element
+                if event == 'start':
+                    continue
+
+                name = _local_name(element.tag)
+                if name == 'loc':
+                    loc = (element.text or '').strip()
+                elif name in ('sitemap', 'url'):
+                    if loc:
+                        yield ('sitemap' if name == 'sitemap' else 'url'), loc
+                    loc = None
+                    root.clear()
@@ -0,0 +1,171 @@
+"""
+Rendered-DOM snapshots for offline re-extraction
+
+Rendering a Load More directory can take minutes, and until now the
+rendered page was thrown away as soon as one selector had been extracted.
+A snapshot keeps the final page_source together with its URL, time and
+preset in a gzip file. Any selector or attribute can then be tried
+against it with the fast HTML parser path (extract_from_html), without
+starting a browser.
+
+File format: one JSON metadata line followed by the HTML, gzip-compressed,
+so snapshots can be listed without decompressing whole pages.
+
+Note that rows a virtualized list removed from the DOM are not part of
+page_source, so a snapshot can hold fewer entries than the live harvest.
+"""
+
+import gzip
+import json
+import os
+import re
+from datetime import datetime
+from urllib.parse import urlparse
+
+from src.scraper import extract_from_html
+
+
+SNAPSHOT_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'webtag-extractor', 'snapshots')
+SNAPSHOT_SUFFIX = '.html.gz'
+
+# Oldest snapshots beyond this many are deleted when a new one is saved
+MAX_SNAPSHOTS = 100
+
+
+def save_snapshot(html, url, preset=None, selector=None, attribute=None, directory=SNAPSHOT_DIR):
+    """
+    Store a rendered page
+
+    Args:
+        html: Final page_source of the browser
+        url: URL the page was rendered from
+        preset: Preset name, if the page was rendered for one
+        selector, attribute: What was extracted at render time (for reference)
+
+    Returns:
+        Path of the snapshot file
+    """
+    os.makedirs(directory, exist_ok=True)
+    saved_at = datetime.now()
+    host = re.sub(r'[^A-Za-z0-9.-]+', '-', urlparse(url).netloc) or 'page'
+    filename = f"{host}-{saved_at.strftime('%Y%m%d-%H%M%S-%f')}{SNAPSHOT_SUFFIX}"
+    path = os.path.join(directory, filename)
+
+    meta = {
+        'url': url,
+        'preset': preset,
+        'selector': selector,
+        'attribute': attribute,
+        'saved_at': saved_at.isoformat(timespec='seconds'),
+        'size': len(html),
+    }
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        f.write(json.dumps(meta, ensure_ascii=False) + '\n')
+        f.write(html)
+
+    print(f"📸 Snapshot saved: {path} ({len(html) / 1024:.0f} KB rendered HTML)")
+    _prune(directory)
+    return path
+
+
+def _prune(directory, keep=MAX_SNAPSHOTS):
+    # Timestamped file names of one host sort by age; mtime orders across hosts
+    names = [name for name in os.listdir(directory) if name.endswith(SNAPSHOT_SUFFIX)]
+    if len(names) <= keep:
+        return
+    paths = sorted((os.path.join(directory, name) for name in names), key=os.path.getmtime)
+    for path in paths[:len(paths) - keep]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def read_snapshot_meta(path):
+    """Read only the metadata line of a snapshot"""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        meta = json.loads(f.readline())
+    meta['path'] = path
+    return meta
+
+
+def load_snapshot(path):
+    """
+    Load a snapshot
+
+    Returns:
+        Tuple of (metadata dict, html)
+    """
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        meta = json.loads(f.readline())
+        html = f.read()
+    meta['path'] = path
+    return meta, html
+
+
+def list_snapshots(directory=SNAPSHOT_DIR):
+    """Metadata of every stored snapshot, newest first"""
+    if not os.path.isdir(directory):
+        return []
+    snapshots = []
+    for name in os.listdir(directory):
+        if not name.endswith(SNAPSHOT_SUFFIX):
+            continue
+        try:
+            snapshots.append(read_snapshot_meta(os.path.join(directory, name)))
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Skipping unreadable snapshot {name}: {e}")
+    snapshots.sort(key=lambda meta: (meta.get('saved_at', ''), meta['path']), reverse=True)
+    return snapshots
+
+
+def find_snapshot(ref, directory=SNAPSHOT_DIR):
+    """
+    Resolve a snapshot reference to a file path
+
+    Args:
+        ref: A snapshot path, or a URL, preset name or domain whose most
+            recent snapshot is wanted
+
+    Returns:
+        Path, or None when nothing matches
+    """
+    if os.path.isfile(ref):
+        return ref
+
+    # An exact URL or preset match beats a newer snapshot of another page on the same host
+    snapshots = list_snapshots(directory)
+    for meta in snapshots:
+        if ref in (meta.get('url'), meta.get('preset')):
+            return meta['path']
+
+    host = urlparse(ref).netloc
+    for meta in snapshots:
+        if (host or ref) == urlparse(meta.get('url', '')).netloc:
+            if host:
+                print(f"⚠️ No snapshot of {ref} itself - using the latest one from {host}: {meta['url']}")
+            return meta['path']
+    return None
+
+
+def extract_from_snapshot(ref, css_selector, attribute='text', contains_text=None, directory=SNAPSHOT_DIR):
+    """
+    Run an extraction against a stored snapshot instead of a live page
+
+    Returns:
+        Tuple of (snapshot metadata, extracted strings)
+
+    Raises:
+        FileNotFoundError: No snapshot matches ref
+    """
+    path = find_snapshot(ref, directory)
+    if path is None:
+        raise FileNotFoundError(f"No snapshot found for '{ref}'")
+
+    meta, html = load_snapshot(path)
+    print(f"📸 Re-extracting from snapshot of {meta['url']} ({meta['saved_at']})")
+    _, matched, data = extract_from_html(html, css_selector, attribute, contains_text)
+    # Same order-preserving de-duplication as the browser harvest
+    data = list(dict.fromkeys(data))
+    print(f"🎯 Found {matched} elements, extracted {len(data)} items")
+    return meta, data
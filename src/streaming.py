@@ -0,0 +1,192 @@
+"""
+Bounded-memory extraction for very large pages
+
+The regular scraper parses the whole document into a BeautifulSoup tree
+before selecting anything. Here the body is fed chunk by chunk into lxml's
+pull parser, matches are yielded as soon as their closing tag is seen, and
+finished subtrees are cleared, so memory stays flat however big the page is.
+"""
+
+import re
+
+from lxml import etree
+
+
+# tag, #id, .class and [attr op "value"] parts of a compound selector
+_COMPOUND_PART = re.compile(
+    r"""
+    (?P<tag>\*|[a-zA-Z][\w-]*)
+    | \#(?P<id>[\w-]+)
+    | \.(?P<cls>[\w-]+)
+    | \[\s*(?P<attr>[\w:-]+)\s*
+        (?:(?P<op>[*^$~|]?=)\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[^\]\s]+))\s*)?
+      \]
+    """,
+    re.VERBOSE
+)
+
+
+class StreamingSelector:
+    """
+    Small CSS selector matcher for lxml elements of a partially parsed tree
+
+    Supports comma groups, tag/id/class/attribute selectors and the
+    descendant and child combinators - enough for every preset selector.
+    Matching only looks at the element and its ancestors, which are always
+    still in the tree while the pull parser is inside them.
+    """
+
+    def __init__(self, css_selector):
+        self.css_selector = css_selector
+        self.groups = [self._parse_complex(group) for group in css_selector.split(',')]
+
+    def _parse_complex(self, text):
+        """Parse 'a > b c' into [(compound, combinator), ...] right to left"""
+        tokens = re.split(r'\s*(>)\s*|\s+', text.strip())
+        tokens = [token for token in tokens if token]
+        if not tokens:
+            raise ValueError(f"Empty selector in: {self.css_selector}")
+
+        # Each step keeps the combinator that links it to the step on its left
+        steps = []
+        for token in reversed(tokens):
+            if token == '>':
+                if not steps:
+                    raise ValueError(f"Dangling combinator in: {self.css_selector}")
+                steps[-1] = (steps[-1][0], '>')
+                continue
+            steps.append((self._parse_compound(token), ' '))
+        return steps
+
+    def _parse_compound(self, text):
+        compound = {'tag': None, 'id': None, 'classes': [], 'attrs': []}
+        position = 0
+        while position < len(text):
+            match = _COMPOUND_PART.match(text, position)
+            if not match or match.end() == position:
+                raise ValueError(f"Unsupported selector for streaming mode: {self.css_selector}")
+            if match.group('tag'):
+                compound['tag'] = match.group('tag').lower()
+            elif match.group('id'):
+                compound['id'] = match.group('id')
+            elif match.group('cls'):
+                compound['classes'].append(match.group('cls'))
+            else:
+                value = match.group('dq')
+                if value is None:
+                    value = match.group('sq')
+                if value is None:
+                    value = match.group('bare')
+                compound['attrs'].append((match.group('attr').lower(), match.group('op'), value))
+            position = match.end()
+        return compound
+
+    def matches(self, element):
+        """Check whether an element matches any selector group"""
+        return any(self._matches_steps(element, steps, 0) for steps in self.groups)
+
+    def _matches_steps(self, element, steps, index):
+        compound, combinator = steps[index]
+        if not self._matches_compound(element, compound):
+            return False
+        if index + 1 == len(steps):
+            return True
+
+        parent = element.getparent()
+        if combinator == '>':
+            return parent is not None and self._matches_steps(parent, steps, index + 1)
+
+        while parent is not None:
+            if self._matches_steps(parent, steps, index + 1):
+                return True
+            parent = parent.getparent()
+        return False
+
+    @staticmethod
+    def _matches_compound(element, compound):
+        if not isinstance(element.tag, str):
+            return False
+        if compound['tag'] not in (None, '*') and element.tag.lower() != compound['tag']:
+            return False
+        if compound['id'] is not None and element.get('id') != compound['id']:
+            return False
+        if compound['classes']:
+            classes = (element.get('class') or '').split()
+            if any(cls not in classes for cls in compound['classes']):
+                return False
+        for name, op, value in compound['attrs']:
+            actual = element.get(name)
+            if actual is None:
+                return False
+            if op is None:
+                continue
+            if op == '=' and actual != value:
+                return False
+            if op == '*=' and value not in actual:
+                return False
+            if op == '^=' and not actual.startswith(value):
+                return False
+            if op == '$=' and not actual.endswith(value):
+                return False
+            if op == '~=' and value not in actual.split():
+                return False
+            if op == '|=' and actual != value and not actual.startswith(value + '-'):
+                return False
+        return True
+
+
+def _element_content(element, attribute):
+    """Extract content the same way WebTagScraper does for soup elements"""
+    if attribute == 'text':
+        return ''.join(text.strip() for text in element.itertext())
+    elif attribute == 'html':
+        return etree.tostring(element, encoding='unicode', with_tail=False)
+    else:
+        return element.get(attribute, '')
+
+
+def iter_extract(chunks, css_selector, attribute='text', contains_text=None):
+    """
+    Yield extracted content from an iterable of HTML byte chunks
+
+    Args:
+        chunks: Iterable of bytes, e.g. response.iter_content()
+        css_selector: CSS selector (see StreamingSelector for the supported subset)
+        attribute: Attribute to extract ('text', 'html', 'href', etc.)
+        contains_text: Only keep elements whose markup contains this text
+    """
+    selector = StreamingSelector(css_selector)
+    parser = etree.HTMLPullParser(events=('start', 'end'))
+    matched = set()
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from _drain_events(parser, selector, matched, attribute, contains_text)
+
+    parser.close()
+    yield from _drain_events(parser, selector, matched, attribute, contains_text)
+
+
+def _drain_events(parser, selector, matched, attribute, contains_text):
+    for event, element in parser.read_events():
+        if event == 'start':
+            if selector.matches(element):
+                matched.add(element)
+            continue
+
+        if element in matched:
+            matched.discard(element)
+            markup_ok = (not contains_text
+                         or contains_text in etree.tostring(element, encoding='unicode', with_tail=False))
+            if markup_ok:
+                content = _element_content(element, attribute)
+                if content and content.strip():
+                    yield content
+
+        # Free finished subtrees unless an enclosing match still needs them
+        if not matched:
+            element.clear(keep_tail=True)
+            parent = element.getparent()
+            if parent is not None:
+                while element.getprevious() is not None:
+                    del parent[0]